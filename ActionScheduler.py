@@ -0,0 +1,76 @@
+import discord
+import asyncio
+import time
+
+
+class ScheduleResult:
+    """[summary]
+    Holds the outcome of a scheduled batch of moderation actions.
+    """
+
+    def __init__(self):
+        self.succeeded = []  #? Targets the action was applied to.
+        self.failed = {}  #? Target -> error message.
+        self.retries = 0  #? Amount of times an action was retried after a 429.
+        self.elapsed = 0.0  #? Seconds the whole batch took.
+
+
+class ActionScheduler:
+    def __init__(self, concurrency: int = 8, max_retries: int = 4, base_backoff: float = 1.0):
+        """[summary]
+        Creates a scheduler that runs many moderation actions with a bounded amount in flight, retrying rate limited ones with backoff.
+        discord.py already waits on exhausted route buckets, the scheduler keeps the queue bounded and retries the 429s it gives up on.
+        Args:
+            concurrency (int): the maximum amount of actions running at once.
+            max_retries (int): the amount of retries for an action that was rate limited.
+            base_backoff (float): the first retry delay in seconds (doubled on every retry).
+        """
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+
+    async def run(self, targets, action) -> ScheduleResult:
+        """[summary]
+        Runs `action` on every target and collects the results.
+        Args:
+            targets (iterable): the targets (members, users or ids) to run the action on.
+            action (coroutine function): awaited with a single target.
+        Returns:
+            ScheduleResult: the batch outcome.
+        """
+        result = ScheduleResult()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+
+        async def run_one(target):
+            async with semaphore:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        await action(target)
+                        result.succeeded.append(target)
+                        return
+                    except discord.HTTPException as e:
+                        if e.status != 429 or attempt == self.max_retries:
+                            result.failed[target] = e.text or str(e)
+                            return
+                        result.retries += 1
+                        await asyncio.sleep(self.retry_delay(e, attempt))
+                    except Exception as e:
+                        result.failed[target] = str(e)
+                        return
+
+        await asyncio.gather(*[run_one(target) for target in targets])
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def retry_delay(self, error: discord.HTTPException, attempt: int) -> float:
+        """[summary]
+        Returns how long to wait before retrying a rate limited action, preferring the delay discord asked for.
+        """
+        retry_after = error.response.headers.get("Retry-After") if error.response is not None else None
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.base_backoff * (2 ** attempt)
@@ -0,0 +1,114 @@
+import asyncio
+
+from MemberSearch import NameIndex
+
+
+class GuildBans:
+    """[summary]
+    Holds a single guild's banned users, indexed by id, by name#discriminator, by plain name and by partial name.
+    """
+
+    def __init__(self):
+        self.by_id = {}  #? user id -> discord.User
+        self.by_tag = {}  #? "name#discriminator" -> discord.User
+        self.by_name = {}  #? name -> {user id: discord.User} (names are not unique)
+        self.names = NameIndex(fuzzy=False)  #? Case insensitive and partial name lookups.
+
+    def add(self, user):
+        self.add_exact(user)
+        self.names.add(user)
+
+    def extend(self, users: list):
+        """[summary]
+        Adds a whole ban list (the partial name index sorts the names once).
+        """
+        for user in users:
+            self.add_exact(user)
+        self.names.extend(users)
+
+    def add_exact(self, user):
+        self.remove(user.id)  # Drop stale name entries if the user was indexed before.
+        self.by_id[user.id] = user
+        self.by_tag[str(user)] = user
+        self.by_name.setdefault(user.name, {})[user.id] = user
+
+    def remove(self, user_id: int):
+        user = self.by_id.pop(user_id, None)
+        if user is None:
+            return
+        self.names.remove(user_id)
+        self.by_tag.pop(str(user), None)
+        same_name = self.by_name.get(user.name, {})
+        same_name.pop(user_id, None)
+        if len(same_name) == 0:
+            self.by_name.pop(user.name, None)
+
+    def find(self, query: str, limit: int = 10) -> list:
+        """[summary]
+        Finds banned users matching the query, which can be an id, a name#discriminator, a plain name or the start of a
+        name (both case insensitive if there is no exact match).
+        Args:
+            query (str): the user identifier.
+            limit (int): the amount of users to find by name, one more is returned if there are more.
+        Returns:
+            list: the matching users (more than one when a name is shared or several names start with the query).
+        """
+        query = query.strip()
+        if query.startswith("<@") and query.endswith(">"):  # Strip a user mention.
+            query = query.strip("<@!>")
+        if query.isdigit() and int(query) in self.by_id:
+            return [self.by_id[int(query)]]
+        if query in self.by_tag:
+            return [self.by_tag[query]]
+        if query in self.by_name:
+            return list(self.by_name[query].values())
+        exact, partial = self.names.find(query, limit)
+        return [self.by_id[user_id] for user_id in exact or partial]
+
+    def __len__(self):
+        return len(self.by_id)
+
+
+class BanIndex:
+    def __init__(self):
+        """[summary]
+        Creates a per guild ban index, each guild's ban list is downloaded once and then kept current by ban events.
+        """
+        self.guilds = {}  #? guild id -> GuildBans
+        self.locks = {}  #? guild id -> asyncio.Lock (prevents loading the same ban list twice)
+
+    async def get(self, guild, resync: bool = False) -> GuildBans:
+        """[summary]
+        Returns the guild's ban index, downloading the ban list only on first use (or when asked to resync).
+        Args:
+            guild (discord.Guild): the guild to get the bans of.
+            resync (bool): if True the ban list is downloaded again.
+        """
+        lock = self.locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if resync or guild.id not in self.guilds:
+                bans = GuildBans()
+                bans.extend([entry.user for entry in await guild.bans()])
+                self.guilds[guild.id] = bans
+        return self.guilds[guild.id]
+
+    def on_ban(self, guild, user):
+        """[summary]
+        Adds a banned user to the guild's index (only if the index was already loaded).
+        """
+        if guild.id in self.guilds:
+            self.guilds[guild.id].add(user)
+
+    def on_unban(self, guild, user):
+        """[summary]
+        Removes an unbanned user from the guild's index (only if the index was already loaded).
+        """
+        if guild.id in self.guilds:
+            self.guilds[guild.id].remove(user.id)
+
+    def forget(self, guild):
+        """[summary]
+        Drops the guild's index (used when the bot leaves the guild).
+        """
+        self.guilds.pop(guild.id, None)
+        self.locks.pop(guild.id, None)
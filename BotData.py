@@ -1,5 +1,7 @@
 from discord import Status
 import configparser
+import json
+import time
 import os
 
 class BotData:
@@ -7,6 +9,45 @@ class BotData:
     TOKEN = str()
     BOT_PREFIX = str()
     STATUS = Status.online
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = int()  #? 0 disables the metrics endpoint.
+    SHARD_MODE = "single"  #? "single" (one gateway connection) or "auto" (AutoShardedBot).
+    SHARD_COUNT = int()  #? 0 asks discord for the recommended amount of shards.
+    SHARD_PROCESSES = 1  #? Amount of worker processes the shard launcher starts.
+    IDENTIFY_CONCURRENCY = int()  #? 0 asks discord for the bot's max identify concurrency.
+    SHARD_STATE_DIR = "shard_state"  #? Folder the workers share their statistics through.
+    SHARD_IDS = None  #? The shards this process runs (set by the shard launcher).
+    WORKER_ID = int()
+    LAUNCH_EPOCH = float()  #? The time the launcher started identifying, shared by all workers.
+    GATEWAY_RESUME = True  #? Save the gateway session on shutdown and resume it on the next start.
+    GATEWAY_SESSION_FILE = "gateway_session.json"
+    GATEWAY_RESUME_WINDOW = 120.0  #? Seconds after a shutdown in which a saved session is resumed.
+    MEMORY_PROFILE = "balanced"  #? "minimal", "balanced" or "full" (see MemoryProfile.py).
+    MESSAGE_CACHE = None  #? Overrides the profile's message cache size (0 disables it).
+    MEMBER_CACHE_SIZE = 1000  #? Amount of lazily fetched members the member resolver keeps.
+    STORAGE_FILE = "seniorbot.db"  #? The SQLite database all persistent state is stored in.
+    FRIEND_LIST_FILE = "friend_list.json"  #? Old json friend list, imported into the database on first start.
+    LOG_LEVEL = "INFO"
+    LOG_FILE = "seniorbot.log"  #? Empty logs to the console only.
+    LOG_MAX_BYTES = 10 * 2 ** 20  #? Size at which the log file is rotated.
+    LOG_BACKUPS = 5
+    LOG_CONSOLE = True
+    LOG_REPEAT_WINDOW = 60.0  #? Identical errors are logged at most LOG_REPEAT_BURST times per window (seconds).
+    LOG_REPEAT_BURST = 5
+    USE_UVLOOP = False  #? Run on uvloop (when installed) instead of the default asyncio event loop.
+    LAG_INTERVAL = 0.5  #? Seconds between event loop heartbeats.
+    STALL_THRESHOLD = 0.25  #? Heartbeat lag (seconds) reported as a stall.
+    PROFILE_DIR = "profiles"  #? Folder the profile command writes its dumps to.
+    ASYNCIO_DEBUG = False  #? asyncio debug mode, logs every callback slower than STALL_THRESHOLD (slows the bot down).
+    INDEX_PER_CHANNEL = 1000  #? Recent message ids indexed per channel for the clean command (0 disables the index).
+    INDEX_MAX_MESSAGES = 100000  #? Message ids indexed in all channels, the least active channels are dropped first.
+    CASE_INSENSITIVE_COMMANDS = False  #? Match command names and aliases regardless of case.
+    MEMBER_SEARCH_FUZZY = True  #? Suggest similar member names when a name matches nobody.
+    MEMBER_SEARCH_SIMILARITY = 0.5  #? Share of common trigrams (0 - 1) a suggested name needs.
+    REPLY_LIMIT = 5  #? Messages a channel allows per REPLY_WINDOW (discord's send rate limit).
+    REPLY_WINDOW = 5.0
+    REPLY_MAX_PENDING = 10  #? Replies queued per channel, beyond that low priority replies are dropped.
+    REPLY_MAX_AGE = 10.0  #? Seconds a fun command reply may wait before it is dropped.
 
     def read_config_data(self, path: str):
         """[summary]
@@ -21,27 +62,83 @@ class BotData:
             raise Exception("config file path does not exist!")
         self.BOT_PREFIX = cfg_parser['data']['prefix']
         self.TOKEN = cfg_parser['data']['token']
+        #? Optional sections, missing values keep the defaults above.
+        self.METRICS_HOST = cfg_parser.get('metrics', 'host', fallback=self.METRICS_HOST)
+        self.METRICS_PORT = cfg_parser.getint('metrics', 'port', fallback=self.METRICS_PORT)
+        self.SHARD_MODE = cfg_parser.get('sharding', 'mode', fallback=self.SHARD_MODE)
+        self.SHARD_COUNT = cfg_parser.getint('sharding', 'shard_count', fallback=self.SHARD_COUNT)
+        self.SHARD_PROCESSES = cfg_parser.getint('sharding', 'processes', fallback=self.SHARD_PROCESSES)
+        self.IDENTIFY_CONCURRENCY = cfg_parser.getint('sharding', 'identify_concurrency', fallback=self.IDENTIFY_CONCURRENCY)
+        self.SHARD_STATE_DIR = cfg_parser.get('sharding', 'state_dir', fallback=self.SHARD_STATE_DIR)
+        self.GATEWAY_RESUME = cfg_parser.getboolean('gateway', 'resume', fallback=self.GATEWAY_RESUME)
+        self.GATEWAY_SESSION_FILE = cfg_parser.get('gateway', 'session_file', fallback=self.GATEWAY_SESSION_FILE)
+        self.GATEWAY_RESUME_WINDOW = cfg_parser.getfloat('gateway', 'resume_window', fallback=self.GATEWAY_RESUME_WINDOW)
+        self.MEMORY_PROFILE = cfg_parser.get('memory', 'profile', fallback=self.MEMORY_PROFILE)
+        self.MESSAGE_CACHE = cfg_parser.getint('memory', 'message_cache', fallback=self.MESSAGE_CACHE)
+        self.MEMBER_CACHE_SIZE = cfg_parser.getint('memory', 'fetched_members', fallback=self.MEMBER_CACHE_SIZE)
+        self.LOG_LEVEL = cfg_parser.get('logging', 'level', fallback=self.LOG_LEVEL)
+        self.LOG_FILE = cfg_parser.get('logging', 'file', fallback=self.LOG_FILE)
+        self.LOG_MAX_BYTES = cfg_parser.getint('logging', 'max_bytes', fallback=self.LOG_MAX_BYTES)
+        self.LOG_BACKUPS = cfg_parser.getint('logging', 'backups', fallback=self.LOG_BACKUPS)
+        self.LOG_CONSOLE = cfg_parser.getboolean('logging', 'console', fallback=self.LOG_CONSOLE)
+        self.LOG_REPEAT_WINDOW = cfg_parser.getfloat('logging', 'repeat_window', fallback=self.LOG_REPEAT_WINDOW)
+        self.LOG_REPEAT_BURST = cfg_parser.getint('logging', 'repeat_burst', fallback=self.LOG_REPEAT_BURST)
+        self.USE_UVLOOP = cfg_parser.getboolean('loop', 'uvloop', fallback=self.USE_UVLOOP)
+        self.LAG_INTERVAL = cfg_parser.getfloat('loop', 'lag_interval', fallback=self.LAG_INTERVAL)
+        self.STALL_THRESHOLD = cfg_parser.getfloat('loop', 'stall_threshold', fallback=self.STALL_THRESHOLD)
+        self.ASYNCIO_DEBUG = cfg_parser.getboolean('loop', 'asyncio_debug', fallback=self.ASYNCIO_DEBUG)
+        self.INDEX_PER_CHANNEL = cfg_parser.getint('message_index', 'per_channel', fallback=self.INDEX_PER_CHANNEL)
+        self.INDEX_MAX_MESSAGES = cfg_parser.getint('message_index', 'max_messages', fallback=self.INDEX_MAX_MESSAGES)
+        self.CASE_INSENSITIVE_COMMANDS = cfg_parser.getboolean('commands', 'case_insensitive', fallback=self.CASE_INSENSITIVE_COMMANDS)
+        self.MEMBER_SEARCH_FUZZY = cfg_parser.getboolean('member_search', 'fuzzy', fallback=self.MEMBER_SEARCH_FUZZY)
+        self.MEMBER_SEARCH_SIMILARITY = cfg_parser.getfloat('member_search', 'min_similarity', fallback=self.MEMBER_SEARCH_SIMILARITY)
+        self.REPLY_LIMIT = cfg_parser.getint('replies', 'limit', fallback=self.REPLY_LIMIT)
+        self.REPLY_WINDOW = cfg_parser.getfloat('replies', 'window', fallback=self.REPLY_WINDOW)
+        self.REPLY_MAX_PENDING = cfg_parser.getint('replies', 'max_pending', fallback=self.REPLY_MAX_PENDING)
+        self.REPLY_MAX_AGE = cfg_parser.getfloat('replies', 'max_age', fallback=self.REPLY_MAX_AGE)
+        #? Relative paths are relative to the config file.
+        config_folder = os.path.dirname(os.path.abspath(path))
+        if not os.path.isabs(self.SHARD_STATE_DIR):
+            self.SHARD_STATE_DIR = os.path.join(config_folder, self.SHARD_STATE_DIR)
+        if not os.path.isabs(self.GATEWAY_SESSION_FILE):
+            self.GATEWAY_SESSION_FILE = os.path.join(config_folder, self.GATEWAY_SESSION_FILE)
+        self.STORAGE_FILE = os.path.join(config_folder, cfg_parser.get('storage', 'path', fallback=self.STORAGE_FILE))
+        self.FRIEND_LIST_FILE = os.path.join(config_folder, cfg_parser.get('storage', 'friend_list', fallback=self.FRIEND_LIST_FILE))
+        self.PROFILE_DIR = os.path.join(config_folder, cfg_parser.get('profiling', 'directory', fallback=self.PROFILE_DIR))
+        if self.LOG_FILE:
+            self.LOG_FILE = os.path.join(config_folder, self.LOG_FILE)
+
+    def read_shard_environment(self):
+        """[summary]
+        Reads the shard assignment the shard launcher passes to its worker processes through environment variables.
+        Returns:
+            bool: True if this process is a shard launcher worker.
+        """
+        shard_ids = os.environ.get("SENIORBOT_SHARD_IDS")
+        if shard_ids is None:
+            return False
+        self.SHARD_MODE = "auto"
+        self.SHARD_IDS = [int(shard_id) for shard_id in shard_ids.split(",")]
+        self.SHARD_COUNT = int(os.environ["SENIORBOT_SHARD_COUNT"])
+        self.WORKER_ID = int(os.environ.get("SENIORBOT_WORKER_ID", 0))
+        self.IDENTIFY_CONCURRENCY = int(os.environ.get("SENIORBOT_IDENTIFY_CONCURRENCY", 1))
+        self.LAUNCH_EPOCH = float(os.environ.get("SENIORBOT_LAUNCH_EPOCH", time.time()))
+        return True
     
-    def read_json(self, path:str):
+    def read_json(self, path: str) -> dict:
         """[summary]
-        Makes sure the friend list json file exists, if it doesn't exist the program will creat it itself.
+        Reads the friend list json file (used once to import it into the storage database).
+        The file is only read, a missing or broken file is treated as empty instead of being overwritten.
         Args:
             path (str): path to friend list json file.
+        Returns:
+            dict: the friend list (empty if the file is missing or not a json object).
         """
         if not os.path.exists(path):
-            creator = open(path, 'w+')
-            creator.close()
-        
-        f = open(path, 'r') 
-        f_str = f.read()
-        if len(f_str) >= 2:
-            if "{" != f_str[0] or "}" != f_str[-1]:
-                writer = open(path, 'w')
-                writer.write("{}")
-                writer.close()
-        else:
-            writer = open(path, 'w')
-            writer.write("{}")
-            writer.close()
-
-        f.close()
\ No newline at end of file
+            return {}
+        try:
+            with open(path, 'r') as reader:
+                data = json.load(reader)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
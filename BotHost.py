@@ -0,0 +1,141 @@
+#? SeniorBot host: runs several bots (one config and token each) in a single process on a shared event loop.
+#? Run: python BotHost.py customer1/botconfig.cfg customer2/botconfig.cfg ...
+#? Every bot keeps its own state (storage, caches, prefixes, timers), the bots share the interpreter and the imported modules,
+#? one HTTP connection pool, the command registry (help embeds) and the event loop watchdog.
+#? The process wide settings ([logging] and [loop]) are read from the first config.
+
+import importlib.util
+import argparse
+import logging
+import asyncio
+import sys
+import os
+
+import BotData
+import Hosting
+import LogPipeline
+import LoopWatchdog
+from CommandRegistry import CommandRegistry
+
+THIS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+BOT_FILE_PATH = os.path.join(THIS_FOLDER, "SeniorBot.py")
+LOG = logging.getLogger("seniorbot.host")
+
+
+def instance_names(config_paths: list) -> list:
+    """[summary]
+    Names every bot after its config file, or after the config's folder when the file names repeat (e.g. botconfig.cfg).
+    """
+    names = [os.path.splitext(os.path.basename(path))[0] for path in config_paths]
+    if len(set(names)) < len(names):
+        names = [os.path.basename(os.path.dirname(os.path.abspath(path))) for path in config_paths]
+    if len(set(names)) < len(names):
+        names = [f"bot{i}" for i in range(len(config_paths))]
+    return names
+
+
+def load_bot(host: Hosting.HostedBot):
+    """[summary]
+    Imports a separate copy of SeniorBot.py for the bot (its own module globals are its own state).
+    Returns:
+        module: the bot's SeniorBot module.
+    """
+    spec = importlib.util.spec_from_file_location(f"SeniorBot_{host.name}", BOT_FILE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # The command extensions find the bot's state through it.
+    Hosting.CURRENT = host
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        Hosting.CURRENT = None
+    return module
+
+
+async def create_connector() -> Hosting.SharedConnector:
+    return Hosting.SharedConnector(limit=0)  # No limit, every bot's gateway websocket holds a connection of the pool.
+
+
+async def run_bot(bot):
+    """[summary]
+    Runs a bot until it stops, a bot that fails (e.g. a bad token) doesn't stop the others.
+    """
+    try:
+        await bot.BOT.start(bot.BOT_DATA.TOKEN)
+    except Exception:
+        LOG.exception("bot %s stopped", bot.HOST.name)
+    finally:
+        if not bot.BOT.is_closed():
+            await bot.BOT.close()
+
+
+async def stop(loop, bots: list):
+    for bot in bots:
+        if not bot.BOT.is_closed():
+            await bot.BOT.close()
+    tasks = [task for task in asyncio.all_tasks(loop) if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs several SeniorBot bots in one process.")
+    parser.add_argument("configs", nargs="+", help="the config file of every bot")
+    args = parser.parse_args()
+    config_paths = [os.path.abspath(path) for path in args.configs]
+    os.chdir(THIS_FOLDER)  # SeniorBot looks for BotData.py in the working folder.
+
+    storage_files = {}
+    for path in config_paths:
+        bot_data = BotData.BotData()  # A fresh one, read values are the fallbacks of the next read.
+        try:
+            bot_data.read_config_data(path)
+        except Exception as e:
+            print(f"{path}: {e}")
+            exit()
+        if bot_data.STORAGE_FILE in storage_files:  # Two bots writing one database would overwrite each other's state.
+            print(f"{path} and {storage_files[bot_data.STORAGE_FILE]} use the same storage file {bot_data.STORAGE_FILE}!")
+            exit()
+        storage_files[bot_data.STORAGE_FILE] = path
+    bot_data = BotData.BotData()
+    bot_data.read_config_data(config_paths[0])  # The process wide settings.
+
+    if bot_data.USE_UVLOOP and not LoopWatchdog.install_uvloop():
+        print("uvloop is not installed, using the default asyncio event loop")
+    log_writer = LogPipeline.setup_logging(
+        bot_data.LOG_LEVEL,
+        bot_data.LOG_FILE or None,
+        max_bytes=bot_data.LOG_MAX_BYTES,
+        backups=bot_data.LOG_BACKUPS,
+        console=bot_data.LOG_CONSOLE,
+        window=bot_data.LOG_REPEAT_WINDOW,
+        burst=bot_data.LOG_REPEAT_BURST,
+    )
+    loop = asyncio.get_event_loop()
+    connector = loop.run_until_complete(create_connector())
+    registry = CommandRegistry()
+    watchdog = LoopWatchdog.LoopWatchdog(bot_data.LAG_INTERVAL, bot_data.STALL_THRESHOLD)
+
+    bots = []
+    for name, path in zip(instance_names(config_paths), config_paths):
+        bots.append(load_bot(Hosting.HostedBot(name, path, connector, registry, watchdog)))
+        LOG.info("loaded bot %s from %s", name, path)
+    for bot in bots:
+        bot.open_state()
+
+    asyncio.ensure_future(watchdog.run(bot_data.STALL_THRESHOLD if bot_data.ASYNCIO_DEBUG else None))
+    try:
+        loop.run_until_complete(asyncio.gather(*[run_bot(bot) for bot in bots]))
+    except KeyboardInterrupt:
+        LOG.info("stopping %d bots", len(bots))
+    finally:
+        loop.run_until_complete(stop(loop, bots))
+        loop.run_until_complete(connector.close_shared())
+        for bot in bots:
+            bot.close_state()
+        loop.close()
+        log_writer.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from discord.ext.commands.view import StringView
+from discord.ext import commands
+
+from OutboundQueue import QueuedContext
+
+_COMMAND = None  #? Trie key of the command a node's path spells (no name character is None).
+
+
+class CommandDispatcher:
+    def __init__(self, prefixes, case_insensitive: bool = False, outbox=None):
+        """[summary]
+        Creates a replacement for the bot's default message processing that keeps the cost of non-command messages minimal:
+        bots and webhooks are skipped before anything else, other messages are rejected after a single prefix check,
+        and command names / aliases are matched character by character against a trie built from the bot's commands.
+        Args:
+            prefixes (Prefixes.PrefixResolver): returns the prefix of a message.
+            case_insensitive (bool): match command names and aliases regardless of case.
+            outbox (OutboundQueue.OutboundQueue, optional): the queue command replies (`ctx.send`) are sent through.
+        """
+        self.prefixes = prefixes
+        self.case_insensitive = case_insensitive
+        self.outbox = outbox
+        self.trie = {}  #? char -> child node, a node's _COMMAND key holds the command its path spells.
+        self.size = -1  #? Size of the bot's command table the trie was built from.
+        self.received = 0  #? Amount of messages processed.
+        self.rejected_bots = 0  #? Messages of bots and webhooks.
+        self.rejected_prefix = 0  #? Messages that don't start with the prefix.
+        self.unknown = 0  #? Messages with the prefix but no known command.
+        self.dispatched = 0  #? Messages that invoked a command.
+
+    @property
+    def rejected(self) -> int:
+        return self.rejected_bots + self.rejected_prefix
+
+    def build(self, bot):
+        """[summary]
+        Builds the name / alias trie from the bot's commands.
+        In case insensitive mode names that only differ in case go to the command registered first.
+        """
+        trie = {}
+        for name, command in bot.all_commands.items():  # Already holds names and aliases.
+            node = trie
+            for char in name.lower() if self.case_insensitive else name:
+                node = node.setdefault(char, {})
+            node.setdefault(_COMMAND, command)
+        self.trie = trie
+        self.size = len(bot.all_commands)
+
+    def match(self, bot, content: str, start: int):
+        """[summary]
+        Finds the command whose name or alias is the word of `content` that begins at `start`.
+        Returns:
+            discord.ext.commands.Command: the command, or None if the word is not a command name.
+        """
+        if self.size != len(bot.all_commands):  # A command was added or removed since the last build.
+            self.build(bot)
+        node = self.trie
+        for i in range(start, len(content)):
+            char = content[i]
+            if char.isspace():  # The word ended (the same way `StringView.get_word` ends it).
+                break
+            node = node.get(char.lower() if self.case_insensitive else char)
+            if node is None:  # No command name continues with this character.
+                return None
+        return node.get(_COMMAND)
+
+    async def process(self, bot, message):
+        """[summary]
+        Processes a message the way `Bot.process_commands` does, errors (e.g. an unknown command) reach `on_command_error` as usual.
+        """
+        self.received += 1
+        if message.author.bot or message.webhook_id is not None:
+            self.rejected_bots += 1
+            return
+        prefix = self.prefixes(bot, message)
+        content = message.content
+        if not content.startswith(prefix):
+            self.rejected_prefix += 1
+            return
+
+        command = self.match(bot, content, len(prefix))
+        view = StringView(content)
+        view.skip_string(prefix)
+        if self.outbox is None:
+            ctx = commands.Context(prefix=prefix, view=view, bot=bot, message=message)
+        else:
+            ctx = QueuedContext(self.outbox, prefix=prefix, view=view, bot=bot, message=message)
+        ctx.invoked_with = view.get_word()
+        ctx.command = command
+        if command is None:
+            self.unknown += 1
+        else:
+            self.dispatched += 1
+        await bot.invoke(ctx)
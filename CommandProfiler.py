@@ -0,0 +1,107 @@
+from LogPipeline import command_context
+import tracemalloc
+import datetime
+import logging
+import asyncio
+import cProfile
+import random
+import time
+import os
+
+LOG = logging.getLogger("seniorbot.profiler")
+TOP_ALLOCATIONS = 25  #? Allocation sites written to a dump.
+
+
+class CommandProfiler:
+    def __init__(self, directory: str):
+        """[summary]
+        Profiles command invocations on demand: cProfile for the CPU time and tracemalloc for the allocations.
+        Profiling is off until `start` is called, the invoke hooks then cost a single attribute check.
+        Only one invocation is profiled at a time (both profilers are process wide), and while it runs the profile also
+        contains whatever else the event loop runs.
+        Args:
+            directory (str): the folder the dumps are written to.
+        """
+        self.directory = directory
+        self.target = None  #? None (off), "all" or the qualified name of the profiled command.
+        self.deadline = 0.0
+        self.rate = 1.0  #? Fraction of the matching invocations that are profiled.
+        self.running = None  #? (context, cProfile.Profile) of the invocation being profiled.
+        self.dumps = 0  #? Amount of dumps written since the last `start`.
+
+    def start(self, target: str, seconds: float, rate: float = 1.0):
+        """[summary]
+        Profiles the target's invocations for the next `seconds` seconds.
+        Args:
+            target (str): a command's qualified name or "all".
+            seconds (float): length of the profiling window.
+            rate (float): fraction of the invocations profiled (0 < rate <= 1).
+        """
+        if not 0 < rate <= 1:
+            raise ValueError("The sample rate must be between 0 and 1.")
+        self.target = target
+        self.deadline = time.monotonic() + seconds
+        self.rate = rate
+        self.dumps = 0
+
+    def stop(self):
+        self.target = None
+
+    @property
+    def remaining(self) -> float:
+        """[summary]
+        Seconds left in the profiling window (0 when profiling is off).
+        """
+        if self.target is None:
+            return 0.0
+        return max(0.0, self.deadline - time.monotonic())
+
+    def begin(self, ctx):
+        """[summary]
+        Starts profiling the invocation if it is selected, should be called from the bot's `before_invoke` hook.
+        """
+        if self.target is None:
+            return
+        if time.monotonic() > self.deadline:
+            self.target = None
+            return
+        if self.running is not None or (self.target != "all" and self.target != ctx.command.qualified_name):
+            return
+        if self.rate < 1 and random.random() >= self.rate:
+            return
+        tracemalloc.start()
+        profile = cProfile.Profile()
+        self.running = (ctx, profile)
+        profile.enable()
+
+    async def end(self, ctx):
+        """[summary]
+        Stops profiling the invocation and writes its dumps, should be called from the bot's `after_invoke` hook.
+        """
+        if self.running is None or self.running[0] is not ctx:
+            return
+        profile = self.running[1]
+        profile.disable()
+        self.running = None
+        allocations = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.dumps += 1
+
+        guild = ctx.guild.id if ctx.guild is not None else "dm"
+        command = ctx.command.qualified_name.replace(" ", "_")
+        name = f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{guild}-{command}-{self.dumps}"
+        path = os.path.join(self.directory, name)
+        await asyncio.get_event_loop().run_in_executor(None, self.write_dumps, path, profile, allocations, peak)
+        LOG.info("profiled %s into %s", ctx.command.qualified_name, path, extra=command_context(ctx))
+
+    def write_dumps(self, path: str, profile, allocations, peak: int):
+        """[summary]
+        Writes `path`.prof (open with pstats / snakeviz) and `path`.alloc.txt (top allocation sites), runs in an executor.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(path + ".prof")
+        with open(path + ".alloc.txt", "w") as writer:
+            writer.write(f"peak traced memory: {peak} bytes\n")
+            for stat in allocations.statistics("lineno")[:TOP_ALLOCATIONS]:
+                writer.write(f"{stat}\n")
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+import discord
+
+EMBED_FIELD_LIMIT = 25  #? Discord refuses embeds with more than 25 fields.
+CACHED_PREFIXES = 256  #? The embeds of the most recently used prefixes are kept.
+
+
+class CommandRegistry:
+    def __init__(self):
+        """[summary]
+        Creates a registry that maps command names and aliases to commands and caches the rendered help embeds.
+        The registry is rebuilt only when the bot's command set changes (or `invalidate` is called).
+        Bots that run the same commands (see BotHost.py) can share a registry, help embeds are cached per bot avatar.
+        """
+        self.commands = {}  #? name / alias -> discord.ext.commands.Command
+        self.ordered = []  #? Unique commands in registration order.
+        self.size = -1  #? Size of the bot's command table the registry was built from.
+        self.help_pages = OrderedDict()  #? (prefix, thumbnail url) -> list of the full help embeds.
+        self.command_pages = OrderedDict()  #? (prefix, command name) -> the command's help embed.
+        self.thumbnails = {}  #? bot user id -> avatar url shown on the help embeds.
+
+    def build(self, bot):
+        """[summary]
+        Builds the name / alias table from the bot's commands and drops every cached embed.
+        Args:
+            bot (discord.ext.commands.Bot): the bot to read the commands from.
+        """
+        self.commands = dict(bot.all_commands)  # Already holds names and aliases.
+        self.ordered = list(dict.fromkeys(bot.all_commands.values()))  # Unique, in registration order.
+        self.size = len(bot.all_commands)
+        if bot.user is not None:
+            self.thumbnails[bot.user.id] = str(bot.user.avatar_url)
+        self.invalidate()
+
+    def invalidate(self):
+        """[summary]
+        Drops every cached embed, they will be rendered again on next use.
+        """
+        self.help_pages = OrderedDict()
+        self.command_pages = OrderedDict()
+
+    def ensure_current(self, bot):
+        if self.size != len(bot.all_commands):  # A command was added or removed since the last build.
+            self.build(bot)
+
+    def get_command(self, bot, name: str):
+        """[summary]
+        Returns the command with the given name or alias, or None.
+        """
+        self.ensure_current(bot)
+        return self.commands.get(name)
+
+    def help_embeds(self, bot, prefix: str) -> list:
+        """[summary]
+        Returns the cached full help embeds (one per 25 commands) for the given prefix and the bot's avatar.
+        """
+        self.ensure_current(bot)
+        key = (prefix, self.thumbnails.get(bot.user.id) if bot.user is not None else None)
+        pages = self.help_pages.get(key)
+        if pages is not None:
+            self.help_pages.move_to_end(key)
+        else:
+            pages = self.render_help(*key)
+            self.help_pages[key] = pages
+            if len(self.help_pages) > CACHED_PREFIXES:
+                self.help_pages.popitem(last=False)
+        return pages
+
+    def command_embed(self, bot, prefix: str, name: str):
+        """[summary]
+        Returns the cached help embed of the command with the given name or alias, or None if there is no such command.
+        """
+        command = self.get_command(bot, name)
+        if command is None:
+            return None
+        key = (prefix, command.name)
+        embed = self.command_pages.get(key)
+        if embed is not None:
+            self.command_pages.move_to_end(key)
+        else:
+            embed = self.render_command(command, prefix)
+            self.command_pages[key] = embed
+            if len(self.command_pages) > CACHED_PREFIXES * 8:
+                self.command_pages.popitem(last=False)
+        return embed
+
+    def render_help(self, prefix: str, thumbnail_url: str = None) -> list:
+        pages = []
+        for i in range(0, max(len(self.ordered), 1), EMBED_FIELD_LIMIT):
+            embed = discord.Embed(color=discord.Color.gold())
+            if thumbnail_url is not None:
+                embed.set_thumbnail(url=thumbnail_url)
+            embed.set_footer(text="Senior Bot's Commands")
+            for cmd in self.ordered[i : i + EMBED_FIELD_LIMIT]:
+                embed.add_field(
+                    name=str(f"♿|**{prefix}{cmd.name}**: "),
+                    value=str(f"❓ {cmd.brief}"),
+                    inline=False,
+                )
+            pages.append(embed)
+        return pages
+
+    def render_command(self, command, prefix: str) -> discord.Embed:
+        # Check if command has any aliases, if not return 'None'.
+        if len(command.aliases) == 0:
+            aliases_str = "None"
+        else:
+            aliases_str = ", ".join([f'"{alias}"' for alias in command.aliases])
+
+        embed = discord.Embed(color=discord.Color.dark_orange())
+        embed.set_footer(text=f'"{command.name}" thorough description')
+        embed.add_field(name="💬 Command Name 💬", value=command.name, inline=False)
+        embed.add_field(name="❓ Brief Explanation ❓", value=command.brief, inline=False)
+        embed.add_field(name="📰 Description 📰", value=command.description, inline=False)
+        embed.add_field(name="⚙ Command Usage ⚙", value=(command.usage or "").replace("{prefix}", prefix), inline=False)
+        embed.add_field(name="🎭 Command Name Aliases 🎭", value=aliases_str, inline=False)
+        return embed
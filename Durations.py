@@ -0,0 +1,40 @@
+import datetime
+import re
+
+#? Unit suffix -> amount of seconds.
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+DURATION_PATTERN = re.compile(r"(\d+)([smhdw])")
+
+
+def parse_duration(text: str) -> datetime.timedelta:
+    """[summary]
+    Parses a duration such as "30m", "2h" or "1d12h" into a timedelta.
+    Args:
+        text (str): the duration text (units: s, m, h, d, w).
+    Raises:
+        ValueError: the text is not a valid positive duration.
+    """
+    text = text.strip().lower()
+    parts = DURATION_PATTERN.findall(text)
+    if len(parts) == 0 or "".join(amount + unit for amount, unit in parts) != text:
+        raise ValueError(f'"{text}" is not a valid duration (examples: 30m, 2h, 1d12h).')
+    seconds = sum(int(amount) * UNITS[unit] for amount, unit in parts)
+    if seconds <= 0:
+        raise ValueError("Duration must be positive.")
+    try:
+        return datetime.timedelta(seconds=seconds)
+    except OverflowError:
+        raise ValueError(f'"{text}" is too long of a duration.')
+
+
+def format_duration(delta: datetime.timedelta) -> str:
+    """[summary]
+    Formats a timedelta in the same short form `parse_duration` accepts (e.g. "1d12h").
+    """
+    seconds = int(delta.total_seconds())
+    parts = []
+    for unit, size in sorted(UNITS.items(), key=lambda item: -item[1]):
+        amount, seconds = divmod(seconds, size)
+        if amount > 0:
+            parts.append(f"{amount}{unit}")
+    return "".join(parts) if len(parts) > 0 else "0s"
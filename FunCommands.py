@@ -0,0 +1,62 @@
+#? SeniorBot fun and useful commands, a discord.py extension the `reload` command reloads in place.
+
+from discord.ext import commands
+import random
+
+
+@commands.command(
+    name="coinflip",
+    aliases=["flip", "coin"],
+    brief="Returns heads/tails.",
+    description="This command simulates a coinflip by choosing randomly heads or tails.",
+    usage="| **{prefix}coinflip** -> will print out a random response which would be either 'heads' or 'tails'.",
+)
+async def coinflip(ctx):
+    """
+    This command returns a random response (head / tails) to simulate a coin toss.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    await ctx.send(
+        ctx.message.author.mention + " " + random.choice(["🧿Heads", "🧿Tails"])
+    )  # Return the random response.
+
+
+@commands.command(
+    name="RandInt",
+    aliases=["RandI", "RInt", "RI"],
+    brief="Returns a random integer in a given range.",
+    description="Returns a random integer in a given range. The range is between (bottom limit) up to (top limit).",
+    usage="| **{prefix}RandInt <bottom limit> <top limit>** -> will return a random number between bottom limit and top limit (top limit is in range).",
+)
+async def RandInt(ctx, bottom: int, top: int):
+    """
+    This command will return a random integer in the range of (bottom ; top + 1).
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param bottom (int): bottom range limit.
+    @param top (int): top range limit.
+    """
+    if bottom < top:  # Check if input is valid (top > bottom)
+        try:
+            await ctx.send(
+                "Random integer between {} and {}: {}".format(
+                    bottom, top, random.randint(bottom, top)
+                )  # Return random integer.
+            )
+        except:
+            await ctx.send(
+                "Invalid Parameters! check out {}help!".format(ctx.prefix)
+            )
+    else:
+        await ctx.send(
+            "Can not randomize a number with a min limit higher than the max limit!"
+        )
+
+
+def setup(bot):
+    """
+    Adds the extension's commands to the bot, discord.py calls it on every load and reload of the extension.
+    @param bot (discord.ext.commands.Bot): the bot.
+    """
+    for value in list(globals().values()):
+        if isinstance(value, commands.Command):
+            bot.add_command(value)
@@ -0,0 +1,160 @@
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
+from discord.user import ClientUser
+import discord.client
+import discord.shard
+import asyncio
+import json
+import time
+import os
+
+
+class SessionStore:
+    def __init__(self, path: str, resume_window: float = 120.0):
+        """[summary]
+        Saves the gateway sessions of a graceful shutdown so the next start can RESUME them instead of identifying again.
+        Args:
+            path (str): path to the session json file.
+            resume_window (float): seconds after the shutdown in which a saved session is still worth resuming.
+        """
+        self.path = path
+        self.resume_window = resume_window
+        self.pending = {}  #? shard key -> saved session, consumed by the first connection of that shard.
+        self.resumed = set()  #? Shard keys that resumed a saved session and still need their cache hydrated.
+
+    def load(self):
+        """[summary]
+        Loads the saved sessions (dropping stale ones) and deletes the file so a session is never resumed twice.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as reader:
+                sessions = json.load(reader)
+        except (OSError, ValueError):
+            sessions = {}
+        os.remove(self.path)
+        now = time.time()
+        self.pending = {
+            key: session
+            for key, session in sessions.items()
+            if now - session.get("saved_at", 0) <= self.resume_window
+        }
+
+    def save(self, ws):
+        """[summary]
+        Adds a closing websocket's session to the session file (runs during shutdown, so blocking file access is fine).
+        """
+        sessions = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as reader:
+                    sessions = json.load(reader)
+            except (OSError, ValueError):
+                sessions = {}
+        sessions[str(ws.shard_id)] = {
+            "session_id": ws.session_id,
+            "sequence": ws.sequence,
+            "gateway": ws.gateway,
+            "saved_at": time.time(),
+        }
+        with open(self.path + ".tmp", "w") as writer:
+            json.dump(sessions, writer)
+        os.replace(self.path + ".tmp", self.path)
+
+
+class ResumableWebSocket(DiscordWebSocket):
+    """[summary]
+    A gateway websocket that resumes a saved session on its first connection and keeps its session alive on a graceful close.
+    Clients without a session store behave exactly like with the default websocket.
+    """
+
+    @classmethod
+    async def from_client(cls, client, *, initial=False, shard_id=None, **kwargs):
+        store = getattr(client, "session_store", None)
+        saved = store.pending.pop(str(shard_id), None) if store is not None else None
+        if initial and saved is not None:
+            kwargs.update(
+                gateway=saved["gateway"],
+                session=saved["session_id"],
+                sequence=saved["sequence"],
+                resume=True,
+            )
+            store.resumed.add(str(shard_id))
+        elif store is not None and not kwargs.get("resume"):  # Identifying (e.g. the saved session was invalid), READY fills the cache.
+            store.resumed.discard(str(shard_id))
+        ws = await super().from_client(client, initial=initial, shard_id=shard_id, **kwargs)
+        ws.session_store = store
+        return ws
+
+    async def close(self, code=4000):
+        store = getattr(self, "session_store", None)
+        # Closing with 1000 makes discord drop the session, a graceful shutdown closes with 4000 and saves it instead.
+        # (An invalidated session was already cleared, so it is closed with 1000 and never saved.)
+        if code == 1000 and store is not None and self.session_id is not None:
+            store.save(self)
+            code = 4000
+        await super().close(code=code)
+
+
+def install(bot, store: SessionStore):
+    """[summary]
+    Enables session resuming for the bot.
+    Args:
+        bot (discord.Client): the bot.
+        store (SessionStore): where the sessions are saved.
+    """
+    store.load()
+    bot.session_store = store
+    #? discord.py creates its websockets through these module globals.
+    discord.client.DiscordWebSocket = ResumableWebSocket
+    discord.shard.DiscordWebSocket = ResumableWebSocket
+
+
+async def hydrate(bot, store: SessionStore, shard_id=None, concurrency: int = 4):
+    """[summary]
+    Rebuilds the cache of a resumed shard over REST, a RESUME replays the missed events but not READY and the guilds it carries.
+    Args:
+        bot (discord.Client): the bot.
+        store (SessionStore): the session store that resumed the shard.
+        shard_id (int, optional): the resumed shard (None for an unsharded bot).
+        concurrency (int): the amount of guilds fetched at once.
+    """
+    key = str(shard_id)
+    if key not in store.resumed:  # A normal in-session resume, the cache is intact.
+        return
+    store.resumed.discard(key)
+
+    state = bot._connection
+    http = bot.http
+    if state.user is None:
+        state.user = ClientUser(state=state, data=await http.request(Route("GET", "/users/@me")))
+        state._users[state.user.id] = state.user
+
+    guild_ids = []
+    after = 0
+    while True:  # The guild list is paged, 200 guilds per request.
+        page = await http.request(Route("GET", "/users/@me/guilds"), params={"limit": 200, "after": after})
+        guild_ids.extend(int(guild["id"]) for guild in page)
+        if len(page) < 200:
+            break
+        after = page[-1]["id"]
+    if shard_id is not None:  # Only the guilds of this shard.
+        guild_ids = [guild_id for guild_id in guild_ids if (guild_id >> 22) % bot.shard_count == shard_id]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load_guild(guild_id):
+        async with semaphore:
+            data = await http.request(
+                Route("GET", "/guilds/{guild_id}", guild_id=guild_id), params={"with_counts": "true"}
+            )
+            data["channels"] = await http.get_all_guild_channels(guild_id)
+            data["member_count"] = data.get("approximate_member_count")
+            state._add_guild_from_data(data)
+
+    await asyncio.gather(*[load_guild(guild_id) for guild_id in guild_ids if state._get_guild(guild_id) is None])
+
+    if len(store.resumed) == 0 and not bot.is_ready():  # Every resumed shard is hydrated, the bot is ready.
+        state.call_handlers("ready")
+        bot.dispatch("ready")
@@ -0,0 +1,103 @@
+import math
+
+GUILDS_PER_PAGE = 15  #? 15 names of up to 60 characters always fit in a 1024 character embed field.
+MAX_NAME_LENGTH = 60
+
+
+class GuildStats:
+    def __init__(self):
+        """[summary]
+        Creates aggregate guild statistics that are kept current by guild and member events instead of being recomputed on every use.
+        """
+        self.guild_names = {}  #? guild id -> guild name
+        self.guild_members = {}  #? guild id -> member count
+        self.member_count = 0  #? Sum of all guild member counts.
+        self.pages = None  #? Cached guild listing pages (None when the listing changed).
+
+    @property
+    def guild_count(self) -> int:
+        return len(self.guild_names)
+
+    def rebuild(self, guilds):
+        """[summary]
+        Recounts everything from the bot's guilds (used once the bot is ready).
+        Args:
+            guilds (list): the bot's guilds.
+        """
+        self.guild_names = {}
+        self.guild_members = {}
+        self.member_count = 0
+        self.pages = None  # Also when there are no guilds to add.
+        for guild in guilds:
+            self.add_guild(guild)
+
+    def export(self) -> dict:
+        """[summary]
+        Returns the statistics as a json serializable dict (used to share them between shard processes).
+        """
+        return {
+            str(guild_id): [name, self.guild_members[guild_id]]
+            for guild_id, name in self.guild_names.items()
+        }
+
+    def merge(self, exports: list):
+        """[summary]
+        Replaces the statistics with the combination of several exported ones.
+        Args:
+            exports (list): dicts returned by `export`.
+        """
+        self.guild_names = {}
+        self.guild_members = {}
+        for exported in exports:
+            for guild_id, (name, members) in exported.items():
+                self.guild_names[int(guild_id)] = name
+                self.guild_members[int(guild_id)] = members
+        self.member_count = sum(self.guild_members.values())
+        self.pages = None
+
+    def add_guild(self, guild):
+        self.remove_guild(guild)  # Don't count a guild twice if it becomes available again.
+        self.guild_names[guild.id] = guild.name
+        self.guild_members[guild.id] = guild.member_count or 0
+        self.member_count += self.guild_members[guild.id]
+        self.pages = None
+
+    def remove_guild(self, guild):
+        if guild.id in self.guild_names:
+            del self.guild_names[guild.id]
+            self.member_count -= self.guild_members.pop(guild.id)
+            self.pages = None
+
+    def rename_guild(self, guild):
+        if guild.id in self.guild_names and self.guild_names[guild.id] != guild.name:
+            self.guild_names[guild.id] = guild.name
+            self.pages = None
+
+    def member_joined(self, guild):
+        if guild.id in self.guild_members:
+            self.guild_members[guild.id] += 1
+            self.member_count += 1
+
+    def member_left(self, guild):
+        if guild.id in self.guild_members:
+            self.guild_members[guild.id] -= 1
+            self.member_count -= 1
+
+    def page_count(self) -> int:
+        return max(math.ceil(self.guild_count / GUILDS_PER_PAGE), 1)
+
+    def guild_page(self, page: int) -> str:
+        """[summary]
+        Returns a page of the guild listing (pages start at 1), the listing is rendered only after it changes.
+        """
+        if self.pages is None:
+            names = sorted(self.guild_names.values(), key=str.lower)
+            lines = [
+                "- " + (name if len(name) <= MAX_NAME_LENGTH else name[: MAX_NAME_LENGTH - 3] + "...")
+                for name in names
+            ]
+            self.pages = [
+                "\n".join(lines[i : i + GUILDS_PER_PAGE])
+                for i in range(0, len(lines), GUILDS_PER_PAGE)
+            ] or ["None"]
+        return self.pages[min(max(page, 1), len(self.pages)) - 1]
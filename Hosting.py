@@ -0,0 +1,35 @@
+import aiohttp
+import asyncio
+
+CURRENT = None  #? The instance BotHost.py is loading, SeniorBot reads it while it is imported (None when it runs on its own).
+
+
+class SharedConnector(aiohttp.TCPConnector):
+    """[summary]
+    An HTTP connection pool shared by the bots of a host process.
+    discord.py closes its session's connector when a bot stops, so the pool ignores that and only `close_shared` closes it.
+    """
+
+    def close(self):
+        return asyncio.sleep(0)  #? The session awaits the result.
+
+    def close_shared(self):
+        return super().close()
+
+
+class HostedBot:
+    def __init__(self, name: str, config_path: str, connector: SharedConnector, registry, watchdog):
+        """[summary]
+        Holds what a bot instance gets from the host: its own name and config, and the objects every instance shares.
+        Args:
+            name (str): the instance name (its logs are written by the "seniorbot.<name>" logger).
+            config_path (str): path to the instance's config file.
+            connector (SharedConnector): the shared HTTP connection pool.
+            registry (CommandRegistry.CommandRegistry): the shared command table and help embed cache.
+            watchdog (LoopWatchdog.LoopWatchdog): the event loop lag monitor of the shared event loop.
+        """
+        self.name = name
+        self.config_path = config_path
+        self.connector = connector
+        self.registry = registry
+        self.watchdog = watchdog
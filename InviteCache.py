@@ -0,0 +1,72 @@
+import discord
+import datetime
+
+
+class InviteCache:
+    def __init__(self, max_age: int = 3600, max_uses: int = 3, refresh_margin: int = 300):
+        """[summary]
+        Creates a per channel invite cache, an invite is reused until it is about to expire or discord deletes it.
+        Args:
+            max_age (int): seconds a created invite stays valid.
+            max_uses (int): amount of uses a created invite allows.
+            refresh_margin (int): seconds before expiry at which a new invite is created instead of reusing the old one.
+        """
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.refresh_margin = datetime.timedelta(seconds=refresh_margin)
+        self.invites = {}  #? channel id -> (discord.Invite, expiry time)
+        self.created = 0  #? Amount of invites created (REST writes).
+        self.reused = 0  #? Amount of times a cached invite was reused.
+
+    async def get(self, channel) -> discord.Invite:
+        """[summary]
+        Returns a usable invite to the channel, creating one only if there is no cached invite with time and uses left.
+        Args:
+            channel (discord.abc.GuildChannel): the channel to invite to.
+        """
+        cached = self.invites.get(channel.id)
+        if cached is not None:
+            invite, expires_at = cached
+            if datetime.datetime.utcnow() < expires_at - self.refresh_margin and (
+                invite.max_uses == 0 or (invite.uses or 0) < invite.max_uses
+            ):
+                self.reused += 1
+                return invite
+
+        invite = await channel.create_invite(
+            max_age=self.max_age, max_uses=self.max_uses, unique=True
+        )
+        self.created += 1
+        self.invites[channel.id] = (
+            invite,
+            datetime.datetime.utcnow() + datetime.timedelta(seconds=self.max_age),
+        )
+        return invite
+
+    def on_invite_delete(self, invite):
+        """[summary]
+        Forgets a deleted invite (deleted by hand, or used up / expired which discord reports as a delete).
+        """
+        if invite.channel is None:
+            return
+        cached = self.invites.get(invite.channel.id)
+        if cached is not None and cached[0].code == invite.code:
+            del self.invites[invite.channel.id]
+
+    def on_member_join(self, member):
+        """[summary]
+        Counts a join against the guild's cached invites, so an invite without uses left is not handed out again.
+        Discord doesn't tell which invite was used, so the join is counted against every cached invite of the guild (an
+        invite may be replaced a bit early, but never reused once it is used up).
+        """
+        for channel in member.guild.channels:
+            cached = self.invites.get(channel.id)
+            if cached is not None:
+                cached[0].uses = (cached[0].uses or 0) + 1
+
+    def forget_guild(self, guild):
+        """[summary]
+        Drops the cached invites of a guild's channels (used when the bot leaves the guild).
+        """
+        for channel in guild.channels:
+            self.invites.pop(channel.id, None)
@@ -0,0 +1,132 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import datetime
+import logging
+import queue
+import copy
+import json
+import time
+import sys
+
+#? Record attributes copied into the json output when a log call passes them through `extra`.
+CONTEXT_FIELDS = ("guild", "channel", "command", "user", "latency_ms", "error_type", "snapshot", "stack")
+
+
+class JsonFormatter(logging.Formatter):
+    """[summary]
+    Formats every record as a single json line.
+    """
+
+    def format(self, record) -> str:
+        entry = {
+            "time": datetime.datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RepeatFilter(logging.Filter):
+    def __init__(self, window: float = 60.0, burst: int = 5):
+        """[summary]
+        Rate limits identical warnings and errors (same logger, level and message), e.g. the same error repeated during a spam storm.
+        Each message may be logged `burst` times per `window` seconds, the next one that gets through reports how many were dropped.
+        """
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.seen = {}  #? (logger, level, message) -> [window start, count in window, suppressed count]
+
+    def filter(self, record) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        entry = self.seen.get(key)
+        if entry is None or now - entry[0] > self.window:
+            suppressed = entry[2] if entry is not None else 0
+            self.seen[key] = [now, 1, 0]
+            if len(self.seen) > 10000:  # Forget old messages so the table can't grow forever.
+                self.seen = {k: v for k, v in self.seen.items() if now - v[0] <= self.window}
+            record.suppressed = suppressed
+            return True
+        entry[1] += 1
+        if entry[1] <= self.burst:
+            return True
+        entry[2] += 1
+        return False
+
+
+class StructuredQueueHandler(QueueHandler):
+    """[summary]
+    Puts records on the log queue without formatting them, the json formatting happens on the writer thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()  # Resolve the arguments now, they may change after the call returns.
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = "INFO", path: str = None, max_bytes: int = 10 * 2 ** 20, backups: int = 5,
+                  console: bool = True, window: float = 60.0, burst: int = 5) -> QueueListener:
+    """[summary]
+    Routes the bot's, discord.py's and asyncio's logs through a queue to a background writer thread, so slow stdout or disk never stall the event loop.
+    Args:
+        level (str): the minimum level logged.
+        path (str, optional): the log file (rotated by size), None logs only to the console.
+        max_bytes (int): the size at which the log file is rotated.
+        backups (int): the amount of rotated log files kept.
+        console (bool): also write the logs to stdout.
+        window (float): see `RepeatFilter`.
+        burst (int): see `RepeatFilter`.
+    Returns:
+        QueueListener: the writer, stop it on shutdown to flush the queue.
+    """
+    formatter = JsonFormatter()
+    handlers = []
+    if path:
+        file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(RepeatFilter(window, burst))
+    for name in ("seniorbot", "discord", "asyncio"):
+        logger = logging.getLogger(name)
+        logger.setLevel(level.upper())
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def command_context(ctx) -> dict:
+    """[summary]
+    Returns the `extra` fields describing a command invocation.
+    """
+    return {
+        "guild": ctx.guild.id if ctx.guild is not None else None,
+        "channel": ctx.channel.id,
+        "command": ctx.command.qualified_name if ctx.command is not None else ctx.invoked_with,
+        "user": ctx.author.id,
+    }
@@ -0,0 +1,159 @@
+from collections import deque
+from Metrics import Histogram
+import traceback
+import threading
+import logging
+import asyncio
+import time
+import sys
+import os
+
+LOG = logging.getLogger("seniorbot.watchdog")
+STACK_DEPTH = 15  #? Innermost frames kept of a stalled loop's stack.
+
+
+def install_uvloop() -> bool:
+    """[summary]
+    Makes new event loops uvloop loops, must run before the bot (and its loop) is created.
+    Returns:
+        bool: False if uvloop is not installed (the default asyncio loop is kept).
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+class LoopWatchdog:
+    def __init__(self, interval: float = 0.5, threshold: float = 0.25, history: int = 50):
+        """[summary]
+        Measures the event loop's lag with a heartbeat task and catches the code that blocks it.
+        A monitor thread notices when the heartbeat is late, captures the loop thread's stack while it is still blocked and
+        attributes the stall to the command, listener or task found in that stack.
+        Args:
+            interval (float): seconds between heartbeats.
+            threshold (float): lag (seconds) from which a late heartbeat counts as a stall.
+            history (int): the amount of stalls kept for the lag command.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = Histogram()
+        self.last_lag = 0.0
+        self.worst_lag = 0.0
+        self.owners = {}  #? code object -> label of the command / listener / task it belongs to.
+        self.stalls = deque(maxlen=history)  #? Recent stalls, oldest first: {"label", "duration", "time", "stack"}.
+        self.offenders = {}  #? label -> [stalls, total seconds, worst seconds]
+        self.beats = 0
+        self.beat_at = None  #? Monotonic time of the last heartbeat.
+        self.pending = None  #? A stall captured by the monitor thread, completed by the next heartbeat.
+        self.loop = None
+        self.loop_thread = None
+        self.monitor = None
+
+    def watch(self, function, label: str):
+        """[summary]
+        Attributes stalls inside `function` (a coroutine function) to `label`.
+        """
+        function = getattr(function, "callback", function)  # Commands.
+        self.owners[function.__code__] = label
+
+    def watch_bot(self, bot):
+        """[summary]
+        Watches every command and listener of the bot.
+        """
+        for command in bot.walk_commands():
+            self.watch(command.callback, f"command:{command.qualified_name}")
+        for event, listeners in bot.extra_events.items():
+            for listener in listeners:
+                self.watch(listener, f"event:{event}")
+
+    async def run(self, slow_callback_duration: float = None):
+        """[summary]
+        The heartbeat task, it also starts the monitor thread.
+        Args:
+            slow_callback_duration (float, optional): also turns on asyncio's debug mode, which logs every callback slower than this.
+        """
+        self.loop = asyncio.get_event_loop()
+        self.loop_thread = threading.get_ident()
+        if slow_callback_duration is not None:
+            self.loop.set_debug(True)
+            self.loop.slow_callback_duration = slow_callback_duration
+        self.beat_at = time.monotonic()
+        self.monitor = threading.Thread(target=self.monitor_loop, name="loop-watchdog", daemon=True)
+        self.monitor.start()
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.beat_at = now
+            self.beats += 1
+            self.lag.observe(lag)
+            self.last_lag = lag
+            self.worst_lag = max(self.worst_lag, lag)
+
+            stall = self.pending
+            self.pending = None
+            if stall is not None and stall["beat"] == self.beats - 1:  # Captured during the gap this heartbeat just closed.
+                stall["duration"] = lag
+                self.record(stall)
+
+    def monitor_loop(self):
+        """[summary]
+        The monitor thread: captures the loop thread's stack once per stall.
+        """
+        captured = -1
+        while True:
+            time.sleep(self.interval / 2)
+            beats = self.beats
+            if captured == beats or time.monotonic() - self.beat_at < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None:  # The loop thread is gone.
+                return
+            captured = beats
+            label, stack = self.attribute(frame)
+            del frame
+            self.pending = {"label": label, "stack": stack, "time": time.time(), "beat": beats}
+
+    def attribute(self, frame) -> tuple:
+        """[summary]
+        Finds the watched code the blocked loop is running.
+        Returns:
+            tuple: the label and the formatted stack (innermost frames).
+        """
+        stack = "".join(traceback.format_stack(frame)[-STACK_DEPTH:])
+        current = frame
+        while current is not None:
+            label = self.owners.get(current.f_code)
+            if label is not None:
+                return label, stack
+            current = current.f_back
+        task = asyncio.current_task(self.loop)
+        if task is not None:
+            return f"task:{task.get_coro().__qualname__}", stack
+        return f"callback:{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}", stack
+
+    def record(self, stall: dict):
+        del stall["beat"]
+        self.stalls.append(stall)
+        offender = self.offenders.setdefault(stall["label"], [0, 0.0, 0.0])
+        offender[0] += 1
+        offender[1] += stall["duration"]
+        offender[2] = max(offender[2], stall["duration"])
+        LOG.warning(
+            "event loop blocked for %dms by %s",
+            stall["duration"] * 1000,
+            stall["label"],
+            extra={"command": stall["label"], "latency_ms": round(stall["duration"] * 1000, 2), "stack": stall["stack"]},
+        )
+
+    def top_offenders(self, limit: int = 10) -> list:
+        """[summary]
+        Returns:
+            list: (label, stalls, total seconds, worst seconds) of the offenders that blocked the loop the longest.
+        """
+        ranked = sorted(self.offenders.items(), key=lambda item: -item[1][1])[:limit]
+        return [(label, count, total, worst) for label, (count, total, worst) in ranked]
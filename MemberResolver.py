@@ -0,0 +1,61 @@
+from collections import OrderedDict
+import discord
+import time
+
+
+class MemberResolver:
+    def __init__(self, lazy_cache_size: int = 1000, lazy_cache_ttl: float = 300.0):
+        """[summary]
+        Creates a member resolver which looks members up in the gateway member cache and only falls back to a REST fetch on a cache miss.
+        Fetched members are kept in a small cache of their own, so bots that don't cache members fetch a member only once in a while.
+        Args:
+            lazy_cache_size (int): the maximum amount of fetched members kept (0 disables it).
+            lazy_cache_ttl (float): seconds a fetched member is kept.
+        """
+        self.hits = 0  #? Amount of members found in a cache.
+        self.misses = 0  #? Amount of members that had to be fetched over REST.
+        self.lazy_cache_size = lazy_cache_size
+        self.lazy_cache_ttl = lazy_cache_ttl
+        self.fetched = OrderedDict()  #? (guild id, member id) -> (discord.Member, fetch time), oldest first.
+
+    async def resolve(self, guild, member_id: int):
+        """[summary]
+        Returns the guild member with the given id, or None if the user is not a member of the guild.
+        Args:
+            guild (discord.Guild): the guild to look the member up in.
+            member_id (int): the member's id.
+        """
+        member = guild.get_member(member_id)
+        if member is not None:
+            self.hits += 1
+            return member
+
+        key = (guild.id, member_id)
+        cached = self.fetched.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.lazy_cache_ttl:
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        try:
+            member = await guild.fetch_member(member_id)
+        except discord.NotFound:  # User is not in the guild.
+            self.fetched.pop(key, None)
+            return None
+        if self.lazy_cache_size > 0:
+            self.fetched[key] = (member, time.monotonic())
+            self.fetched.move_to_end(key)
+            while len(self.fetched) > self.lazy_cache_size:
+                self.fetched.popitem(last=False)
+        return member
+
+    def forget(self, guild_id: int, member_id: int):
+        """[summary]
+        Drops a fetched member (used when the member leaves or is banned).
+        """
+        self.fetched.pop((guild_id, member_id), None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
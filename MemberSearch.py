@@ -0,0 +1,373 @@
+from collections import Counter
+from discord.ext import commands
+import asyncio
+import bisect
+import heapq
+import math
+import re
+
+MENTION = re.compile(r"<@!?([0-9]+)>$")
+NO_USERS = frozenset()
+SEPARATOR = "\0"  #? Ends the name part of a name index key (sorts before any character, so "jo" comes before "john").
+
+
+def trigrams(text: str) -> set:
+    """[summary]
+    Splits a name into its 3 character pieces, padded so the first and last characters (and 1-2 character names) count too.
+    """
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(query_grams: set, name: str) -> float:
+    """[summary]
+    Returns the share of trigrams a query and a name have in common (1.0 is the same name).
+    """
+    name_grams = trigrams(name)
+    return len(query_grams & name_grams) / max(len(query_grams), len(name_grams))
+
+
+class NameIndex:
+    def __init__(self, fuzzy: bool = True):
+        """[summary]
+        Creates an index of users' names and nicknames for exact, prefix ("jo" finds "john") and similar name lookups.
+        Names are compared case insensitively, kept in a sorted list of "name\0user id" strings (prefix lookups are a
+        binary search) and split into trigrams (similar name lookups only score the users that share the query's rarest
+        trigrams).
+        Args:
+            fuzzy (bool): also keep the trigrams for similar name lookups (they take most of the index's memory).
+        """
+        self.fuzzy = fuzzy
+        self.complete = False  #? Every member of the guild was indexed (set by MemberSearch).
+        self.entries = {}  #? user id -> (name, nickname or None, discriminator), names casefolded.
+        self.keys = []  #? "casefolded name or nickname\0user id" strings, sorted.
+        self.grams = {}  #? trigram -> set of the user ids whose name or nickname contains it.
+
+    @staticmethod
+    def entry(user) -> tuple:
+        nick = getattr(user, "nick", None)  # Banned users are discord.User objects, they have no nickname.
+        return user.name.casefold(), nick.casefold() if nick else None, user.discriminator
+
+    @staticmethod
+    def key(name: str, user_id: int) -> str:
+        return f"{name}{SEPARATOR}{user_id}"
+
+    @staticmethod
+    def names(entry: tuple) -> tuple:
+        name, nick, _ = entry
+        return (name,) if nick is None or nick == name else (name, nick)
+
+    def add(self, user):
+        """[summary]
+        Indexes a user, or re-indexes them if their name or nickname changed.
+        """
+        entry = self.entry(user)
+        old = self.entries.get(user.id)
+        if old == entry:  # Nothing to update (most member updates are role or presence changes).
+            return
+        if old is not None:
+            self.remove(user.id)
+        self.entries[user.id] = entry
+        for name in self.names(entry):
+            bisect.insort(self.keys, self.key(name, user.id))
+        self.add_grams(user.id, entry)
+
+    def extend(self, users, sort: bool = True):
+        """[summary]
+        Indexes many users at once (sorts the names once instead of inserting them one by one).
+        Args:
+            users (iterable): the users.
+            sort (bool): False only sorts the users' own names, for building an index in batches (merge all the sorted
+                batches with `sort()` before anything else is done with the index).
+        """
+        fresh = []
+        for user in users:
+            if user.id in self.entries:  # Re-indexed one by one while the names are still sorted.
+                self.add(user)
+            else:
+                fresh.append(user)
+        keys = []
+        for user in fresh:
+            entry = self.entry(user)
+            self.entries[user.id] = entry
+            for name in self.names(entry):
+                keys.append(self.key(name, user.id))
+            self.add_grams(user.id, entry)
+        keys.sort()
+        self.keys.extend(keys)
+        if sort:
+            self.sort()
+
+    def sort(self):
+        self.keys.sort()  # Merging sorted batches is a lot cheaper than sorting unordered names.
+
+    def add_grams(self, user_id: int, entry: tuple):
+        if not self.fuzzy:
+            return
+        names = self.names(entry)
+        grams = self.grams
+        for gram in trigrams(names[0]) if len(names) == 1 else trigrams(names[0]) | trigrams(names[1]):
+            users = grams.get(gram)
+            if users is None:
+                grams[gram] = {user_id}
+            else:
+                users.add(user_id)
+
+    def remove(self, user_id: int):
+        entry = self.entries.pop(user_id, None)
+        if entry is None:
+            return
+        names = self.names(entry)
+        for name in names:
+            key = self.key(name, user_id)
+            i = bisect.bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                del self.keys[i]
+        if not self.fuzzy:
+            return
+        for gram in trigrams(names[0]) if len(names) == 1 else trigrams(names[0]) | trigrams(names[1]):
+            users = self.grams.get(gram)
+            if users is not None:
+                users.discard(user_id)
+                if len(users) == 0:
+                    del self.grams[gram]
+
+    def starting_with(self, prefix: str):
+        """[summary]
+        Yields the (name, user id) pairs whose name starts with `prefix`, exact names first.
+        """
+        i = bisect.bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            name, _, user_id = self.keys[i].rpartition(SEPARATOR)
+            yield name, int(user_id)
+            i += 1
+
+    def find(self, query: str, limit: int = 10) -> tuple:
+        """[summary]
+        Finds the users whose name or nickname is the query, or starts with it.
+        The query can also be a name#discriminator, which only matches that user.
+        Args:
+            query (str): the (partial) name, case insensitive.
+            limit (int): the amount of users to find of each kind, one more is returned if there are more.
+        Returns:
+            tuple: the user ids whose name is the query, and the user ids whose name starts with it.
+        """
+        query = query.strip().casefold()
+        if len(query) > 5 and query[-5] == "#" and query[-4:].isdigit():  # name#discriminator
+            name, discriminator = query[:-5], query[-4:]
+            for key, user_id in self.starting_with(name):
+                if key != name:
+                    break
+                if self.entries[user_id][0] == name and self.entries[user_id][2] == discriminator:
+                    return [user_id], []
+            return [], []
+
+        exact, partial = {}, {}  # Dicts keep the order and drop the user whose name and nickname both match.
+        for key, user_id in self.starting_with(query):
+            if key == query:
+                exact[user_id] = None
+                if len(exact) > limit:
+                    break
+            elif user_id not in exact:
+                partial[user_id] = None
+                if len(partial) > limit:
+                    break
+        return list(exact), [user_id for user_id in partial if user_id not in exact]
+
+    def similar(self, query: str, limit: int = 5, min_similarity: float = 0.5) -> list:
+        """[summary]
+        Finds the users whose name or nickname looks like the query (typos, missing or extra characters).
+        A user needs ceil(min_similarity * trigrams of the query) common trigrams to be similar, so only the users of the
+        rarest trigrams (all but that many - 1) are counted, the others are at most looked up.
+        Args:
+            query (str): the name, case insensitive.
+            limit (int): the maximum amount of users returned.
+            min_similarity (float): the share of common trigrams (0 - 1) a name needs.
+        Returns:
+            list: the user ids, most similar first.
+        """
+        if not self.fuzzy:
+            return []
+        grams = trigrams(query.strip().casefold())
+        needed = max(1, math.ceil(min_similarity * len(grams)))
+        postings = sorted([self.grams.get(gram, NO_USERS) for gram in grams], key=len)
+        rare, common = postings[:len(postings) - needed + 1], postings[len(postings) - needed + 1:]
+        counts = Counter()
+        for users in rare:
+            counts.update(users)
+        scored = []
+        for user_id, count in counts.items():
+            for users in common:
+                if user_id in users:
+                    count += 1
+            if count < needed:
+                continue
+            score = max([similarity(grams, name) for name in self.names(self.entries[user_id])])
+            if score >= min_similarity:
+                scored.append((score, user_id))
+        return [user_id for _, user_id in heapq.nlargest(limit, scored)]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class MemberSearch:
+    def __init__(self, fuzzy: bool = True, min_similarity: float = 0.5, build_batch: int = 2000, chunk: bool = False):
+        """[summary]
+        Creates a per guild index of member names and nicknames, so commands can take partial names without scanning
+        every member. A guild is indexed from the member cache on its first name lookup and then kept current by
+        member events.
+        Without the members intent (the minimal and balanced memory profiles) discord doesn't send the member list, so
+        the index only holds the few cached members and MemberQuery asks discord for the other names.
+        Args:
+            fuzzy (bool): suggest similar names when nothing matches (keeps the names' trigrams).
+            min_similarity (float): the share of common trigrams (0 - 1) a suggested name needs.
+            build_batch (int): members indexed between yields to the event loop while a big guild is indexed.
+            chunk (bool): download the guild's member list before indexing it if it isn't cached yet (needs the
+                members intent).
+        """
+        self.fuzzy = fuzzy
+        self.chunk = chunk
+        self.min_similarity = min_similarity
+        self.build_batch = build_batch
+        self.guilds = {}  #? guild id -> NameIndex
+        self.locks = {}  #? guild id -> asyncio.Lock (prevents indexing the same guild twice)
+        self.building = {}  #? guild id -> ids of the members that joined, left or were renamed while the guild is indexed.
+
+    async def get(self, guild) -> NameIndex:
+        """[summary]
+        Returns the guild's name index, indexing the guild on first use. An index built before the guild's members were
+        all cached (chunked) is built again once they are.
+        Args:
+            guild (discord.Guild): the guild to get the index of.
+        """
+        lock = self.locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            names = self.guilds.get(guild.id)
+            if names is None or (not names.complete and guild.chunked):
+                if self.chunk and not guild.chunked:
+                    await guild.chunk()  # Index every member, not only the cached ones.
+                names = NameIndex(self.fuzzy)
+                names.complete = guild.chunked
+                self.building[guild.id] = changed = set()
+                try:
+                    members = guild.members
+                    for start in range(0, len(members), self.build_batch):
+                        names.extend(members[start:start + self.build_batch], sort=False)
+                        await asyncio.sleep(0)  # Don't block the event loop while a big guild is indexed.
+                    names.sort()
+                    for member_id in changed:  # Catch up on the member events of the build.
+                        member = guild.get_member(member_id)
+                        if member is None:
+                            names.remove(member_id)
+                        else:
+                            names.add(member)
+                finally:
+                    del self.building[guild.id]
+                self.guilds[guild.id] = names
+        return names
+
+    def update(self, member):
+        """[summary]
+        Indexes a member who joined, or re-indexes a member whose name or nickname changed (only in indexed guilds).
+        """
+        if member.guild.id in self.building:
+            self.building[member.guild.id].add(member.id)
+        names = self.guilds.get(member.guild.id)
+        if names is not None:
+            names.add(member)
+
+    def remove(self, member):
+        if member.guild.id in self.building:
+            self.building[member.guild.id].add(member.id)
+        names = self.guilds.get(member.guild.id)
+        if names is not None:
+            names.remove(member.id)
+
+    def forget(self, guild):
+        """[summary]
+        Drops the guild's index (used when the bot leaves the guild).
+        """
+        self.guilds.pop(guild.id, None)
+        self.locks.pop(guild.id, None)
+
+    def clear(self):
+        """[summary]
+        Drops every index, used when the bot may have missed member events (a new gateway session).
+        """
+        self.guilds = {}
+
+    @property
+    def size(self) -> int:
+        return sum([len(names) for names in self.guilds.values()])
+
+
+class AmbiguousMember(commands.BadArgument):
+    def __init__(self, argument: str, members: list, limit: int):
+        """[summary]
+        Raised when a name matches several members, the message lists them so the user can pick one.
+        """
+        self.argument = argument
+        self.members = members
+        options = ", ".join([f"`{member}`" for member in members[:limit]])
+        more = " (and more)" if len(members) > limit else ""
+        super().__init__(f'Several members match "{argument}", please use the name#discriminator or a mention: {options}{more}')
+
+
+class MemberNotFound(commands.MemberNotFound):
+    def __init__(self, argument: str, suggestions: list):
+        """[summary]
+        Raised when no member has the name, the message suggests the members with similar names.
+        """
+        self.argument = argument
+        self.suggestions = suggestions
+        message = f'Member "{argument}" not found.'
+        if len(suggestions) > 0:
+            message += " Did you mean " + ", ".join([f"`{member}`" for member in suggestions]) + "?"
+        commands.BadArgument.__init__(self, message)
+
+
+class MemberQuery(commands.MemberConverter):
+    """[summary]
+    Converts a command argument to a member like discord.Member does, but names are looked up in the bot's member name
+    index (`bot.core.MEMBER_SEARCH`): a partial name works if it matches a single member, several matches raise
+    AmbiguousMember and no match raises MemberNotFound with similar names.
+    If the guild's members are not all indexed (no members intent) names the index doesn't know are looked up with a
+    discord name prefix query, which finds up to 100 members and has no similar name suggestions.
+    """
+
+    LIMIT = 10  #? The amount of members an ambiguous name lists.
+
+    async def convert(self, ctx, argument: str):
+        if ctx.guild is None or self._get_id_match(argument) or MENTION.match(argument):
+            return await super().convert(ctx, argument)
+        search = ctx.bot.core.MEMBER_SEARCH
+        names = await search.get(ctx.guild)
+        exact, partial = names.find(argument, self.LIMIT)
+        members = [member for member in map(ctx.guild.get_member, exact or partial) if member is not None]
+        if len(members) == 1:
+            return members[0]
+        if len(members) > 1:
+            raise AmbiguousMember(argument, members, self.LIMIT)
+        if not names.complete:  # The member may not be cached, ask discord.
+            members = await self.query_named(ctx.guild, argument)
+            if len(members) == 1:
+                return members[0]
+            if len(members) > 1:
+                raise AmbiguousMember(argument, members, self.LIMIT)
+        similar = names.similar(argument, min_similarity=search.min_similarity)
+        raise MemberNotFound(argument, [member for member in map(ctx.guild.get_member, similar) if member is not None])
+
+    async def query_named(self, guild, argument: str) -> list:
+        """[summary]
+        Asks discord for the members whose name starts with the argument (works without the members intent) and
+        matches them like the index does: exact names first, otherwise names that start with the argument.
+        """
+        name, _, discriminator = argument.rpartition("#")
+        query = name if len(discriminator) == 4 and discriminator.isdigit() and len(name) > 0 else argument
+        members = await guild.query_members(query, limit=100, cache=guild._state.member_cache_flags.joined)
+        found = NameIndex(fuzzy=False)
+        found.extend(members)
+        exact, partial = found.find(argument, self.LIMIT)
+        by_id = {member.id: member for member in members}
+        return [by_id[member_id] for member_id in exact or partial]
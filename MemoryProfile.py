@@ -0,0 +1,92 @@
+import discord
+import os
+
+PROFILES = ("minimal", "balanced", "full")
+
+
+def client_options(profile: str, message_cache: int = None) -> dict:
+    """[summary]
+    Returns the Bot keyword arguments (intents, member cache, chunking and message cache) of a memory profile.
+    Args:
+        profile (str): "minimal" (cache only what commands need, members are fetched when a command needs them),
+            "balanced" (discord.py's defaults) or "full" (member intent, every member cached and chunked at startup).
+        message_cache (int, optional): overrides the profile's message cache size (0 disables the message cache).
+    Raises:
+        ValueError: unknown profile.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f'Unknown memory profile "{profile}", use one of: {", ".join(PROFILES)}.')
+
+    intents = discord.Intents.default()
+    if profile == "minimal":
+        # Events no command uses.
+        intents.typing = False
+        intents.dm_typing = False
+        intents.emojis = False
+        intents.integrations = False
+        intents.webhooks = False
+        options = {
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+            "max_messages": None,
+        }
+    elif profile == "balanced":
+        options = {
+            "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+            "chunk_guilds_at_startup": False,
+            "max_messages": 1000,
+        }
+    else:
+        intents.members = True  #? Privileged, must be enabled in the developer portal.
+        options = {
+            "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+            "chunk_guilds_at_startup": True,
+            "max_messages": 5000,
+        }
+
+    if message_cache is not None:
+        options["max_messages"] = message_cache if message_cache > 0 else None
+    options["intents"] = intents
+    return options
+
+
+def process_memory() -> int:
+    """[summary]
+    Returns the process' resident memory in bytes (0 if it can't be read on this platform).
+    """
+    try:
+        with open("/proc/self/statm", "r") as reader:
+            return int(reader.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak (KB on linux), better than nothing.
+    except ImportError:
+        return 0
+
+
+def guild_usage(bot) -> list:
+    """[summary]
+    Counts the cached objects of every guild (the objects that make up most of the bot's memory).
+    Returns:
+        list: dicts with the guild's name, cached members, channels, roles and cached messages, biggest first.
+    """
+    messages = {}
+    for message in bot.cached_messages:
+        if message.guild is not None:
+            messages[message.guild.id] = messages.get(message.guild.id, 0) + 1
+
+    usage = [
+        {
+            "guild": guild.name,
+            "members": len(guild.members),  # Cached members only (guild.member_count is the real count).
+            "channels": len(guild.channels),
+            "roles": len(guild.roles),
+            "messages": messages.get(guild.id, 0),
+        }
+        for guild in bot.guilds
+    ]
+    usage.sort(key=lambda item: -(item["members"] + item["channels"] + item["roles"] + item["messages"]))
+    return usage
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+
+class ChannelBuffer:
+    """[summary]
+    The recent messages of one channel (oldest first), indexed by author.
+    """
+
+    def __init__(self, since: int):
+        self.since = since  #? Every message of the channel with an id >= since is (or was) in the buffer.
+        self.messages = OrderedDict()  #? message id -> author id, oldest first.
+        self.by_author = {}  #? author id -> OrderedDict of message ids, oldest first.
+
+    def add(self, message_id: int, author_id: int):
+        self.messages[message_id] = author_id
+        self.by_author.setdefault(author_id, OrderedDict())[message_id] = None
+
+    def remove(self, message_id: int):
+        author_id = self.messages.pop(message_id, None)
+        if author_id is None:
+            return
+        authored = self.by_author[author_id]
+        authored.pop(message_id, None)
+        if len(authored) == 0:
+            del self.by_author[author_id]
+
+    def evict_oldest(self):
+        message_id = next(iter(self.messages))
+        self.remove(message_id)
+        self.since = message_id + 1  # The buffer no longer covers the evicted message.
+
+    def __len__(self):
+        return len(self.messages)
+
+
+class MessageIndex:
+    def __init__(self, per_channel: int = 1000, max_messages: int = 100000):
+        """[summary]
+        Creates an index of the recent messages of every channel the bot sees messages in, kept current by message events.
+        It only stores ids (message id -> author id), so `clean` can find a member's recent messages without reading the channel history.
+        Args:
+            per_channel (int): the amount of recent messages kept per channel (0 disables the index).
+            max_messages (int): the amount of messages kept in all channels, the least active channels are dropped first.
+        """
+        self.per_channel = per_channel
+        self.max_messages = max_messages
+        self.channels = OrderedDict()  #? channel id -> ChannelBuffer, least recently active first.
+        self.size = 0  #? Amount of indexed messages in all channels.
+
+    def add(self, message):
+        """[summary]
+        Indexes a new message (called from `on_message`).
+        """
+        if self.per_channel <= 0:
+            return
+        channel_id = message.channel.id
+        buffer = self.channels.get(channel_id)
+        if buffer is None:
+            buffer = self.channels[channel_id] = ChannelBuffer(since=message.id)  # Nothing older is known.
+        else:
+            self.channels.move_to_end(channel_id)
+        buffer.add(message.id, message.author.id)
+        self.size += 1
+        if len(buffer) > self.per_channel:
+            buffer.evict_oldest()
+            self.size -= 1
+        while self.size > self.max_messages:  # Drop the least active channel.
+            _, dropped = self.channels.popitem(last=False)
+            self.size -= len(dropped)
+
+    def remove(self, channel_id: int, message_ids):
+        """[summary]
+        Removes deleted messages (called from the raw delete events and after `clean` deletes messages).
+        """
+        buffer = self.channels.get(channel_id)
+        if buffer is None:
+            return
+        before = len(buffer)
+        for message_id in message_ids:
+            buffer.remove(message_id)
+        self.size -= before - len(buffer)
+
+    def forget_channel(self, channel_id: int):
+        buffer = self.channels.pop(channel_id, None)
+        if buffer is not None:
+            self.size -= len(buffer)
+
+    def clear(self):
+        """[summary]
+        Drops everything, used when the bot may have missed messages (a new gateway session).
+        """
+        self.channels = OrderedDict()
+        self.size = 0
+
+    def recent(self, channel_id: int, author_id: int, count: int) -> tuple:
+        """[summary]
+        Finds an author's most recent messages in a channel.
+        Args:
+            channel_id (int): the channel.
+            author_id (int): the author.
+            count (int): the maximum amount of message ids returned.
+        Returns:
+            tuple: the message ids (newest first) and the oldest message id the index covers, older messages must be
+            read from the channel history (None if the channel isn't indexed at all).
+        """
+        buffer = self.channels.get(channel_id)
+        if buffer is None:
+            return [], None
+        ids = []
+        for message_id in reversed(buffer.by_author.get(author_id, ())):
+            if len(ids) == count:
+                break
+            ids.append(message_id)
+        return ids, buffer.since
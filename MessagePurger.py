@@ -0,0 +1,139 @@
+import discord
+import datetime
+import asyncio
+
+
+class PurgeResult:
+    """[summary]
+    Holds the running totals of a purge, it is passed to the progress callback after every deletion batch.
+    """
+
+    def __init__(self):
+        self.scanned = 0  #? Amount of history messages that were checked.
+        self.matched = 0  #? Amount of messages that matched the check.
+        self.bulk_deleted = 0  #? Amount of messages deleted through bulk delete calls.
+        self.single_deleted = 0  #? Amount of messages deleted one by one (older than 14 days).
+        self.failed = 0  #? Amount of messages that could not be deleted.
+        self.api_calls = 0  #? Amount of delete requests sent to discord.
+
+    @property
+    def deleted(self) -> int:
+        return self.bulk_deleted + self.single_deleted
+
+
+class MessagePurger:
+    BULK_LIMIT = 100  #? Discord refuses bulk deletes of more than 100 messages.
+    BULK_MAX_AGE = datetime.timedelta(days=14, minutes=-5)  #? Bulk delete refuses messages older than 14 days (minus a safety margin).
+
+    def __init__(self, scan_depth: int = 5000, single_delete_delay: float = 1.2):
+        """[summary]
+        Creates a purge engine which pages through a channel's history and deletes matching messages in batches.
+        Args:
+            scan_depth (int): the maximum amount of history messages to scan in a single purge.
+            single_delete_delay (float): seconds to wait between single deletes of old messages (the single delete route is heavily rate limited).
+        """
+        self.scan_depth = scan_depth
+        self.single_delete_delay = single_delete_delay
+
+    def bulk_cutoff(self) -> int:
+        """[summary]
+        Returns the oldest snowflake that can still be bulk deleted.
+        """
+        return discord.utils.time_snowflake(
+            datetime.datetime.utcnow() - self.BULK_MAX_AGE
+        )
+
+    async def purge(self, channel, check, count: int, progress=None, scan_depth: int = None, before=None, result: PurgeResult = None) -> PurgeResult:
+        """[summary]
+        Scans the channel history (newest first) and deletes up to `count` messages that pass `check`.
+        Recent messages are deleted in bulk batches of up to 100, messages too old for bulk delete are deleted one by one.
+        Args:
+            channel (discord.TextChannel): the channel to purge.
+            check (callable): receives a message and returns True if it should be deleted.
+            count (int): the maximum amount of messages this purge deletes (not counting the ones already in `result`).
+            progress (coroutine function, optional): awaited with the `PurgeResult` after every deletion batch.
+            scan_depth (int, optional): overrides the engine's maximum scan depth for this purge.
+            before (discord.abc.Snowflake, optional): only scan messages older than this one.
+            result (PurgeResult, optional): totals of an earlier deletion to add this purge to.
+        Returns:
+            PurgeResult: the purge totals.
+        """
+        result = result or PurgeResult()
+        matched = 0  #? Matches of this purge, `result` may already hold an earlier deletion's.
+        cutoff = self.bulk_cutoff()
+        bulk_batch = []
+        old_messages = []
+
+        #? `history` fetches pages of 100 messages (the API maximum) per request.
+        async for msg in channel.history(limit=scan_depth or self.scan_depth, before=before):
+            result.scanned += 1
+            if not check(msg):
+                continue
+            matched += 1
+            result.matched += 1
+            if msg.id >= cutoff:
+                bulk_batch.append(msg)
+                if len(bulk_batch) == self.BULK_LIMIT:  # Batch is full, delete it while we keep scanning.
+                    await self.delete_bulk(channel, bulk_batch, result, progress)
+                    bulk_batch = []
+            else:
+                old_messages.append(msg)
+            if matched >= count:
+                break
+
+        await self.delete_bulk(channel, bulk_batch, result, progress)
+        await self.delete_single(channel, old_messages, result, progress)
+        return result
+
+    async def delete_ids(self, channel, message_ids, progress=None) -> PurgeResult:
+        """[summary]
+        Deletes messages whose ids are already known (no history is read), in bulk batches when they are recent enough.
+        Args:
+            channel (discord.TextChannel): the channel of the messages.
+            message_ids (list): the ids of the messages to delete.
+            progress (coroutine function, optional): awaited with the `PurgeResult` after every deletion batch.
+        Returns:
+            PurgeResult: the deletion totals.
+        """
+        result = PurgeResult()
+        result.matched = len(message_ids)
+        cutoff = self.bulk_cutoff()
+        recent = [discord.Object(message_id) for message_id in message_ids if message_id >= cutoff]
+        old_messages = [discord.Object(message_id) for message_id in message_ids if message_id < cutoff]
+        for i in range(0, len(recent), self.BULK_LIMIT):
+            await self.delete_bulk(channel, recent[i:i + self.BULK_LIMIT], result, progress)
+        await self.delete_single(channel, old_messages, result, progress)
+        return result
+
+    async def delete_bulk(self, channel, batch, result: PurgeResult, progress=None):
+        """[summary]
+        Deletes a batch of up to 100 recent messages with a single request.
+        """
+        if len(batch) == 0:
+            return
+        result.api_calls += 1
+        try:
+            await channel.delete_messages(batch)
+            result.bulk_deleted += len(batch)
+        except discord.HTTPException:
+            result.failed += len(batch)
+        if progress is not None:
+            await progress(result)
+
+    async def delete_single(self, channel, messages, result: PurgeResult, progress=None):
+        """[summary]
+        Deletes messages that are too old for bulk delete one by one, pacing the requests to respect the rate limit.
+        """
+        for i, msg in enumerate(messages):
+            if i > 0:
+                await asyncio.sleep(self.single_delete_delay)
+            result.api_calls += 1
+            try:
+                await channel.get_partial_message(msg.id).delete()
+                result.single_deleted += 1
+            except discord.NotFound:  # Someone else already deleted it.
+                pass
+            except discord.HTTPException:
+                result.failed += 1
+        if len(messages) > 0 and progress is not None:
+            await progress(result)
@@ -0,0 +1,194 @@
+from discord.ext import commands
+from aiohttp import web
+import contextvars
+import functools
+import time
+
+#? Latency histogram bucket upper bounds in seconds (prometheus style, cumulative).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#? REST time of the command currently running in this task: [seconds, calls].
+REST_TIMER = contextvars.ContextVar("rest_timer", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  #? Last slot is +Inf.
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """[summary]
+        Returns an upper bound estimate of the q quantile (the bucket bound the quantile falls in).
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, bound in enumerate(self.buckets):
+            seen += self.counts[i]
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    @property
+    def average(self) -> float:
+        return self.sum / self.count if self.count > 0 else 0.0
+
+
+class CommandMetrics:
+    def __init__(self):
+        """[summary]
+        Creates the per command metrics: invocation counts, error counts by exception type and handler / REST latency histograms.
+        """
+        self.invocations = {}  #? command name -> count
+        self.errors = {}  #? (command name, exception type name) -> count
+        self.handler_latency = {}  #? command name -> Histogram (whole handler, REST included)
+        self.rest_latency = {}  #? command name -> Histogram (time spent waiting on REST calls)
+        self.rest_calls = {}  #? command name -> amount of REST calls
+        self.gauges = {}  #? metric name -> (help text, callable returning the current value)
+
+    def add_gauge(self, name: str, help_text: str, getter):
+        self.gauges[name] = (help_text, getter)
+
+    def command_started(self, ctx):
+        """[summary]
+        Starts timing a command, should be called from the bot's `before_invoke` hook (it runs in the command's task).
+        """
+        name = ctx.command.qualified_name
+        self.invocations[name] = self.invocations.get(name, 0) + 1
+        ctx.metrics_start = time.perf_counter()
+        REST_TIMER.set([0.0, 0])
+
+    def command_finished(self, ctx):
+        """[summary]
+        Records the handler and REST time of a command, should be called from the bot's `after_invoke` hook.
+        """
+        start = getattr(ctx, "metrics_start", None)
+        if start is None:
+            return
+        name = ctx.command.qualified_name
+        self.handler_latency.setdefault(name, Histogram()).observe(time.perf_counter() - start)
+        rest = REST_TIMER.get()
+        if rest is not None:
+            self.rest_latency.setdefault(name, Histogram()).observe(rest[0])
+            self.rest_calls[name] = self.rest_calls.get(name, 0) + rest[1]
+        REST_TIMER.set(None)
+
+    def command_failed(self, ctx, error):
+        """[summary]
+        Counts a command error by the type of the original exception.
+        """
+        if isinstance(error, commands.CommandInvokeError):
+            error = error.original
+        name = ctx.command.qualified_name if ctx.command is not None else "unknown"
+        key = (name, type(error).__name__)
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def instrument_http(self, http):
+        """[summary]
+        Wraps the bot's HTTP client so every REST call made by a command adds to that command's REST time.
+        Args:
+            http (discord.http.HTTPClient): the bot's HTTP client.
+        """
+        request = http.request
+
+        @functools.wraps(request)
+        async def timed_request(*args, **kwargs):
+            rest = REST_TIMER.get()
+            if rest is None:  # Not inside a command.
+                return await request(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await request(*args, **kwargs)
+            finally:
+                rest[0] += time.perf_counter() - start
+                rest[1] += 1
+
+        http.request = timed_request
+
+    def snapshot(self) -> dict:
+        """[summary]
+        Returns a plain dict of all the metrics (used for the periodic snapshot and the stats command).
+        """
+        return {
+            "gauges": {name: getter() for name, (_, getter) in self.gauges.items()},
+            "commands": {
+                name: {
+                    "invocations": count,
+                    "errors": sum(c for (cmd, _), c in self.errors.items() if cmd == name),
+                    "handler_avg_ms": round(self.handler_latency[name].average * 1000, 2) if name in self.handler_latency else 0.0,
+                    "handler_p99_ms": round(self.handler_latency[name].quantile(0.99) * 1000, 2) if name in self.handler_latency else 0.0,
+                    "rest_avg_ms": round(self.rest_latency[name].average * 1000, 2) if name in self.rest_latency else 0.0,
+                    "rest_calls": self.rest_calls.get(name, 0),
+                }
+                for name, count in sorted(self.invocations.items())
+            },
+            "errors": {f"{cmd}:{error}": count for (cmd, error), count in self.errors.items()},
+        }
+
+    def render_prometheus(self) -> str:
+        """[summary]
+        Renders all the metrics in the prometheus text exposition format.
+        """
+        lines = []
+        for name, (help_text, getter) in self.gauges.items():
+            lines.append(f"# HELP seniorbot_{name} {help_text}")
+            lines.append(f"# TYPE seniorbot_{name} gauge")
+            lines.append(f"seniorbot_{name} {getter()}")
+
+        lines.append("# HELP seniorbot_command_invocations_total Commands invoked.")
+        lines.append("# TYPE seniorbot_command_invocations_total counter")
+        for name, count in self.invocations.items():
+            lines.append(f'seniorbot_command_invocations_total{{command="{name}"}} {count}')
+
+        lines.append("# HELP seniorbot_command_errors_total Command errors by exception type.")
+        lines.append("# TYPE seniorbot_command_errors_total counter")
+        for (name, error), count in self.errors.items():
+            lines.append(f'seniorbot_command_errors_total{{command="{name}",error="{error}"}} {count}')
+
+        lines.append("# HELP seniorbot_command_rest_calls_total REST calls made by commands.")
+        lines.append("# TYPE seniorbot_command_rest_calls_total counter")
+        for name, count in self.rest_calls.items():
+            lines.append(f'seniorbot_command_rest_calls_total{{command="{name}"}} {count}')
+
+        for metric, histograms, help_text in (
+            ("command_handler_seconds", self.handler_latency, "Command handler time."),
+            ("command_rest_seconds", self.rest_latency, "Time command handlers spent waiting on REST calls."),
+        ):
+            lines.append(f"# HELP seniorbot_{metric} {help_text}")
+            lines.append(f"# TYPE seniorbot_{metric} histogram")
+            for name, histogram in histograms.items():
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'seniorbot_{metric}_bucket{{command="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'seniorbot_{metric}_sum{{command="{name}"}} {histogram.sum}')
+                lines.append(f'seniorbot_{metric}_count{{command="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    async def start_server(self, host: str, port: int) -> web.AppRunner:
+        """[summary]
+        Serves the metrics in the prometheus text format on http://host:port/metrics.
+        """
+
+        async def handle_metrics(request):
+            return web.Response(text=self.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
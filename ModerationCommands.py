@@ -0,0 +1,606 @@
+#? SeniorBot moderation commands, a discord.py extension the `reload` command reloads in place.
+#? The bot's state (caches, indexes, timers) stays in SeniorBot.py, the commands reach it through CORE.
+
+from discord.ext.commands import *
+from discord.ext import commands
+import discord
+import datetime
+import time
+
+from Durations import parse_duration, format_duration
+from MemberSearch import MemberQuery
+
+CORE = None  #? The SeniorBot module of the bot this extension is loaded into (set by `setup`).
+
+
+def read_duration(text: str) -> datetime.timedelta:
+    """
+    Parses the duration argument of the temporary punishment commands.
+    @param text (str): the duration (e.g. 30m, 2h, 1d12h).
+    @return (datetime.timedelta): the duration.
+    """
+    try:
+        return parse_duration(text)
+    except ValueError as e:
+        raise BadArgument(str(e))
+
+
+@commands.command(
+    name="mute",
+    brief="Mutes the mentioned member.",
+    description="Mutes the mentioned member by giving him a server mute.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}mute @<member mention> / <name>** -> will apply a server mute to the mentioned member.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def mute(ctx, member: MemberQuery):
+    """
+    This command will apply a server mute to the given member and send an embedded message to confirm the mute.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member to be muted object.
+    """
+    # Check if member is in the guild (member cache first, REST only on a miss).
+    guild_member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, member.id)
+    if member == guild_member:
+        await member.edit(mute=True)  # Apply server mute.
+        CORE.TIMERS.cancel("unmute", ctx.guild.id, member.id)  # A permanent mute replaces a temporary one.
+        embed = discord.Embed(
+            title="User Muted!",
+            description=f"**{member}** was muted by **{ctx.message.author}**!",
+            color=discord.Color.red(),
+        )
+        await ctx.send(embed=embed)  # Send fancy mute embed.
+    else:  # Member not in the server.
+        await ctx.send("Member is not in the server!")
+
+
+@mute.error
+async def mute_error(ctx, error):
+    if isinstance(
+        error, MissingPermissions
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help mute' to see more information."
+        )
+    elif isinstance(
+        error, discord.HTTPException
+    ):  # Check if error was caused because member fetch had failed.
+        await ctx.send(f"Member is not in the server!")
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="unmute",
+    brief="Unmutes the mentioned member.",
+    description="Unmutes the mentioned member by removing his server mute.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}unmute @<member mention> / <name>** -> will remove the server mute from the mentioned member.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def unmute(ctx, member: MemberQuery):
+    """
+    This command unmutes the server mute that was put on the given member.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member to be unmuted object.
+    """
+    guild_member = await CORE.unmute_member(ctx.guild, member.id)
+    if guild_member is not None:  # Check if member is in the guild.
+        embed = discord.Embed(
+            title="User Unmuted!",
+            description=f"**{member}** was unmuted by **{ctx.message.author}**!",
+            color=discord.Color.green(),
+        )
+        await ctx.send(embed=embed)  # Send fancy mute embed.
+    else:  # Member not in the server.
+        await ctx.send("Member is not in the server!")
+
+
+@unmute.error
+async def unmute_error(ctx, error):
+    if isinstance(
+        error, MissingPermissions
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help unmute' to see more information."
+        )
+    elif isinstance(
+        error, discord.HTTPException
+    ):  # Check if error was caused because member fetch had failed.
+        await ctx.send(f"Member is not in the server!")
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="kick",
+    brief="Kicks the mentioned member with a reason.",
+    description="Kicks the mentioned member and sends the reason given by the admin.\n**Important** - user must have the ***kick members*** permission.",
+    usage="| **{prefix}kick @<member mention> / <name> <reason>** -> kicks the mentioned member and sends the reason to him (reason does not have to be in quotes).",
+    pass_context=True,
+)
+@commands.has_permissions(kick_members=True)
+async def kick(ctx, member: MemberQuery, *, reason: str):
+    """
+    This command checks if the given user is indeed a member of the current server, if so it kicks him and sends him the reason.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member to be kicked.
+    @param reason (str): the reason for the kick.
+    """
+    # Get the member from the guild (member cache first, REST only on a miss), if returned None then member is not in the guild.
+    guild_member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, member.id)
+    if guild_member is not None:  # Member exists, need to kick.
+        await guild_member.kick(reason=reason)
+        await ctx.send(
+            f'Kicked the member {guild_member.mention} for reason "{reason}"'
+        )
+    else:  # Member not in the server.
+        await ctx.send("User is not in the server")
+
+
+@kick.error
+async def kick_error(ctx, error):
+    if isinstance(
+        error, MissingPermissions
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help kick' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="ban",
+    brief="Bans the mentioned member with a reason.",
+    description="Bans the mentioned member and sends the reason given by the admin.\n**Important** - user must have the ***ban members*** permission.",
+    usage="| **{prefix}ban @<member mention> / <name> <reason>** -> bans the mentioned member and sends the reason to him (reason does not have to be in quotes).",
+    pass_context=True,
+)
+@commands.has_permissions(ban_members=True)
+async def ban(ctx, member: MemberQuery, *, reason: str):
+    """
+    This command checks if the given user is indeed a member of the current server, if so it bans him and sends him the reason.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member to be banned.
+    @param reason (str): the reason for the ban.
+    """
+    # Get the member from the guild (member cache first, REST only on a miss), if returned None then member is not in the guild.
+    guild_member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, member.id)
+    if guild_member is not None:  # Member exists, need to ban.
+        await guild_member.ban(reason=reason)
+        CORE.TIMERS.cancel("unban", ctx.guild.id, guild_member.id)  # A permanent ban replaces a temporary one.
+        await ctx.send(
+            f'Banned the member {guild_member.mention} for reason: "{reason}"'
+        )
+    else:  # Member not in the server.
+        await ctx.send("User is not in the server!")
+
+
+@ban.error
+async def ban_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help ban' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="unban",
+    brief="Unbans the named user from the server.",
+    description="Unbans the named user from the server. The user can be given by name (or the start of it), name#discriminator or id.\n**Important** - user must have the ***ban members*** permission.",
+    usage="| **{prefix}unban <banned user's name>** -> unbans the user with the corresponding name (or the only banned user whose name starts with it) from the server (user has to be banned).\n| **{prefix}unban <name#discriminator / id>** -> unbans the exact user (use this when several banned users share a name).",
+    pass_context=True,
+)
+@commands.has_permissions(ban_members=True)
+async def unban(ctx, *, name_of_user: str):
+    """
+    This command checks if the given username belongs to a banned member of the current server, if so it unbans him.
+    The guild's bans are looked up in the ban index so the only request sent is the unban itself.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param name_of_user (str): the username, name#discriminator or id of the member to be unbanned.
+    """
+    guild_bans = await CORE.BAN_INDEX.get(ctx.guild)  # Get the guild bans index.
+    banned_users = guild_bans.find(name_of_user)
+
+    if len(banned_users) == 0:
+        await ctx.send("User is not banned!")
+    elif len(banned_users) > 1:  # Several banned users share this name (or start with it).
+        options = ", ".join([f"`{user}`" for user in banned_users[:10]])
+        more = " (and more)" if len(banned_users) > 10 else ""
+        await ctx.send(
+            f"Found several banned users matching {name_of_user}, please use the name#discriminator: {options}{more}"
+        )
+    else:
+        user = banned_users[0]
+        await CORE.unban_user(ctx.guild, user)
+        await ctx.send(f"Unbanned the user {user.mention}!")
+
+
+@unban.error
+async def unban_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help unban' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="tempmute",
+    brief="Mutes the mentioned member for a while.",
+    description="Mutes the mentioned member by giving him a server mute, the mute is removed once the duration is over (also if the bot restarted in between).\nDurations look like 30m, 2h, 1d12h.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}tempmute @<member mention> / <name> <duration>** -> will apply a server mute to the mentioned member and remove it after the duration.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def tempmute(ctx, member: MemberQuery, duration: str):
+    """
+    This command applies a server mute to the given member and schedules the unmute.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member to be muted object.
+    @param duration (str): how long the mute lasts.
+    """
+    length = read_duration(duration)
+    guild_member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, member.id)
+    if guild_member is None:  # Member not in the server.
+        await ctx.send("Member is not in the server!")
+        return
+    await guild_member.edit(mute=True)  # Apply server mute.
+    CORE.TIMERS.schedule("unmute", ctx.guild.id, guild_member.id, time.time() + length.total_seconds())
+    embed = discord.Embed(
+        title="User Muted!",
+        description=f"**{guild_member}** was muted by **{ctx.message.author}** for **{format_duration(length)}**!",
+        color=discord.Color.red(),
+    )
+    await ctx.send(embed=embed)  # Send fancy mute embed.
+
+
+@tempmute.error
+async def tempmute_error(ctx, error):
+    if isinstance(
+        error, MissingPermissions
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help tempmute' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="tempban",
+    brief="Bans the mentioned member for a while with a reason.",
+    description="Bans the mentioned member and sends the reason given by the admin, the ban is lifted once the duration is over (also if the bot restarted in between).\nDurations look like 30m, 2h, 1d12h.\n**Important** - user must have the ***ban members*** permission.",
+    usage="| **{prefix}tempban @<member mention> / <name> <duration> <reason>** -> bans the mentioned member and unbans him after the duration (reason does not have to be in quotes).",
+    pass_context=True,
+)
+@commands.has_permissions(ban_members=True)
+async def tempban(ctx, member: MemberQuery, duration: str, *, reason: str):
+    """
+    This command bans the given member and schedules the unban.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member to be banned.
+    @param duration (str): how long the ban lasts.
+    @param reason (str): the reason for the ban.
+    """
+    length = read_duration(duration)
+    guild_member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, member.id)
+    if guild_member is None:  # Member not in the server.
+        await ctx.send("User is not in the server!")
+        return
+    await guild_member.ban(reason=reason)
+    CORE.TIMERS.schedule("unban", ctx.guild.id, guild_member.id, time.time() + length.total_seconds())
+    await ctx.send(
+        f'Banned the member {guild_member.mention} for {format_duration(length)} for reason: "{reason}"'
+    )
+
+
+@tempban.error
+async def tempban_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help tempban' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="resyncbans",
+    brief="Reloads the server's ban list.",
+    description="Downloads the server's ban list again and rebuilds the bot's ban index (use this if bans were changed while the bot was offline).\n**Important** - user must have the ***ban members*** permission.",
+    usage="| **{prefix}resyncbans** -> reloads the ban list of the current server.",
+    pass_context=True,
+)
+@commands.has_permissions(ban_members=True)
+async def resyncbans(ctx):
+    """
+    This command rebuilds the current server's ban index from the server's ban list.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    guild_bans = await CORE.BAN_INDEX.get(ctx.guild, resync=True)
+    await ctx.send(f"Ban list reloaded, {len(guild_bans)} users are banned.")
+
+
+@resyncbans.error
+async def resyncbans_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help resyncbans' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="clean",
+    brief="Cleans a given number of a user's messages from the text channel.",
+    description="Cleans the given amount of messages that were sent by the mentioned member (If message amount is not specified automatically selects 10).\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}clean @<user mention> / <name> <message amount>** -> deletes the given amount of messages the mentioned member has has sent in the current text channel (message amount is optional, default will be 10).",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def clean(ctx, member: MemberQuery, count: int = 10):
+    """
+    This command receives a member object and a count (optional), then checks if the member is in the server and if the count is positive.
+    If all the checks are passed, The channel history is scanned in pages and the member's messages are deleted in bulk batches.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param member (discord.Member): the member of whom the messages will be deleted.
+    @param count (int, optional): the amount of messages to be deleted. Defaults to 10.
+    """
+    # Perform checks to see if the command can indeed be run in the current context.
+    guild_member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, member.id)
+    if guild_member is None:  # Check if member is in the guild.
+        await ctx.send("Given member is not a member of this server.")
+        return
+    if count < 1:  # Check if the message amount to delete is not valid (not positive).
+        await ctx.send(
+            "Zero or Negative amount of messages to delete was given!"
+        )
+        return
+
+    status_msg = await ctx.channel.send(f"🧹 Cleaning {count} messages of **{member}**...")
+
+    async def report_progress(result):
+        """
+        Updates the status message after every deletion batch.
+        @param result (MessagePurger.PurgeResult): the purge totals so far.
+        """
+        await status_msg.edit(
+            content=f"🧹 Cleaning messages of **{member}**... scanned {result.scanned}, deleted {result.deleted}/{count}"
+        )
+
+    #? The message index knows the member's recent messages, only older messages are searched in the channel history.
+    message_ids, since = CORE.MESSAGE_INDEX.recent(ctx.channel.id, member.id, count)
+    message_ids = [message_id for message_id in message_ids if message_id != status_msg.id]
+    result = await CORE.PURGER.delete_ids(ctx.channel, message_ids, progress=report_progress)
+    CORE.MESSAGE_INDEX.remove(ctx.channel.id, message_ids)
+    if since is None or len(message_ids) < count:
+        result = await CORE.PURGER.purge(
+            ctx.channel,
+            check=lambda msg: msg.author == member and msg.id != status_msg.id,
+            count=count - len(message_ids),
+            progress=report_progress,
+            before=discord.Object(since) if since is not None else None,
+            result=result,
+        )
+    await status_msg.edit(
+        content=f"🧹 Deleted {result.deleted} messages of **{member}** (scanned {result.scanned}, failed {result.failed}, {result.api_calls} delete requests)."
+    )
+    CORE.LOG.info(
+        "deleted %d messages of %s", result.deleted, member.id, extra=CORE.command_log_context(ctx)
+    )  # Log the event.
+
+
+@clean.error
+async def clean_error(ctx, error):
+    if isinstance(
+        error, CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help clean' to see more information."
+        )
+    elif isinstance(error, BadArgument):  # Unknown or ambiguous member name.
+        await ctx.send(f"Error! {error}")
+
+
+async def collect_raid_targets(ctx, args: str):
+    """
+    Parses the arguments of a raid command into targets and a reason.
+    Targets can be mentions, ids or the filters `joined:<duration>` (joined in the last duration) and `created:<duration>` (account younger than duration).
+    Everything after the first argument that is not a target is the reason.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param args (str): the raw command arguments.
+    @return (dict, str): user id -> target (discord.Member or discord.Object), and the reason.
+    """
+    targets = {}
+    filters = {}
+    words = args.split()
+    i = 0
+    for i, word in enumerate(words):
+        stripped = word.strip("<@!>")
+        if stripped.isdigit():  # Mention or raw id.
+            user_id = int(stripped)
+            targets[user_id] = ctx.guild.get_member(user_id) or discord.Object(id=user_id)
+        elif word.lower().startswith(("joined:", "created:")):
+            name, _, duration = word.partition(":")
+            try:
+                filters[name.lower()] = datetime.datetime.utcnow() - parse_duration(duration)
+            except ValueError as e:
+                raise BadArgument(str(e))
+            except OverflowError:  # Further back than a datetime goes, every member matches.
+                filters[name.lower()] = datetime.datetime.min
+        else:
+            break
+    else:
+        i = len(words)
+    reason = " ".join(words[i:]) or None
+
+    if len(filters) > 0:  # Filters are matched against the member list (all given filters must match).
+        if not ctx.bot.intents.members:  # Discord only sends the member list with the members intent.
+            raise BadArgument(
+                'The joined: and created: filters need the server\'s member list, which needs the members intent (the "full" memory profile). Please give the members as mentions or ids.'
+            )
+        if not ctx.guild.chunked:
+            await ctx.guild.chunk()  # Download the members that are not cached yet.
+        for member in ctx.guild.members:
+            if "joined" in filters and (member.joined_at is None or member.joined_at < filters["joined"]):
+                continue
+            if "created" in filters and member.created_at < filters["created"]:
+                continue
+            targets[member.id] = member
+
+    # Never act on the invoker or the bot itself.
+    targets.pop(ctx.message.author.id, None)
+    targets.pop(ctx.bot.user.id, None)
+    return targets, reason
+
+
+async def run_raid_action(ctx, args: str, action_name: str, action):
+    """
+    Runs a moderation action on every raid target through the action scheduler and sends a single summary embed.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param args (str): the raw command arguments.
+    @param action_name (str): the action's past tense name (for the summary).
+    @param action (coroutine function): awaited with a target and the reason.
+    """
+    targets, reason = await collect_raid_targets(ctx, args)
+    if len(targets) == 0:
+        await ctx.send("No members matched the given targets!")
+        return
+
+    result = await CORE.ACTION_SCHEDULER.run(
+        list(targets.values()), lambda target: action(target, reason)
+    )
+
+    embed = discord.Embed(
+        title=f"Raid Response - {len(result.succeeded)} {action_name}",
+        description=f"Requested by **{ctx.message.author}**" + (f'\nReason: "{reason}"' if reason else ""),
+        color=discord.Color.red() if len(result.failed) > 0 else discord.Color.green(),
+    )
+    embed.add_field(name="🎯 Targets", value=str(len(targets)))
+    embed.add_field(name="✅ Succeeded", value=str(len(result.succeeded)))
+    embed.add_field(name="❌ Failed", value=str(len(result.failed)))
+    embed.add_field(name="🔁 Rate Limit Retries", value=str(result.retries))
+    embed.add_field(name="⏱ Time", value=f"{result.elapsed:.1f}s")
+    if len(result.failed) > 0:
+        failures = [f"<@{target.id}>: {error}" for target, error in list(result.failed.items())[:10]]
+        if len(result.failed) > 10:
+            failures.append(f"... and {len(result.failed) - 10} more")
+        embed.add_field(name="Failures", value="\n".join(failures)[:1024], inline=False)
+    await ctx.send(embed=embed)
+
+
+async def raid_error(ctx, error, command_name: str):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help {command_name}' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@commands.command(
+    name="raidban",
+    aliases=["massban"],
+    brief="Bans many members at once.",
+    description="Bans every mentioned member / id and every member matching the given filters, then sends a single summary.\nFilters: `joined:<duration>` (joined in the last duration), `created:<duration>` (account younger than duration), durations look like 30m, 2h, 1d.\n**Important** - user must have the ***ban members*** permission.",
+    usage="| **{prefix}raidban @<member> <id> ... <reason>** -> bans all the given members and ids.\n| **{prefix}raidban joined:10m created:1d <reason>** -> bans every member who joined in the last 10 minutes with an account younger than a day.",
+    pass_context=True,
+)
+@commands.has_permissions(ban_members=True)
+async def raidban(ctx, *, args: str):
+    """
+    This command bans every raid target (members that left can be banned by id too).
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param args (str): the targets, filters and reason.
+    """
+    await run_raid_action(
+        ctx, args, "banned", lambda target, reason: ctx.guild.ban(target, reason=reason)
+    )
+
+
+@raidban.error
+async def raidban_error(ctx, error):
+    await raid_error(ctx, error, "raidban")
+
+
+@commands.command(
+    name="raidkick",
+    aliases=["masskick"],
+    brief="Kicks many members at once.",
+    description="Kicks every mentioned member / id and every member matching the given filters, then sends a single summary.\nFilters: `joined:<duration>` (joined in the last duration), `created:<duration>` (account younger than duration), durations look like 30m, 2h, 1d.\n**Important** - user must have the ***kick members*** permission.",
+    usage="| **{prefix}raidkick @<member> <id> ... <reason>** -> kicks all the given members.\n| **{prefix}raidkick joined:10m <reason>** -> kicks every member who joined in the last 10 minutes.",
+    pass_context=True,
+)
+@commands.has_permissions(kick_members=True)
+async def raidkick(ctx, *, args: str):
+    """
+    This command kicks every raid target.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param args (str): the targets, filters and reason.
+    """
+    await run_raid_action(
+        ctx, args, "kicked", lambda target, reason: ctx.guild.kick(target, reason=reason)
+    )
+
+
+@raidkick.error
+async def raidkick_error(ctx, error):
+    await raid_error(ctx, error, "raidkick")
+
+
+@commands.command(
+    name="raidmute",
+    aliases=["massmute"],
+    brief="Mutes many members at once.",
+    description="Applies a server mute to every mentioned member / id and every member matching the given filters, then sends a single summary.\nFilters: `joined:<duration>` (joined in the last duration), `created:<duration>` (account younger than duration), durations look like 30m, 2h, 1d.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}raidmute @<member> <id> ...** -> mutes all the given members.\n| **{prefix}raidmute joined:10m** -> mutes every member who joined in the last 10 minutes.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def raidmute(ctx, *, args: str):
+    """
+    This command applies a server mute to every raid target.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param args (str): the targets and filters.
+    """
+
+    async def mute_target(target, reason):
+        member = await CORE.MEMBER_RESOLVER.resolve(ctx.guild, target.id)
+        if member is None:
+            raise Exception("Member is not in the server!")
+        await member.edit(mute=True, reason=reason)
+
+    await run_raid_action(ctx, args, "muted", mute_target)
+
+
+@raidmute.error
+async def raidmute_error(ctx, error):
+    await raid_error(ctx, error, "raidmute")
+
+
+def setup(bot):
+    """
+    Adds the extension's commands to the bot, discord.py calls it on every load and reload of the extension.
+    @param bot (discord.ext.commands.Bot): the bot.
+    """
+    global CORE
+    CORE = bot.core
+    for value in list(globals().values()):
+        if isinstance(value, commands.Command):
+            bot.add_command(value)
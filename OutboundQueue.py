@@ -0,0 +1,220 @@
+from collections import deque
+from discord.ext import commands
+import asyncio
+import time
+
+HIGH = 0  #? Moderation replies, never dropped.
+NORMAL = 1
+LOW = 2  #? Fun command replies, dropped first under backpressure.
+MESSAGE_LIMIT = 2000  #? Characters discord allows in a message.
+
+
+class Reply:
+    """[summary]
+    A reply waiting in a channel's queue, `future` receives the sent message (None if the reply was dropped).
+    """
+
+    def __init__(self, channel, content, kwargs: dict, priority: int, created: float):
+        self.channel = channel
+        self.content = content
+        self.kwargs = kwargs
+        self.priority = priority
+        self.created = created
+        self.count = 1  #? Amount of identical replies this one stands for.
+        self.future = asyncio.get_event_loop().create_future()
+
+    @property
+    def mergeable(self) -> bool:
+        return len(self.kwargs) == 0 and self.content is not None  # Plain text only (no embeds, files, references).
+
+    @property
+    def text(self) -> str:
+        return self.content if self.count == 1 else f"{self.content} (x{self.count})"
+
+
+class ChannelQueue:
+    """[summary]
+    The pending replies of one channel (one deque per priority) and the times of its recent sends.
+    """
+
+    def __init__(self):
+        self.pending = [deque(), deque(), deque()]  #? priority -> replies, oldest first.
+        self.sent = deque()  #? Send times inside the current rate limit window, oldest first.
+        self.task = None  #? The task draining the queue (only while replies are pending).
+
+    def __len__(self):
+        return sum([len(replies) for replies in self.pending])
+
+    def wait_time(self, now: float, limit: int, window: float) -> float:
+        """[summary]
+        Returns the seconds until the channel's bucket has room for another message (0 if it has room now).
+        """
+        while len(self.sent) > 0 and self.sent[0] <= now - window:
+            self.sent.popleft()
+        return 0.0 if len(self.sent) < limit else self.sent[0] + window - now
+
+
+class OutboundQueue:
+    def __init__(self, limit: int = 5, window: float = 5.0, max_pending: int = 10, max_age: float = 10.0, priorities: dict = None):
+        """[summary]
+        Creates a per channel queue for command replies that paces them to the channel's send rate limit before discord
+        has to answer with a 429. While a channel's bucket is full its replies wait here: identical text replies are
+        merged into one message (e.g. "missing permissions" x3), consecutive text replies are sent together, higher
+        priority replies go first and stale or overflowing low priority replies are dropped.
+        Args:
+            limit (int): messages a channel allows per window (discord allows 5 every 5 seconds).
+            window (float): the rate limit window in seconds.
+            max_pending (int): replies a channel may queue, beyond that the oldest lowest priority reply is dropped.
+            max_age (float): seconds after which a waiting LOW priority reply is dropped.
+            priorities (dict, optional): command module name -> reply priority (other commands reply with NORMAL priority).
+        """
+        self.limit = limit
+        self.window = window
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self.priorities = priorities or {}
+        self.channels = {}  #? channel id -> ChannelQueue
+        self.prune_at = 1000  #? Amount of channels at which idle channel queues are dropped.
+        self.sent = 0  #? Amount of messages sent.
+        self.merged = 0  #? Replies sent as part of another reply's message.
+        self.dropped = 0  #? Replies that were never sent.
+
+    def priority(self, ctx) -> int:
+        return NORMAL if ctx.command is None else self.priorities.get(ctx.command.module, NORMAL)
+
+    async def send(self, ctx, content=None, **kwargs):
+        """[summary]
+        Sends a command reply to the command's channel, right away if the channel's bucket has room.
+        Args:
+            ctx (discord.ext.commands.Context): the command context object.
+            content (str, optional): the message text.
+            kwargs: the other `discord.abc.Messageable.send` arguments (e.g. embed).
+        Returns:
+            discord.Message: the sent message (shared by merged replies), None if the reply was dropped.
+        """
+        channel = ctx.channel
+        if content is not None:
+            content = str(content)
+        now = time.monotonic()
+        queue = self.channels.get(channel.id)
+        if queue is None:
+            if len(self.channels) >= self.prune_at:
+                self.prune(now)
+            queue = self.channels[channel.id] = ChannelQueue()
+        if len(queue) == 0 and queue.wait_time(now, self.limit, self.window) == 0:  # Nothing to wait for.
+            queue.sent.append(now)
+            self.sent += 1
+            return await channel.send(content, **kwargs)
+
+        reply = Reply(channel, content, kwargs, self.priority(ctx), now)
+        if reply.mergeable:
+            for waiting in queue.pending[reply.priority]:
+                if waiting.mergeable and waiting.content == reply.content:  # Already waiting, send it once.
+                    waiting.count += 1
+                    self.merged += 1
+                    return await asyncio.shield(waiting.future)
+        queue.pending[reply.priority].append(reply)
+        if len(queue) > self.max_pending:
+            self.drop_one(queue)
+        if queue.task is None:
+            queue.task = asyncio.ensure_future(self.drain(channel.id, queue))
+        return await asyncio.shield(reply.future)  # A cancelled command doesn't cancel a merged reply.
+
+    def drop_one(self, queue: ChannelQueue):
+        """[summary]
+        Drops the oldest reply of the lowest priority that has any (HIGH priority replies are never dropped).
+        """
+        for priority in (LOW, NORMAL):
+            if len(queue.pending[priority]) > 0:
+                self.drop(queue.pending[priority].popleft())
+                return
+
+    def drop(self, reply: Reply):
+        self.dropped += reply.count
+        if not reply.future.done():
+            reply.future.set_result(None)
+
+    def next_message(self, queue: ChannelQueue, now: float) -> list:
+        """[summary]
+        Takes the replies of the next message: the first pending reply by priority, with the text replies that directly
+        follow it (in any priority) while they fit in one message.
+        """
+        stale = queue.pending[LOW]
+        while len(stale) > 0 and stale[0].created < now - self.max_age:
+            self.drop(stale.popleft())
+        replies = []
+        length = 0
+        for pending in queue.pending:
+            while len(pending) > 0:
+                reply = pending[0]
+                if len(replies) == 0:
+                    replies.append(pending.popleft())
+                    length = len(reply.text) if reply.mergeable else 0
+                    if not reply.mergeable:
+                        return replies
+                    continue
+                if not reply.mergeable or length + 1 + len(reply.text) > MESSAGE_LIMIT:
+                    return replies
+                replies.append(pending.popleft())
+                length += 1 + len(reply.text)
+        return replies
+
+    async def drain(self, channel_id: int, queue: ChannelQueue):
+        """[summary]
+        Sends a channel's pending replies as fast as its bucket allows.
+        """
+        try:
+            while len(queue) > 0:
+                now = time.monotonic()
+                delay = queue.wait_time(now, self.limit, self.window)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                replies = self.next_message(queue, now)
+                if len(replies) == 0:  # Only stale replies were left.
+                    continue
+                queue.sent.append(now)
+                self.sent += 1
+                self.merged += len(replies) - 1
+                first = replies[0]
+                try:
+                    if len(replies) == 1 and not first.mergeable:
+                        message = await first.channel.send(first.content, **first.kwargs)
+                    else:
+                        message = await first.channel.send("\n".join([reply.text for reply in replies]))
+                except Exception as e:
+                    for reply in replies:
+                        if not reply.future.done():
+                            reply.future.set_exception(e)
+                    continue
+                for reply in replies:
+                    if not reply.future.done():
+                        reply.future.set_result(message)
+        finally:
+            queue.task = None
+
+    def prune(self, now: float):
+        """[summary]
+        Drops the queues of channels without pending replies or recent sends.
+        """
+        for channel_id, queue in list(self.channels.items()):
+            if queue.task is None and len(queue) == 0 and queue.wait_time(now, self.limit, self.window) == 0 and len(queue.sent) == 0:
+                del self.channels[channel_id]
+        self.prune_at = max(1000, 2 * len(self.channels))
+
+    @property
+    def pending(self) -> int:
+        return sum([len(queue) for queue in self.channels.values()])
+
+
+class QueuedContext(commands.Context):
+    """[summary]
+    A command context whose `send` goes through the bot's outbound queue (created by the command dispatcher).
+    """
+
+    def __init__(self, outbox: OutboundQueue, **attrs):
+        super().__init__(**attrs)
+        self.outbox = outbox
+
+    async def send(self, content=None, **kwargs):
+        return await self.outbox.send(self, content, **kwargs)
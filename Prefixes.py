@@ -0,0 +1,55 @@
+MAX_PREFIX_LENGTH = 10
+
+
+class PrefixResolver:
+    def __init__(self, storage, default: str):
+        """[summary]
+        Resolves the command prefix of every message from an in-memory guild id -> prefix table.
+        The table is loaded from the storage once and every change is written through to it.
+        Args:
+            storage (Storage.Storage): the bot's storage (namespace "prefixes").
+            default (str): the prefix of guilds that did not set their own (and of direct messages).
+        """
+        self.storage = storage
+        self.default = default
+        self.prefixes = {}  #? guild id -> prefix (only guilds with a custom prefix)
+
+    def load(self):
+        """[summary]
+        Loads the saved prefixes from the storage (call after the storage was opened).
+        """
+        self.prefixes = {int(guild_id): prefix for guild_id, prefix in self.storage.items("prefixes").items()}
+
+    def __call__(self, bot, message) -> str:
+        """[summary]
+        The bot's `command_prefix` callable, it runs for every message the bot receives so it only does a dict lookup.
+        """
+        if message.guild is None:
+            return self.default
+        return self.prefixes.get(message.guild.id, self.default)
+
+    def get(self, guild) -> str:
+        if guild is None:
+            return self.default
+        return self.prefixes.get(guild.id, self.default)
+
+    def set(self, guild, prefix: str = None):
+        """[summary]
+        Sets the guild's prefix, None (or the default prefix) goes back to the default.
+        Raises:
+            ValueError: the prefix is empty, too long or contains whitespace.
+        """
+        if prefix is None or prefix == self.default:
+            self.prefixes.pop(guild.id, None)
+            self.storage.delete("prefixes", str(guild.id))
+            return
+        if len(prefix) == 0 or len(prefix) > MAX_PREFIX_LENGTH or any(char.isspace() for char in prefix):
+            raise ValueError(f"A prefix must be 1 to {MAX_PREFIX_LENGTH} characters long with no spaces.")
+        self.prefixes[guild.id] = prefix
+        self.storage.set("prefixes", str(guild.id), prefix)
+
+    def forget(self, guild):
+        """[summary]
+        Drops the guild's prefix from memory when the bot leaves (it stays saved in case the bot is added back).
+        """
+        self.prefixes.pop(guild.id, None)
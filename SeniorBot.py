@@ -15,8 +15,11 @@ from discord.ext import commands
 from discord import activity
 import discord
 import datetime
+import logging
 import asyncio
 import random
+import time
+import sys
 import os
 
 #? Get Bot Data initialization class.
@@ -25,17 +28,56 @@ if os.path.exists("BotData.py"):
 else:
     raise Exception("BotData.py Does not exist!")
 
+from MessagePurger import MessagePurger
+from MessageIndex import MessageIndex
+from BanIndex import BanIndex
+from MemberResolver import MemberResolver
+from MemberSearch import MemberSearch, MemberQuery
+from ActionScheduler import ActionScheduler
+from CommandRegistry import CommandRegistry
+from CommandDispatcher import CommandDispatcher
+from InviteCache import InviteCache
+from GuildStats import GuildStats
+from Metrics import CommandMetrics
+from ShardState import ClusterStats, IDENTIFY_INTERVAL
+import GatewaySession
+import MemoryProfile
+from Storage import Storage
+from Prefixes import PrefixResolver
+import LogPipeline
+import LoopWatchdog
+import OutboundQueue
+from CommandProfiler import CommandProfiler
+from TimerScheduler import TimerScheduler, TimerDropped
+import Hosting
+
 
 THIS_FOLDER = os.path.dirname(
     os.path.abspath(__file__)
 )  #? Get relative path to our folder.
-CONFIG_FILE_PATH = os.path.join(
-    THIS_FOLDER, "botconfig.cfg"
-)  #? Create path of config file. (name can be changed)
+HOST = Hosting.CURRENT  #? Set when BotHost.py runs this bot next to other bots in one process.
+CONFIG_FILE_PATH = os.environ.get(
+    "SENIORBOT_CONFIG", os.path.join(THIS_FOLDER, "botconfig.cfg")
+)  #? Create path of config file. (name can be changed, the shard launcher passes it through the environment)
+if HOST is not None:
+    CONFIG_FILE_PATH = HOST.config_path  #? Every hosted bot has its own config.
 DATETIME_OBJ = datetime.datetime
 STARTUP_TIME = DATETIME_OBJ.now()
+LOG = logging.getLogger(
+    "seniorbot" if HOST is None else f"seniorbot.{HOST.name}"
+)  #? Structured json logs, written by a background thread (see LogPipeline.py).
 
 BOT_DATA = BotData.BotData()  # Our bot data object.
+PURGER = MessagePurger()  # Our paginated message deletion engine.
+BAN_INDEX = BanIndex()  # Our per guild banned users index.
+ACTION_SCHEDULER = ActionScheduler()  # Our concurrency limited bulk moderation runner.
+COMMAND_REGISTRY = CommandRegistry() if HOST is None else HOST.registry  # Our command lookup table and help embed cache.
+INVITE_CACHE = InviteCache()  # Our per channel reusable invites.
+GUILD_STATS = GuildStats()  # Our incrementally maintained guild and member counts.
+METRICS = CommandMetrics()  # Our per command counters and latency histograms.
+METRICS_SERVER = None  # The local metrics endpoint (started once the bot is ready).
+EXTENSIONS = {"moderation": "ModerationCommands", "fun": "FunCommands"}  #? Reloadable command modules (reload name -> extension).
+CLUSTER_STATS = None  # Guild statistics of all the shard workers (only when started by the shard launcher).
 
 #? Read essential files.
 try:
@@ -43,14 +85,107 @@ try:
 except Exception as e:
     print(f"{e}")
     exit()
+IS_SHARD_WORKER = BOT_DATA.read_shard_environment()  #? Started by ShardLauncher.py?
+try:
+    CLIENT_OPTIONS = MemoryProfile.client_options(BOT_DATA.MEMORY_PROFILE, BOT_DATA.MESSAGE_CACHE)
+except ValueError as e:
+    print(f"{e}")
+    exit()
+LOG_WRITER = None  #? The host process writes the logs of all its bots.
+if HOST is None:
+    LOG_WRITER = LogPipeline.setup_logging(
+        BOT_DATA.LOG_LEVEL,
+        BOT_DATA.LOG_FILE or None,
+        max_bytes=BOT_DATA.LOG_MAX_BYTES,
+        backups=BOT_DATA.LOG_BACKUPS,
+        console=BOT_DATA.LOG_CONSOLE,
+        window=BOT_DATA.LOG_REPEAT_WINDOW,
+        burst=BOT_DATA.LOG_REPEAT_BURST,
+    )  #? Start the log writer thread.
+else:
+    CLIENT_OPTIONS["connector"] = HOST.connector  #? One HTTP connection pool for all the host's bots.
+MEMBER_RESOLVER = MemberResolver(lazy_cache_size=BOT_DATA.MEMBER_CACHE_SIZE)  # Our cache-first member lookup.
+STORAGE = Storage(BOT_DATA.STORAGE_FILE)  # Our persistent state (SQLite with a write-behind queue).
+PREFIXES = PrefixResolver(STORAGE, BOT_DATA.BOT_PREFIX)  # Our per guild command prefixes.
+TIMERS = TimerScheduler(STORAGE, ACTION_SCHEDULER)  # Our persistent timed mutes and bans.
+PROFILER = CommandProfiler(BOT_DATA.PROFILE_DIR)  # Our on demand command profiler.
+WATCHDOG = LoopWatchdog.LoopWatchdog(
+    BOT_DATA.LAG_INTERVAL, BOT_DATA.STALL_THRESHOLD
+) if HOST is None else HOST.watchdog  # Our event loop lag monitor.
+MESSAGE_INDEX = MessageIndex(BOT_DATA.INDEX_PER_CHANNEL, BOT_DATA.INDEX_MAX_MESSAGES)  # Our per channel recent message ids.
+MEMBER_SEARCH = MemberSearch(
+    BOT_DATA.MEMBER_SEARCH_FUZZY, BOT_DATA.MEMBER_SEARCH_SIMILARITY, chunk=CLIENT_OPTIONS["intents"].members
+)  # Our per guild member name index.
+OUTBOX = OutboundQueue.OutboundQueue(
+    BOT_DATA.REPLY_LIMIT,
+    BOT_DATA.REPLY_WINDOW,
+    BOT_DATA.REPLY_MAX_PENDING,
+    BOT_DATA.REPLY_MAX_AGE,
+    priorities={EXTENSIONS["moderation"]: OutboundQueue.HIGH, EXTENSIONS["fun"]: OutboundQueue.LOW},
+)  # Our rate limit aware command reply queue.
+DISPATCHER = CommandDispatcher(PREFIXES, BOT_DATA.CASE_INSENSITIVE_COMMANDS, OUTBOX)  # Our fast path command dispatcher.
+if HOST is None and BOT_DATA.USE_UVLOOP and not LoopWatchdog.install_uvloop():  #? Must happen before the bot creates its loop.
+    LOG.warning("uvloop is not installed, using the default asyncio event loop")
 
 
 #? Create and Initialize Bot object.
-BOT = Bot(
-    command_prefix=BOT_DATA.BOT_PREFIX,
-    description="Bot by Raz Kissos, helper and useful functions.",
-)  #? Create the discord bot.
+if BOT_DATA.SHARD_MODE == "auto":
+    BOT = AutoShardedBot(
+        command_prefix=PREFIXES,
+        description="Bot by Raz Kissos, helper and useful functions.",
+        shard_ids=BOT_DATA.SHARD_IDS,
+        shard_count=BOT_DATA.SHARD_COUNT or None,
+        **CLIENT_OPTIONS,  # Intents and caching of the configured memory profile.
+    )  #? Create the sharded discord bot (one gateway connection per shard).
+else:
+    BOT = Bot(
+        command_prefix=PREFIXES,
+        description="Bot by Raz Kissos, helper and useful functions.",
+        **CLIENT_OPTIONS,  # Intents and caching of the configured memory profile.
+    )  #? Create the discord bot.
+
+
+async def staggered_identify(shard_id, *, initial=False):
+    """
+    Waits for the shard's identify slot, discord allows `identify_concurrency` identifies (one per bucket) every 5 seconds across all processes.
+    Every worker counts from the same launch epoch, so workers don't need to talk to each other.
+    @param shard_id (int): the shard about to identify.
+    @param initial (bool): True for the first shard this process launches.
+    """
+    slot = BOT_DATA.LAUNCH_EPOCH + (shard_id // BOT_DATA.IDENTIFY_CONCURRENCY) * IDENTIFY_INTERVAL
+    if time.time() < slot:
+        await asyncio.sleep(slot - time.time())
+    elif not initial:
+        await asyncio.sleep(5.0)  # Reconnects keep discord.py's default pacing.
+
+
+if IS_SHARD_WORKER:
+    BOT.before_identify_hook = staggered_identify
+    CLUSTER_STATS = ClusterStats(GUILD_STATS, BOT_DATA.SHARD_STATE_DIR, BOT_DATA.WORKER_ID)
+ALL_GUILD_STATS = CLUSTER_STATS or GUILD_STATS  #? Statistics of the whole bot, not just this process.
+
+SESSION_STORE = None  #? Saved gateway sessions (when resuming is enabled).
+if BOT_DATA.GATEWAY_RESUME:
+    session_file = BOT_DATA.GATEWAY_SESSION_FILE
+    if IS_SHARD_WORKER:  # Every worker saves its own shards' sessions.
+        base, extension = os.path.splitext(session_file)
+        session_file = f"{base}-{BOT_DATA.WORKER_ID}{extension}"
+    SESSION_STORE = GatewaySession.SessionStore(session_file, BOT_DATA.GATEWAY_RESUME_WINDOW)
+    GatewaySession.install(BOT, SESSION_STORE)  #? RESUME the saved session instead of identifying again.
 BOT.remove_command("help")  #? Remove default `help` command (will replace later).
+METRICS.instrument_http(BOT.http)  #? Time every REST call made while a command runs.
+METRICS.add_gauge("gateway_latency_seconds", "Gateway heartbeat latency.", lambda: BOT.latency)
+METRICS.add_gauge("guilds", "Guilds the bot is in.", lambda: ALL_GUILD_STATS.guild_count)
+METRICS.add_gauge("members", "Members in all the bot's guilds.", lambda: ALL_GUILD_STATS.member_count)
+METRICS.add_gauge("process_guilds", "Guilds handled by this process.", lambda: GUILD_STATS.guild_count)
+METRICS.add_gauge("member_cache_hit_ratio", "Moderation member lookups served from the cache.", lambda: MEMBER_RESOLVER.hit_rate)
+METRICS.add_gauge("event_loop_lag_seconds", "Lag of the last event loop heartbeat.", lambda: WATCHDOG.last_lag)
+METRICS.add_gauge("messages_received", "Messages the dispatcher processed.", lambda: DISPATCHER.received)
+METRICS.add_gauge("messages_rejected", "Messages rejected before any parsing (bots, webhooks, no prefix).", lambda: DISPATCHER.rejected)
+METRICS.add_gauge("messages_dispatched", "Messages that invoked a command.", lambda: DISPATCHER.dispatched)
+METRICS.add_gauge("replies_sent", "Messages sent by the reply queue.", lambda: OUTBOX.sent)
+METRICS.add_gauge("replies_merged", "Replies sent as part of another reply's message.", lambda: OUTBOX.merged)
+METRICS.add_gauge("replies_dropped", "Low priority replies dropped under backpressure.", lambda: OUTBOX.dropped)
 
 
 @BOT.event
@@ -59,411 +194,399 @@ async def on_ready():
     This function sends a message in the console telling us the bot is up.
     it also configures the bot's status and sends the data to the servers.
     """
+    global METRICS_SERVER
     BOT_DATA.BOT_NAME = BOT.user.name
+    COMMAND_REGISTRY.build(BOT)  # Build the command table and help embeds with the bot's avatar.
+    WATCHDOG.watch_bot(BOT)  # Attribute event loop stalls to the commands and listeners.
+    GUILD_STATS.rebuild(BOT.guilds)  # Count the guilds once, events keep the counts current from now on.
+    MESSAGE_INDEX.clear()  # Messages sent while the bot was disconnected were missed.
+    MEMBER_SEARCH.clear()  # So were member joins and renames, guilds are indexed again on their next name lookup.
+    if BOT_DATA.METRICS_PORT and METRICS_SERVER is None:  # on_ready can fire again after a reconnect.
+        METRICS_SERVER = await METRICS.start_server(
+            BOT_DATA.METRICS_HOST, BOT_DATA.METRICS_PORT + BOT_DATA.WORKER_ID  # One port per shard worker.
+        )
     activity_info = activity.Activity(
         type=activity.ActivityType.listening, name="{}help".format(BOT_DATA.BOT_PREFIX)
     )
     await BOT.change_presence(activity=activity_info, status=BOT_DATA.STATUS)
 
 
-def print_guilds():
-    print("********************")
-    print("Current servers: ")
-    for server in BOT.guilds:
-        print("- " + server.name)
-    print("********************")
+@BOT.event
+async def on_message(message):
+    """
+    This function replaces the default command processing with the fast path dispatcher (see CommandDispatcher.py).
+    @param message (discord.Message): the new message.
+    """
+    await DISPATCHER.process(BOT, message)
+
+
+async def publish_cluster_stats():
+    """
+    This function shares this worker's guild statistics with the other shard workers every 30 seconds.
+    """
+    await BOT.wait_until_ready()
+    while not BOT.is_closed():
+        await CLUSTER_STATS.refresh()
+        await asyncio.sleep(30)
+
+
+async def run_timers():
+    """
+    This function lifts the temporary mutes and bans once they expire (overdue ones right after startup).
+    """
+    await BOT.wait_until_ready()
+    await TIMERS.run()
+
+
+def owns_guild(guild_id: int) -> bool:
+    """
+    Checks if the guild is on one of this process's shards (all the shard workers share the storage).
+    @param guild_id (int): the guild's id.
+    @return (bool): True if this process handles the guild.
+    """
+    if BOT_DATA.SHARD_IDS is None:
+        return True
+    return (guild_id >> 22) % BOT_DATA.SHARD_COUNT in BOT_DATA.SHARD_IDS
 
 
 async def list_servers():
     """
-    This function prints the bot's connected server list every hour.
+    This function logs a structured metrics snapshot (guilds, latency, per command counters) every hour.
     """
     await BOT.wait_until_ready()
     while not BOT.is_closed():
-        print_guilds()
-        print(
-            "{}\nBot by Raz Kissos, helper and useful functions.\n********************\n".format(
-                DATETIME_OBJ.today()
-            )
-        )
+        snapshot = METRICS.snapshot()
+        snapshot["time"] = DATETIME_OBJ.today().isoformat()
+        if IS_SHARD_WORKER:
+            snapshot["worker"] = BOT_DATA.WORKER_ID
+            snapshot["shards"] = BOT_DATA.SHARD_IDS
+        LOG.info("metrics snapshot", extra={"snapshot": snapshot})
         await asyncio.sleep(3600) # Wait one hour.
-    print("Bot is closing...")
+    LOG.info("Bot is closing...")
     await asyncio.sleep(1)
 
 
+@BOT.before_invoke
+async def before_any_command(ctx):
+    """
+    Starts the command's metrics timer (runs in the command's own task, right before the handler).
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    METRICS.command_started(ctx)
+    PROFILER.begin(ctx)  # Does nothing unless the profile command turned profiling on.
+
+
+@BOT.after_invoke
+async def after_any_command(ctx):
+    """
+    Records the command's handler and REST time.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    METRICS.command_finished(ctx)
+    await PROFILER.end(ctx)
+    LOG.debug("command finished", extra=command_log_context(ctx))
+
+
 @BOT.event
 async def on_command_error(ctx, error):
     """
-    Excepts every error the bot receivs and prints it to the console.
+    Excepts every error the bot receivs, counts it and logs it.
     @param ctx (discord.ext.commands.Context): the command context object.
     @param error (from discord.errors): the excepted error.
     """
-    print("[!] ERROR: {}\n".format(error))
+    METRICS.command_failed(ctx, error)
+    original = getattr(error, "original", error)
+    extra = command_log_context(ctx)
+    extra["error_type"] = type(original).__name__
+    if isinstance(error, CommandInvokeError):  # A bug in the command, keep the traceback.
+        LOG.error("command error: %s", original, extra=extra, exc_info=original)
+    else:
+        LOG.warning("command error: %s", error, extra=extra)
 
 
-#? Create Asynchronous tasks for the bot before running:
-asyncio.ensure_future(
-    list_servers()
-)  #? Run the `list_servers` function as an asynchronous coroutine.
+def command_log_context(ctx):
+    """
+    Returns the log fields of a command invocation (guild, channel, command, user and the time since it started).
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    extra = LogPipeline.command_context(ctx)
+    start = getattr(ctx, "metrics_start", None)
+    if start is not None:
+        extra["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return extra
 
 
-###########################################################################################################################################################################
-###############################################################| Server Dedicated Commands |###############################################################################
-###########################################################################################################################################################################
-@BOT.command(
-    name="help",
-    aliases=["h"],
-    brief="Shows the help message.\nAlso can be used as a single command help message.",
-    description="When sent with no arguments, the command simply prints out all the command names and their brief explanations. But when sending a command name as an argument the command will print out a full list of the command's fields.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}help** -> print out the full list of commands.\n| **{BOT_DATA.BOT_PREFIX}help <command name>** - > print out thorough description of the command with the matching name",
-)
-async def help(ctx, command_name: str = None):
+@BOT.listen()
+async def on_resumed():
     """
-    This command replaces the default help command from discord and sends a prettier and formatted help message.
-    @param ctx (discord.ext.commands.Context): the command context object.
-    @param command_name (str): the command name to get data about (optional).
+    Rebuilds the cache after resuming a session saved by the previous run (a normal resume keeps the cache).
     """
+    if SESSION_STORE is not None:
+        await GatewaySession.hydrate(BOT, SESSION_STORE)
 
-    if command_name is None:  # Check if help was invoked as a specific command help.
-        # Create return embed
-        author = ctx.message.author
-        embed = discord.Embed(color=discord.Color.gold())
-        embed.set_thumbnail(url=BOT.user.avatar_url)
-        embed.set_footer(text="Senior Bot's Commands")
-
-        for cmd in BOT.commands:
-            embed.add_field(
-                name=str(f"♿|**{BOT_DATA.BOT_PREFIX}{cmd.name}**: "),
-                value=str(f"❓ {cmd.brief}"),
-                inline=False,
-            )
-        await ctx.send(
-            embed=embed
-        )  # Send the shallow info of each command as an embed.
-    else:  # Help command was invoked as a specific command help.
-        # Check if command name is actually a command.
-        if command_name in [command.name for command in BOT.commands]:
-            # Get the requested command object.
-            cmd_to_print = None
-            for cmd in BOT.commands:
-                if cmd.name == command_name:
-                    cmd_to_print = cmd
-                    break
-
-            # Check if command has any aliases, if not return 'None'.
-            if len(cmd_to_print.aliases) == 0:
-                aliases_str = "None"
-            else:
-                aliases_str = ", ".join(
-                    [f'"{alias}"' for alias in cmd_to_print.aliases]
-                )
-
-            # Create and send the thorough command info embed.
-            embed = discord.Embed(color=discord.Color.dark_orange())
-            embed.set_footer(text=f'"{cmd_to_print.name}" thorough description')
-            embed.add_field(
-                name="💬 Command Name 💬", value=cmd_to_print.name, inline=False
-            )
-            embed.add_field(
-                name="❓ Brief Explanation ❓", value=cmd_to_print.brief, inline=False
-            )
-            embed.add_field(
-                name="📰 Description 📰", value=cmd_to_print.description, inline=False
-            )
-            embed.add_field(
-                name="⚙ Command Usage ⚙", value=cmd_to_print.usage, inline=False
-            )
-            embed.add_field(
-                name="🎭 Command Name Aliases 🎭", value=aliases_str, inline=False
-            )
-            await ctx.channel.send(embed=embed)
-        else:  # Command name was not found in the bot's commands.
-            await ctx.channel.send(f"No command named {command} was found!")
 
+@BOT.listen()
+async def on_shard_resumed(shard_id):
+    """
+    Rebuilds a shard's cache after resuming a session saved by the previous run.
+    @param shard_id (int): the resumed shard.
+    """
+    if SESSION_STORE is not None:
+        await GatewaySession.hydrate(BOT, SESSION_STORE, shard_id)
 
-@BOT.command(
-    name="mute",
-    brief="Mutes the mentioned member.",
-    description="Mutes the mentioned member by giving him a server mute.\n**Important** - user must have the ***administrator*** permission.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}mute @<member mention>** -> will apply a server mute to the mentioned member.",
-    pass_context=True,
-)
-@commands.has_permissions(administrator=True)
-async def mute(ctx, member: discord.Member):
+
+@BOT.listen()
+async def on_member_ban(guild, user):
     """
-    This command will apply a server mute to the given member and send an embedded message to confirm the mute.
-    @param ctx (discord.ext.commands.Context): the command context object.
-    @param member (discord.Member): the member to be muted object.
-    """
-    # Check if member is in the guild.
-    guild_member = await ctx.guild.fetch_member(member.id)
-    if member == guild_member:
-        await member.edit(mute=True)  # Apply server mute.
-        embed = discord.Embed(
-            title="User Muted!",
-            description=f"**{member}** was muted by **{ctx.message.author}**!",
-            color=discord.Color.red(),
-        )
-        await ctx.channel.send(embed=embed)  # Send fancy mute embed.
+    Keeps the ban index current when a user is banned (by the bot or by anyone else).
+    @param guild (discord.Guild): the guild the user was banned from.
+    @param user (discord.User): the banned user.
+    """
+    BAN_INDEX.on_ban(guild, user)
+    MEMBER_RESOLVER.forget(guild.id, user.id)
 
 
-@mute.error
-async def mute_error(ctx, error):
-    if isinstance(
-        error, MissingPermissions
-    ):  # Check if the error was caused by missing permissions error.
-        await ctx.channel.send(
-            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{BOT_DATA.BOT_PREFIX}help mute' to see more information."
-        )
-    elif isinstance(
-        error, discord.HTTPException
-    ):  # Check if error was caused because member fetch had failed.
-        await ctx.channel.send(f"Member is not in the server!")
-    else:
-        await ctx.channel.send(f"Error! {error}")
+@BOT.listen()
+async def on_member_unban(guild, user):
+    """
+    Keeps the ban index current when a user is unbanned.
+    @param guild (discord.Guild): the guild the user was unbanned from.
+    @param user (discord.User): the unbanned user.
+    """
+    BAN_INDEX.on_unban(guild, user)
+    TIMERS.cancel("unban", guild.id, user.id)  # Unbanned before the temporary ban ran out.
 
 
-@BOT.command(
-    name="unmute",
-    brief="Unmutes the mentioned member.",
-    description="Unmutes the mentioned member by removing his server mute.\n**Important** - user must have the ***administrator*** permission.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}unmute @<member mention>** -> will remove the server mute from the mentioned member.",
-    pass_context=True,
-)
-@commands.has_permissions(administrator=True)
-async def unmute(ctx, member: discord.Member):
+@BOT.listen()
+async def on_guild_remove(guild):
     """
-    This command unmutes the server mute that was put on the given member.
-    @param ctx (discord.ext.commands.Context): the command context object.
-    @param member (discord.Member): the member to be unmuted object.
+    Drops the guild's cached data when the bot leaves a guild.
+    @param guild (discord.Guild): the guild the bot left.
     """
-    # Check if member is in the guild.
-    guild_member = await ctx.guild.fetch_member(member.id)
-    if member == guild_member:
-        await member.edit(mute=False)  # Apply server unmute.
-        embed = discord.Embed(
-            title="User Unmuted!",
-            description=f"**{member}** was unmuted by **{ctx.message.author}**!",
-            color=discord.Color.green(),
-        )
-        await ctx.send(embed=embed)  # Send fancy mute embed.
+    BAN_INDEX.forget(guild)
+    INVITE_CACHE.forget_guild(guild)
+    GUILD_STATS.remove_guild(guild)
+    PREFIXES.forget(guild)
+    MEMBER_SEARCH.forget(guild)
+    for channel in guild.text_channels:
+        MESSAGE_INDEX.forget_channel(channel.id)
 
 
-@unmute.error
-async def unmute_error(ctx, error):
-    if isinstance(
-        error, MissingPermissions
-    ):  # Check if the error was caused by missing permissions error.
-        await ctx.channel.send(
-            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{BOT_DATA.BOT_PREFIX}help unmute' to see more information."
-        )
-    elif isinstance(
-        error, discord.HTTPException
-    ):  # Check if error was caused because member fetch had failed.
-        await ctx.channel.send(f"Member is not in the server!")
-    else:
-        await ctx.channel.send(f"Error! {error}")
+@BOT.listen()
+async def on_guild_join(guild):
+    """
+    Counts a newly joined guild in the guild statistics.
+    @param guild (discord.Guild): the joined guild.
+    """
+    GUILD_STATS.add_guild(guild)
 
 
-@BOT.command(
-    name="kick",
-    brief="Kicks the mentioned member with a reason.",
-    description="Kicks the mentioned member and sends the reason given by the admin.\n**Important** - user must have the ***kick members*** permission.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}kick @<member mention> <reason>** -> kicks the mentioned member and sends the reason to him (reason does not have to be in quotes).",
-    pass_context=True,
-)
-@commands.has_permissions(kick_members=True)
-async def kick(ctx, member: discord.Member, *, reason: str):
+@BOT.listen()
+async def on_guild_update(before, after):
     """
-    This command checks if the given user is indeed a member of the current server, if so it kicks him and sends him the reason.
-    @param ctx (discord.ext.commands.Context): the command context object.
-    @param member (discord.Member): the member to be kicked.
-    @param reason (str): the reason for the kick.
-    """
-    # Get the member from the guild, if returned None then member is not in the guild.
-    guild_member = await ctx.guild.fetch_member(member.id)
-    if guild_member is not None:  # Member exists, need to kick.
-        await guild_member.kick(reason=reason)
-        await ctx.channel.send(
-            f'Kicked the member {guild_member.mention} for reason "{reason}"'
-        )
-    else:  # Member not in the server.
-        await ctx.channel.send("User is not in the server")
+    Keeps the guild listing current when a guild is renamed.
+    @param before (discord.Guild): the guild before the update.
+    @param after (discord.Guild): the guild after the update.
+    """
+    GUILD_STATS.rename_guild(after)
 
 
-@kick.error
-async def kick_error(ctx, error):
-    if isinstance(
-        error, MissingPermissions
-    ):  # Check if the error was caused by missing permissions error.
-        await ctx.channel.send(
-            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{BOT_DATA.BOT_PREFIX}help kick' to see more information."
-        )
-    else:
-        await ctx.channel.send(f"Error! {error}")
+@BOT.listen()
+async def on_member_join(member):
+    """
+    Counts a joined member in the guild statistics and against the guild's cached invites.
+    @param member (discord.Member): the member who joined.
+    """
+    GUILD_STATS.member_joined(member.guild)
+    INVITE_CACHE.on_member_join(member)
+    MEMBER_SEARCH.update(member)
 
 
-@BOT.command(
-    name="ban",
-    brief="Bans the mentioned member with a reason.",
-    description="Bans the mentioned member and sends the reason given by the admin.\n**Important** - user must have the ***ban members*** permission.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}ban @<member mention> <reason>** -> bans the mentioned member and sends the reason to him (reason does not have to be in quotes).",
-    pass_context=True,
-)
-@commands.has_permissions(ban_members=True)
-async def ban(ctx, member: discord.Member, *, reason: str):
+@BOT.listen()
+async def on_member_remove(member):
     """
-    This command checks if the given user is indeed a member of the current server, if so it bans him and sends him the reason.
-    @param ctx (discord.ext.commands.Context): the command context object.
-    @param member (discord.Member): the member to be banned.
-    @param reason (str): the reason for the ban.
-    """
-    # Get the member from the guild, if returned None then member is not in the guild.
-    guild_member = await ctx.guild.fetch_member(member.id)
-    if guild_member is not None:  # Member exists, need to ban.
-        await guild_member.ban(reason=reason)
-        await ctx.channel.send(
-            f'Banned the member {guild_member.mention} for reason: "{reason}"'
-        )
-    else:  # Member not in the server.
-        await ctx.channel.send("User is not in the server!")
+    Uncounts a member who left in the guild statistics.
+    @param member (discord.Member): the member who left.
+    """
+    GUILD_STATS.member_left(member.guild)
+    MEMBER_RESOLVER.forget(member.guild.id, member.id)
+    MEMBER_SEARCH.remove(member)
 
 
-@ban.error
-async def ban_error(ctx, error):
-    if isinstance(
-        error, commands.CheckFailure
-    ):  # Check if the error was caused by missing permissions error.
-        await ctx.channel.send(
-            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{BOT_DATA.BOT_PREFIX}help ban' to see more information."
-        )
-    else:
-        await ctx.channel.send(f"Error! {error}")
+@BOT.listen()
+async def on_member_update(before, after):
+    """
+    Re-indexes a member's name and nickname (nothing is done unless one of them changed).
+    @param before (discord.Member): the member before the update.
+    @param after (discord.Member): the member after the update.
+    """
+    MEMBER_SEARCH.update(after)
 
 
-@BOT.command(
-    name="unban",
-    brief="Unbans the named user from the server.",
-    description="Unbans the named user from the server.\n**Important** - user must have the ***ban members*** permission.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}unban <banned user's name>** -> unbans the user with the corresponding name from the server (user has to be banned).",
-    pass_context=True,
-)
-@commands.has_permissions(ban_members=True)
-async def unban(ctx, name_of_user: str):
+@BOT.listen()
+async def on_invite_delete(invite):
     """
-    This command checks if the given username belongs to a banned member of the current server, if so it unbans him.
-    @param ctx (discord.ext.commands.Context): the command context object.
-    @param name_of_user (str): the username of the member to be unbanned.
+    Drops a cached invite once it is deleted (by hand, used up or expired).
+    @param invite (discord.Invite): the deleted invite.
     """
-    guild_bans = await ctx.guild.bans()  # Get all the guild bans.
-    banned_users = [ban.user for ban in guild_bans]  # Create a list of banned users.
+    INVITE_CACHE.on_invite_delete(invite)
 
-    for user in banned_users:  # Find the user to unban and unban him.
-        if user.name == name_of_user:
-            await ctx.guild.unban(user)
-            await ctx.channel.send(f"Unbanned the user {user.mention}!")
-            return
 
-    # Will occure only when user is not banned since we return if he is.
-    await ctx.channel.send("User is not banned!")
+@BOT.listen("on_message")
+async def index_message(message):
+    """
+    Indexes every new guild message for the clean command.
+    @param message (discord.Message): the new message.
+    """
+    if message.guild is not None:
+        MESSAGE_INDEX.add(message)
+
 
+@BOT.listen()
+async def on_raw_message_delete(payload):
+    """
+    Removes a deleted message from the message index (raw events fire even when the message isn't cached).
+    @param payload (discord.RawMessageDeleteEvent): the deleted message's ids.
+    """
+    MESSAGE_INDEX.remove(payload.channel_id, (payload.message_id,))
 
-@unban.error
-async def unban_error(ctx, error):
-    if isinstance(
-        error, commands.CheckFailure
-    ):  # Check if the error was caused by missing permissions error.
-        await ctx.channel.send(
-            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{BOT_DATA.BOT_PREFIX}help unban' to see more information."
-        )
-    else:
-        await ctx.channel.send(f"Error! {error}")
+
+@BOT.listen()
+async def on_raw_bulk_message_delete(payload):
+    """
+    Removes bulk deleted messages from the message index.
+    @param payload (discord.RawBulkMessageDeleteEvent): the deleted messages' ids.
+    """
+    MESSAGE_INDEX.remove(payload.channel_id, payload.message_ids)
+
+
+@BOT.listen()
+async def on_guild_channel_delete(channel):
+    """
+    Drops a deleted channel's messages from the message index.
+    @param channel (discord.abc.GuildChannel): the deleted channel.
+    """
+    MESSAGE_INDEX.forget_channel(channel.id)
+
+
+#? Create Asynchronous tasks for the bot before running:
+asyncio.ensure_future(
+    list_servers()
+)  #? Run the `list_servers` function as an asynchronous coroutine.
+if IS_SHARD_WORKER:
+    asyncio.ensure_future(
+        publish_cluster_stats()
+    )  #? Share the guild statistics between the shard workers.
+WATCHDOG.watch(list_servers, "task:list_servers")
+WATCHDOG.watch(publish_cluster_stats, "task:publish_cluster_stats")
+asyncio.ensure_future(run_timers())  #? Lift the temporary mutes and bans when they expire.
+WATCHDOG.watch(TIMERS.run, "task:timers")
+if HOST is None:  # The host runs the shared event loop's watchdog.
+    asyncio.ensure_future(
+        WATCHDOG.run(BOT_DATA.STALL_THRESHOLD if BOT_DATA.ASYNCIO_DEBUG else None)
+    )  #? Measure the event loop lag.
 
 
+###########################################################################################################################################################################
+###############################################################| Server Dedicated Commands |###############################################################################
+###########################################################################################################################################################################
 @BOT.command(
-    name="clean",
-    brief="Cleans a given number of a user's messages from the text channel.",
-    description="Cleans the given amount of messages that were sent by the mentioned member (If message amount is not specified automatically selects 10).\n**Important** - user must have the ***administrator*** permission.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}clean @<user mention> <message amount>** -> deletes the given amount of messages the mentioned member has has sent in the current text channel (message amount is optional, default will be 10).",
-    pass_context=True,
+    name="help",
+    aliases=["h"],
+    brief="Shows the help message.\nAlso can be used as a single command help message.",
+    description="When sent with no arguments, the command simply prints out all the command names and their brief explanations. But when sending a command name as an argument the command will print out a full list of the command's fields.",
+    usage="| **{prefix}help** -> print out the full list of commands.\n| **{prefix}help <command name>** - > print out thorough description of the command with the matching name",
 )
-@commands.has_permissions(administrator=True)
-async def clean(ctx, member: discord.Member, count: int = 10):
+async def help(ctx, command_name: str = None):
     """
-    This command receives a member object and a count (optional), then checks if the member is in the server and if the count is positive.
-    If all the checks are passed, The member's messages are stored in a list and then asynchronously deleted.
+    This command replaces the default help command from discord and sends a prettier and formatted help message.
     @param ctx (discord.ext.commands.Context): the command context object.
-    @param member (discord.Member): the member of whom the messages will be deleted.
-    @param count (int, optional): the amount of messages to be deleted. Defaults to 10.
+    @param command_name (str): the command name to get data about (optional).
     """
-    # Perform checks to see if the command can indeed be run in the current context.
-    guild_member = await ctx.guild.fetch_member(member.id)
-    if guild_member is None:  # Check if member is in the guild.
-        await ctx.channel.send("Given member is not a member of this server.")
-        return
-    if count < 1:  # Check if the message amount to delete is not valid (not positive).
-        await ctx.channel.send(
-            "Zero or Negative amount of messages to delete was given!"
-        )
-        return
-    if len(ctx.message.mentions) != 1:  # Check if more than 1 member was mentioned.
-        await ctx.channel.send("Can only delete 1 user's messages at a time!")
-        return
 
-    # Create the channel messages iterator.
-    iterator = ctx.channel.history()
-    counter = 0
-    msg_list = []
-    while counter < count:
-        try:
-            msg = await iterator.next()
-            if msg.author == member:
-                msg_list.append(msg)  # Get a user's message and store it.
-                counter += 1  # Update the counter.
-        except:
-            try:
-                await ctx.channel.delete_messages(
-                    msg_list
-                )  # Run asynchronous coroutine delete_messages to delete all the found messages from the user.
-                print(
-                    f"Deleted {counter} messages from channel {ctx.channel.name}"
-                )  # Log the event.
-                return
-            except:
-                return
-    try:
-        # Run asynchronous coroutine delete_messages to delete all the found messages from the user after reached counter.
-        await ctx.channel.delete_messages(msg_list)
-        print(
-            f"Deleted {counter} messages from channel {ctx.channel.name}"
-        )  # Log the event.
-    except:
-        return
+    prefix = PREFIXES.get(ctx.guild)  # Help is rendered for the guild's own prefix.
+    if command_name is None:  # Check if help was invoked as a specific command help.
+        for embed in COMMAND_REGISTRY.help_embeds(BOT, prefix):
+            await ctx.send(
+                embed=embed
+            )  # Send the shallow info of each command as an embed.
+    else:  # Help command was invoked as a specific command help.
+        # Get the cached thorough command info embed (the name can also be an alias).
+        embed = COMMAND_REGISTRY.command_embed(BOT, prefix, command_name)
+        if embed is not None:
+            await ctx.send(embed=embed)
+        else:  # Command name was not found in the bot's commands.
+            await ctx.send(f"No command named {command_name} was found!")
 
 
-@clean.error
-async def clean_error(ctx, error):
-    if isinstance(
-        error, CheckFailure
-    ):  # Check if the error was caused by missing permissions error.
-        await ctx.channel.send(
-            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{BOT_DATA.BOT_PREFIX}help clean' to see more information."
-        )
+async def unmute_member(guild, user_id: int):
+    """
+    Removes the server mute of a guild member (used by the unmute command and by expired temporary mutes).
+    @param guild (discord.Guild): the guild of the member.
+    @param user_id (int): the member's id.
+    @return (discord.Member): the unmuted member, None if the user is not in the guild.
+    """
+    member = await MEMBER_RESOLVER.resolve(guild, user_id)  # Member cache first, REST only on a miss.
+    if member is not None:
+        await member.edit(mute=False)  # Apply server unmute.
+        TIMERS.cancel("unmute", guild.id, user_id)  # Unmuted before the temporary mute ran out.
+    return member
+
+
+async def unban_user(guild, user):
+    """
+    Unbans a user (used by the unban command and by expired temporary bans).
+    @param guild (discord.Guild): the guild the user is banned from.
+    @param user (discord.abc.Snowflake): the banned user.
+    """
+    await guild.unban(user)
+    BAN_INDEX.on_unban(guild, user)  # Don't wait for the event to update the index.
+    TIMERS.cancel("unban", guild.id, user.id)
+
+
+async def expire_mute(guild_id: int, user_id: int):
+    """
+    Lifts an expired temporary mute.
+    @param guild_id (int): the guild of the mute.
+    @param user_id (int): the muted member's id.
+    """
+    guild = BOT.get_guild(guild_id)
+    if guild is None:
+        raise TimerDropped("The bot is not in the server anymore!")
+    if await unmute_member(guild, user_id) is None:
+        raise TimerDropped("Member is not in the server!")
+
+
+async def expire_ban(guild_id: int, user_id: int):
+    """
+    Lifts an expired temporary ban.
+    @param guild_id (int): the guild of the ban.
+    @param user_id (int): the banned user's id.
+    """
+    guild = BOT.get_guild(guild_id)
+    if guild is None:
+        raise TimerDropped("The bot is not in the server anymore!")
+    await unban_user(guild, discord.Object(id=user_id))  # NotFound (not banned anymore) drops the timer too.
+
+
+TIMERS.register("unmute", expire_mute)
+TIMERS.register("unban", expire_ban)
 
 
 @BOT.command(
     name="botinfo",
     aliases=["bot"],
     brief="Shows general information about the bot.",
-    description="Shows the bot information (startup time, github page, etc...).",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}botinfo** -> will print an embed with the general bot information.",
+    description="Shows the bot information (startup time, guild and member counts, github page, etc...).\nThe guild list is split into pages.",
+    usage="| **{prefix}botinfo** -> will print an embed with the general bot information.\n| **{prefix}botinfo <page>** -> will show the given page of the guild list.",
 )
-async def botinfo(ctx):
+async def botinfo(ctx, page: int = 1):
     """
     This command sends an embed to the context's channel which will contain general bot information.
+    The counts are read from the incrementally maintained guild statistics (of every shard worker), so the command costs the same in any amount of guilds.
     @param ctx (discord.ext.commands.Context): the command context object.
+    @param page (int, optional): the guild list page to show. Defaults to 1.
     """
-    print(STARTUP_TIME)
     embed_ret = discord.Embed(colour=discord.Color.green(), timestamp=ctx.message.created_at, title=f"Bot Info")
     embed_ret.set_thumbnail(url=BOT.user.avatar_url)
     embed_ret.add_field(name="❓ Name ❔", value=BOT.user.name)
@@ -477,24 +600,28 @@ async def botinfo(ctx):
         return fmt.format(**d)
     
     embed_ret.add_field(name="🕗 Total Runtime 🕑", value=strfdelta((DATETIME_OBJ.now() - STARTUP_TIME), "{days} days {hours}:{minutes}:{seconds}"), inline=False)
-    embed_ret.add_field(name="🌍 All Guilds 🌎", value='\n'.join([str('- ' + guild.name) for guild in BOT.guilds]), inline=False)
+    embed_ret.add_field(name="🏰 Guilds 🏰", value=str(ALL_GUILD_STATS.guild_count))
+    embed_ret.add_field(name="🧍 Members 🧍", value=str(ALL_GUILD_STATS.member_count))
+    embed_ret.add_field(name="💎 Shards 💎", value=str(BOT.shard_count or 1))
+    page = min(max(page, 1), ALL_GUILD_STATS.page_count())
+    embed_ret.add_field(name=f"🌍 All Guilds ({page}/{ALL_GUILD_STATS.page_count()}) 🌎", value=ALL_GUILD_STATS.guild_page(page), inline=False)
     embed_ret.add_field(name="🔗 GitHub Link 🔗", value="https://github.com/RazKissos/SeniorBot", inline=False)
     embed_ret.set_footer(text="Bot Information")
-    await ctx.channel.send(embed=embed_ret)  # Send the embed.
+    await ctx.send(embed=embed_ret)  # Send the embed.
 
 @BOT.command(
     name="serverinfo",
     aliases=["info"],
     brief="Shows server information.",
     description="Shows the all the server information (icon, memeber count, etc...).",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}serverinfo** -> will print an embed with the general server information.",
+    usage="| **{prefix}serverinfo** -> will print an embed with the general server information.",
 )
 async def serverinfo(ctx):
     """
     This command sends an embed to the context's channel which will contain general server information.
     @param ctx (discord.ext.commands.Context): the command context object.
     """
-    guild = ctx.guild  # Get the guild object
+    guild = ctx.guild  # Get the guild object (name, icon and member count come from the gateway cache).
     # Create the embed.
     embed_ret = discord.Embed(colour=discord.Color.gold())
     embed_ret.set_thumbnail(url=guild.icon_url)
@@ -503,9 +630,12 @@ async def serverinfo(ctx):
     embed_ret.add_field(
         name="🧍 Memeber Count 🧍", value=str(guild.member_count), inline=False
     )
-    invite_url = await ctx.channel.create_invite(max_age=3600, max_uses=3, unique=False)
+    try:
+        invite_url = await INVITE_CACHE.get(ctx.channel)  # Reuse the channel's invite while it has time and uses left.
+    except discord.HTTPException:  # Bot can't create invites in this channel.
+        invite_url = "Unavailable"
     embed_ret.add_field(name="🔗 Invite Link 🔗", value=invite_url, inline=False)
-    await ctx.channel.send(embed=embed_ret)  # Send the embed.
+    await ctx.send(embed=embed_ret)  # Send the embed.
 
 
 @BOT.command(
@@ -513,9 +643,9 @@ async def serverinfo(ctx):
     aliases=["whois"],
     brief="Shows the mentioned member information.",
     description="Sends an embed containing the mentioned member's information (icon, name, roles, nickname, id, etc...).\nIf no member was mentioned the command will show the info of the author.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}userinfo @<mentioned_member>** -> will show the mentioned member's general information.\n| **{BOT_DATA.BOT_PREFIX}userinfo** -> will show the author's general information.",
+    usage="| **{prefix}userinfo @<mentioned_member> / <name>** -> will show the mentioned (or named, a partial name works if only one member matches it) member's general information.\n| **{prefix}userinfo** -> will show the author's general information.",
 )
-async def userinfo(ctx, member: discord.Member = None):
+async def userinfo(ctx, member: MemberQuery = None):
     """
     This command will optionally receive an member object and will return an embedded message containing all the info about the member.
     If the member object is None then the command will return the author's information instead.
@@ -559,56 +689,329 @@ async def userinfo(ctx, member: discord.Member = None):
     await ctx.send(embed=embed)  # Send the embedded message.
 
 
-###########################################################################################################################################################################
-#################################################################| Fun and Useful Commands |###############################################################################
-###########################################################################################################################################################################
+@userinfo.error
+async def userinfo_error(ctx, error):
+    if isinstance(error, BadArgument):  # Unknown or ambiguous member name.
+        await ctx.send(f"Error! {error}")
+
+
 @BOT.command(
-    name="coinflip",
-    aliases=["flip", "coin"],
-    brief="Returns heads/tails.",
-    description="This command simulates a coinflip by choosing randomly heads or tails.",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}coinflip** -> will print out a random response which would be either 'heads' or 'tails'.",
+    name="setprefix",
+    aliases=["prefix"],
+    brief="Changes the bot's prefix in this server.",
+    description="Changes the command prefix the bot answers to in this server, the change applies right away. With no prefix the default prefix is restored.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}setprefix <new prefix>** -> the bot will answer to the new prefix in this server.\n| **{prefix}setprefix** -> restores the default prefix.",
+    pass_context=True,
 )
-async def coinflip(ctx):
+@commands.has_permissions(administrator=True)
+async def setprefix(ctx, new_prefix: str = None):
     """
-    This command returns a random response (head / tails) to simulate a coin toss.
+    This command sets the current server's command prefix (saved to disk, no restart needed).
     @param ctx (discord.ext.commands.Context): the command context object.
+    @param new_prefix (str, optional): the new prefix, None restores the default prefix.
     """
-    await ctx.send(
-        ctx.message.author.mention + " " + random.choice(["🧿Heads", "🧿Tails"])
-    )  # Return the random response.
+    try:
+        PREFIXES.set(ctx.guild, new_prefix)
+    except ValueError as e:
+        await ctx.send(f"Error! {e}")
+        return
+    await ctx.send(f"The prefix of this server is now `{PREFIXES.get(ctx.guild)}`")
+
+
+@setprefix.error
+async def setprefix_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help setprefix' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
 
 
 @BOT.command(
-    name="RandInt",
-    aliases=["RandI", "RInt", "RI"],
-    brief="Returns a random integer in a given range.",
-    description="Returns a random integer in a given range. The range is between (bottom limit) up to (top limit).",
-    usage=f"| **{BOT_DATA.BOT_PREFIX}RandInt <bottom limit> <top limit>** -> will return a random number between bottom limit and top limit (top limit is in range).",
+    name="stats",
+    brief="Shows the bot's command metrics.",
+    description="Shows invocation counts, error counts and latencies of the bot's commands, the gateway latency and the guild count.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}stats** -> will print an embed with the bot's metrics.",
+    pass_context=True,
 )
-async def RandInt(ctx, bottom: int, top: int):
+@commands.has_permissions(administrator=True)
+async def stats(ctx):
     """
-    This command will return a random integer in the range of (bottom ; top + 1).
+    This command sends an embed with the bot's metrics, the busiest commands are shown first.
     @param ctx (discord.ext.commands.Context): the command context object.
-    @param bottom (int): bottom range limit.
-    @param top (int): top range limit.
     """
-    if bottom < top:  # Check if input is valid (top > bottom)
-        try:
-            await ctx.send(
-                "Random integer between {} and {}: {}".format(
-                    bottom, top, random.randint(bottom, top)
-                )  # Return random integer.
-            )
-        except:
+    snapshot = METRICS.snapshot()
+    embed = discord.Embed(title="Bot Metrics", color=discord.Color.blue())
+    embed.add_field(name="📶 Gateway Latency", value=f"{BOT.latency * 1000:.0f}ms")
+    embed.add_field(name="🏰 Guilds", value=str(ALL_GUILD_STATS.guild_count))
+    embed.add_field(name="🧍 Member Cache Hits", value=f"{MEMBER_RESOLVER.hit_rate * 100:.0f}%")
+    embed.add_field(name="⏲ Active Timers", value=f"{len(TIMERS)} ({TIMERS.expired} expired, {TIMERS.retried} retried, {TIMERS.failed} failed)")
+    received = max(DISPATCHER.received, 1)
+    embed.add_field(
+        name="📨 Messages",
+        value=f"{DISPATCHER.received} received\n{DISPATCHER.rejected / received * 100:.1f}% rejected early, {DISPATCHER.dispatched / received * 100:.1f}% commands",
+    )
+    embed.add_field(
+        name="📤 Replies",
+        value=f"{OUTBOX.sent} messages sent\n{OUTBOX.merged} replies merged, {OUTBOX.dropped} dropped, {OUTBOX.pending} waiting",
+    )
+    busiest = sorted(
+        snapshot["commands"].items(), key=lambda item: -item[1]["invocations"]
+    )[:20]  # Stay below the 25 fields embed limit.
+    for name, data in busiest:
+        embed.add_field(
+            name=name,
+            value=f"{data['invocations']} runs, {data['errors']} errors\navg {data['handler_avg_ms']}ms (REST {data['rest_avg_ms']}ms)\np99 ≤ {data['handler_p99_ms']}ms",
+        )
+    embed.set_footer(text="Bot Metrics")
+    await ctx.send(embed=embed)
+
+
+@stats.error
+async def stats_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help stats' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@BOT.command(
+    name="memory",
+    brief="Shows the bot's memory usage.",
+    description="Shows the process memory, the memory profile and the cached objects of the guilds that use the most memory.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}memory** -> will print an embed with the bot's memory usage.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def memory(ctx):
+    """
+    This command sends an embed with the process memory and the cached objects of the biggest guilds.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    usage = MemoryProfile.guild_usage(BOT)
+    embed = discord.Embed(title="Memory Usage", color=discord.Color.blue())
+    embed.add_field(name="💾 Process Memory", value=f"{MemoryProfile.process_memory() / 2 ** 20:.1f} MB")
+    embed.add_field(name="⚙ Profile", value=BOT_DATA.MEMORY_PROFILE)
+    embed.add_field(name="🏰 Guilds", value=str(len(usage)))
+    embed.add_field(name="🧍 Cached Members", value=str(sum(item["members"] for item in usage)))
+    embed.add_field(name="💬 Cached Messages", value=str(len(BOT.cached_messages)))
+    embed.add_field(name="🔎 Fetched Members", value=str(len(MEMBER_RESOLVER.fetched)))
+    embed.add_field(name="🗂 Indexed Messages", value=f"{MESSAGE_INDEX.size} in {len(MESSAGE_INDEX.channels)} channels")
+    embed.add_field(name="🔤 Indexed Names", value=f"{MEMBER_SEARCH.size} in {len(MEMBER_SEARCH.guilds)} guilds")
+    for item in usage[:15]:  # Stay below the 25 fields embed limit.
+        embed.add_field(
+            name=item["guild"][:256],
+            value=f"{item['members']} members, {item['channels']} channels\n{item['roles']} roles, {item['messages']} messages",
+        )
+    embed.set_footer(text="Memory Usage")
+    await ctx.send(embed=embed)
+
+
+@memory.error
+async def memory_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help memory' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@BOT.command(
+    name="lag",
+    brief="Shows the event loop lag and what blocked it.",
+    description="Shows the event loop's lag, the event loop implementation and the commands, listeners and tasks that blocked the event loop the longest, with the stack of the latest stall.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}lag** -> will print an embed with the event loop lag and the worst offenders.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def lag(ctx):
+    """
+    This command sends an embed with the event loop lag and the stalls the watchdog caught.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    """
+    embed = discord.Embed(title="Event Loop Lag", color=discord.Color.blue())
+    embed.add_field(name="🔁 Event Loop", value=type(BOT.loop).__module__)
+    embed.add_field(name="⏱ Current", value=f"{WATCHDOG.last_lag * 1000:.1f}ms")
+    embed.add_field(name="📊 Average", value=f"{WATCHDOG.lag.average * 1000:.1f}ms")
+    embed.add_field(name="📈 p99", value=f"≤ {WATCHDOG.lag.quantile(0.99) * 1000:.0f}ms")
+    embed.add_field(name="⛔ Worst", value=f"{WATCHDOG.worst_lag * 1000:.0f}ms")
+    embed.add_field(name="🐢 Stalls", value=str(sum(offender[0] for offender in WATCHDOG.offenders.values())))
+    for label, count, total, worst in WATCHDOG.top_offenders(15):  # Stay below the 25 fields embed limit.
+        embed.add_field(name=label[:256], value=f"{count} stalls, {total * 1000:.0f}ms total\nworst {worst * 1000:.0f}ms")
+    if len(WATCHDOG.stalls) > 0:
+        latest = WATCHDOG.stalls[-1]
+        embed.add_field(
+            name=f"Latest Stall ({latest['label']}, {latest['duration'] * 1000:.0f}ms)"[:256],
+            value=f"```{latest['stack'][-1000:]}```",
+            inline=False,
+        )
+    embed.set_footer(text="Event Loop Lag")
+    await ctx.send(embed=embed)
+
+
+@lag.error
+async def lag_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help lag' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+@BOT.command(
+    name="profile",
+    brief="Profiles a command (or every command) for a while.",
+    description="Profiles the invocations of a command (or of every command) for the given amount of seconds, with cProfile for the CPU time and tracemalloc for the allocations. The dumps are written to the bot's profiles folder, labeled with the guild and the command. An optional sample rate profiles only part of the invocations.\n**Important** - user must have the ***administrator*** permission.",
+    usage="| **{prefix}profile <command name> <seconds> [sample rate]** -> will profile the command's invocations for the given amount of seconds.\n| **{prefix}profile all <seconds> [sample rate]** -> will profile every command.\n| **{prefix}profile off** -> will stop profiling.\n| **{prefix}profile** -> will show what is being profiled.",
+    pass_context=True,
+)
+@commands.has_permissions(administrator=True)
+async def profile(ctx, target: str = None, seconds: float = 60.0, rate: float = 1.0):
+    """
+    This command turns command profiling on or off.
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param target (str, optional): the command to profile, "all" or "off". Defaults to None (shows the profiling status).
+    @param seconds (float, optional): length of the profiling window. Defaults to 60.
+    @param rate (float, optional): fraction of the invocations profiled. Defaults to 1 (every invocation).
+    """
+    if target is None:
+        if PROFILER.remaining > 0:
             await ctx.send(
-                "Invalid Parameters! check out {}help!".format(BOT_DATA.BOT_PREFIX)
+                f"🔬 Profiling **{PROFILER.target}** for another {PROFILER.remaining:.0f} seconds ({PROFILER.rate * 100:g}% of the invocations, {PROFILER.dumps} dumps so far)."
             )
+        else:
+            await ctx.send("🔬 Profiling is off.")
+        return
+    if target.lower() == "off":
+        PROFILER.stop()
+        await ctx.send(f"🔬 Profiling stopped, {PROFILER.dumps} dumps were written.")
+        return
+    if target.lower() == "all":
+        target = "all"
     else:
+        command = COMMAND_REGISTRY.get_command(BOT, target.lower())
+        if command is None:
+            await ctx.send(f"There is no command called {target}!")
+            return
+        target = command.qualified_name
+    if seconds <= 0 or seconds > 3600:
+        await ctx.send("The profiling window must be between 1 second and 1 hour!")
+        return
+    try:
+        PROFILER.start(target, seconds, rate)
+    except ValueError as e:
+        await ctx.send(f"{e}")
+        return
+    await ctx.send(f"🔬 Profiling **{target}** for {seconds:g} seconds ({rate * 100:g}% of the invocations).")
+
+
+@profile.error
+async def profile_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
+        await ctx.send(
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help profile' to see more information."
+        )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+def refresh_commands():
+    """
+    Rebuilds the command lookup tables after the command modules were reloaded (the reloaded commands are new objects).
+    """
+    COMMAND_REGISTRY.build(BOT)
+    DISPATCHER.build(BOT)
+    WATCHDOG.watch_bot(BOT)
+
+
+@BOT.command(
+    name="reload",
+    brief="Reloads the command modules without restarting the bot.",
+    description="Reloads the moderation and fun command modules in place, the gateway connection, the caches and the indexes are kept. A module that fails to load keeps running its previous version.\n**Important** - user must be the ***bot owner***.",
+    usage="| **{prefix}reload** -> will reload every command module.\n| **{prefix}reload <module>** -> will reload one command module (moderation / fun).",
+    pass_context=True,
+)
+@commands.is_owner()
+async def reload(ctx, module: str = None):
+    """
+    This command reloads the command extensions, each one atomically (discord.py restores the old version if the new one fails).
+    @param ctx (discord.ext.commands.Context): the command context object.
+    @param module (str, optional): the module to reload. Defaults to None (every module).
+    """
+    names = list(EXTENSIONS) if module is None else [module.lower()]
+    if names[0] not in EXTENSIONS:
+        await ctx.send(f"There is no command module called {module}! (modules: {', '.join(EXTENSIONS)})")
+        return
+    results = []
+    for name in names:
+        try:
+            BOT.reload_extension(EXTENSIONS[name])
+            results.append(f"✅ **{name}** reloaded")
+        except commands.ExtensionError as e:
+            original = getattr(e, "original", e)
+            results.append(f"❌ **{name}** failed, the previous version is kept: {type(original).__name__}: {original}")
+            LOG.error("reloading %s failed", name, extra=command_log_context(ctx), exc_info=original)
+    refresh_commands()
+    await ctx.send("\n".join(results))
+
+
+@reload.error
+async def reload_error(ctx, error):
+    if isinstance(
+        error, commands.CheckFailure
+    ):  # Check if the error was caused by missing permissions error.
         await ctx.send(
-            "Can not randomize a number with a min limit higher than the max limit!"
+            f"{ctx.message.author.mention} you are missing the required permissions to use this command!\nplease use '{ctx.prefix}help reload' to see more information."
         )
+    else:
+        await ctx.send(f"Error! {error}")
+
+
+#? Load the command modules, they reach the bot's state through `BOT.core` so reloading them keeps it.
+BOT.core = sys.modules[__name__]
+for extension in EXTENSIONS.values():
+    BOT.load_extension(extension)
 
 
-#! Finally, Run the Bot!
-BOT.run(BOT_DATA.TOKEN)
\ No newline at end of file
+def open_state():
+    """
+    This function opens the storage database (off the event loop) and loads the saved state, it runs before the bot connects.
+    The old json friend list is imported on first start.
+    """
+    BOT.loop.run_until_complete(STORAGE.open())
+    STORAGE.import_json("friends", BOT_DATA.read_json(BOT_DATA.FRIEND_LIST_FILE))
+    PREFIXES.load()
+    TIMERS.load(accept=owns_guild)  #? Only this process's shards (overdue timers run once the bot is ready).
+
+
+def close_state():
+    """
+    This function commits the remaining queued writes and closes the storage database, it runs after the bot stopped.
+    """
+    STORAGE.close()
+
+
+if __name__ == "__main__":  #? Importing the module (e.g. the benchmarks or BotHost.py) only sets the bot up.
+    open_state()
+
+    #! Finally, Run the Bot!
+    try:
+        BOT.run(BOT_DATA.TOKEN)
+    finally:
+        close_state()
+        LOG_WRITER.stop()  #? Write the remaining queued logs.
\ No newline at end of file
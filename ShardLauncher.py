@@ -0,0 +1,109 @@
+#? SeniorBot shard launcher: spreads the bot's shards across several worker processes (one AutoShardedBot each).
+#? Run it instead of SeniorBot.py: python ShardLauncher.py
+
+from discord.http import HTTPClient, Route
+import subprocess
+import asyncio
+import time
+import sys
+import os
+
+from ShardState import IDENTIFY_INTERVAL
+import BotData
+
+THIS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+BOT_FILE_PATH = os.path.join(THIS_FOLDER, "SeniorBot.py")
+RESTART_DELAY = 10  #? Seconds to wait before restarting a worker that died.
+
+
+async def fetch_gateway_limits(token: str) -> dict:
+    """[summary]
+    Asks discord for the recommended shard count and the bot's identify concurrency.
+    Args:
+        token (str): the bot token.
+    Returns:
+        dict: the /gateway/bot response (shards, session_start_limit, ...).
+    """
+    http = HTTPClient()
+    try:
+        await http.static_login(token, bot=True)
+        return await http.request(Route("GET", "/gateway/bot"))
+    finally:
+        await http.close()
+
+
+def split_shards(shard_count: int, processes: int) -> list:
+    """[summary]
+    Splits the shard ids into contiguous ranges, one per worker process.
+    """
+    processes = max(min(processes, shard_count), 1)
+    size, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for worker in range(processes):
+        end = start + size + (1 if worker < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def start_worker(config_path: str, worker_id: int, shard_ids: list, shard_count: int, concurrency: int, epoch: float):
+    env = dict(os.environ)
+    env.update(
+        {
+            "SENIORBOT_CONFIG": config_path,
+            "SENIORBOT_WORKER_ID": str(worker_id),
+            "SENIORBOT_SHARD_IDS": ",".join(str(shard_id) for shard_id in shard_ids),
+            "SENIORBOT_SHARD_COUNT": str(shard_count),
+            "SENIORBOT_IDENTIFY_CONCURRENCY": str(concurrency),
+            "SENIORBOT_LAUNCH_EPOCH": str(epoch),
+        }
+    )
+    print(f"Starting worker {worker_id} with shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count}")
+    return subprocess.Popen([sys.executable, BOT_FILE_PATH], cwd=THIS_FOLDER, env=env)
+
+
+def main():
+    config_path = os.environ.get("SENIORBOT_CONFIG", os.path.join(THIS_FOLDER, "botconfig.cfg"))
+    bot_data = BotData.BotData()
+    try:
+        bot_data.read_config_data(config_path)
+    except Exception as e:
+        print(f"{e}")
+        exit()
+
+    shard_count = bot_data.SHARD_COUNT
+    concurrency = bot_data.IDENTIFY_CONCURRENCY
+    if shard_count == 0 or concurrency == 0:  # Ask discord for whatever was not configured.
+        limits = asyncio.get_event_loop().run_until_complete(fetch_gateway_limits(bot_data.TOKEN))
+        shard_count = shard_count or limits["shards"]
+        concurrency = concurrency or limits["session_start_limit"].get("max_concurrency", 1)
+
+    ranges = split_shards(shard_count, bot_data.SHARD_PROCESSES)
+    epoch = time.time()  # Every worker schedules its identifies relative to this moment.
+    workers = [
+        start_worker(config_path, worker_id, shard_ids, shard_count, concurrency, epoch)
+        for worker_id, shard_ids in enumerate(ranges)
+    ]
+
+    try:
+        while True:
+            time.sleep(RESTART_DELAY)
+            for worker_id, worker in enumerate(workers):
+                if worker.poll() is not None:  # Worker died, restart it (it identifies right away).
+                    print(f"Worker {worker_id} exited with code {worker.returncode}, restarting...")
+                    # Shift the epoch so the restarted worker's first shard may identify right away.
+                    restart_epoch = time.time() - (ranges[worker_id][0] // concurrency) * IDENTIFY_INTERVAL
+                    workers[worker_id] = start_worker(
+                        config_path, worker_id, ranges[worker_id], shard_count, concurrency, restart_epoch
+                    )
+    except KeyboardInterrupt:
+        print("Stopping workers...")
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+
+if __name__ == "__main__":
+    main()
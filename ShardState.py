@@ -0,0 +1,79 @@
+from GuildStats import GuildStats
+import asyncio
+import json
+import time
+import os
+
+IDENTIFY_INTERVAL = 5.5  #? Seconds between identifies of the same concurrency bucket (discord allows one per 5 seconds).
+
+
+class ClusterStats:
+    def __init__(self, local: GuildStats, state_dir: str, worker_id: int, stale_after: float = 120.0):
+        """[summary]
+        Shares guild statistics between the shard worker processes through small json files in a common folder.
+        Every worker publishes its own statistics and reads everyone else's, so each one can answer for the whole bot.
+        Args:
+            local (GuildStats): this worker's guild statistics.
+            state_dir (str): the folder shared by all the workers.
+            worker_id (int): this worker's number.
+            stale_after (float): seconds after which a worker that stopped publishing is ignored.
+        """
+        self.local = local
+        self.state_dir = state_dir
+        self.worker_id = worker_id
+        self.stale_after = stale_after
+        self.merged = None  #? GuildStats of the whole cluster (None until the first refresh).
+        self.workers = 0  #? Amount of live workers found in the last refresh.
+
+    @property
+    def view(self) -> GuildStats:
+        return self.merged if self.merged is not None else self.local
+
+    @property
+    def guild_count(self) -> int:
+        return self.view.guild_count
+
+    @property
+    def member_count(self) -> int:
+        return self.view.member_count
+
+    def page_count(self) -> int:
+        return self.view.page_count()
+
+    def guild_page(self, page: int) -> str:
+        return self.view.guild_page(page)
+
+    def sync_files(self, exported: dict) -> list:
+        """[summary]
+        Writes this worker's file and reads every live worker's file (blocking, runs in an executor).
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = os.path.join(self.state_dir, f"worker-{self.worker_id}.json")
+        with open(path + ".tmp", "w") as writer:
+            json.dump({"updated": time.time(), "guilds": exported}, writer)
+        os.replace(path + ".tmp", path)  # Readers never see a half written file.
+
+        exports = []
+        for name in os.listdir(self.state_dir):
+            if not (name.startswith("worker-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.state_dir, name), "r") as reader:
+                    data = json.load(reader)
+            except (OSError, ValueError):  # Removed or being replaced right now.
+                continue
+            if time.time() - data.get("updated", 0) <= self.stale_after:
+                exports.append(data["guilds"])
+        return exports
+
+    async def refresh(self):
+        """[summary]
+        Publishes this worker's statistics and reloads the cluster wide ones without blocking the event loop.
+        """
+        exports = await asyncio.get_event_loop().run_in_executor(
+            None, self.sync_files, self.local.export()
+        )
+        merged = GuildStats()
+        merged.merge(exports)
+        self.merged = merged
+        self.workers = len(exports)
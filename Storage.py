@@ -0,0 +1,151 @@
+import threading
+import logging
+import asyncio
+import sqlite3
+import queue
+import json
+import time
+
+LOG = logging.getLogger("seniorbot.storage")
+_STOP = object()  #? Tells the writer thread to finish the queue and exit.
+
+
+class Storage:
+    def __init__(self, path: str, batch_size: int = 500):
+        """[summary]
+        Creates a key-value store backed by SQLite in WAL mode.
+        All the data is kept in memory, so reads never touch the disk. Writes update memory right away and are
+        queued to a background writer thread that commits them in batches (one transaction per batch).
+        Args:
+            path (str): path to the database file.
+            batch_size (int): the maximum amount of queued writes committed in one transaction.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.data = {}  #? namespace -> {key: value}
+        self.queue = queue.Queue()  #? Pending writes: ("set", namespace, key, json) / ("delete", namespace, key, None) / threading.Event
+        self.connection = None
+        self.writer = None
+        self.written = 0  #? Amount of writes committed to disk.
+
+    def open_sync(self):
+        """[summary]
+        Opens (or creates) the database and loads it into memory (blocking, `open` runs it in an executor).
+        """
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")  # Every committed batch survives a crash or power loss.
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS kv (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self.connection.commit()
+        for namespace, key, value in self.connection.execute("SELECT namespace, key, value FROM kv"):
+            self.data.setdefault(namespace, {})[key] = json.loads(value)
+        self.writer = threading.Thread(target=self.write_loop, name="storage-writer", daemon=True)
+        self.writer.start()
+
+    async def open(self):
+        """[summary]
+        Opens the database without blocking the event loop.
+        """
+        await asyncio.get_event_loop().run_in_executor(None, self.open_sync)
+
+    def get(self, namespace: str, key: str, default=None):
+        return self.data.get(namespace, {}).get(key, default)
+
+    def items(self, namespace: str) -> dict:
+        """[summary]
+        Returns a copy of all the keys and values of a namespace.
+        """
+        return dict(self.data.get(namespace, {}))
+
+    def set(self, namespace: str, key: str, value):
+        """[summary]
+        Stores a json serializable value, the write reaches the disk shortly after (see `flush`).
+        """
+        self.data.setdefault(namespace, {})[key] = value
+        self.queue.put(("set", namespace, key, json.dumps(value)))
+
+    def delete(self, namespace: str, key: str):
+        values = self.data.get(namespace, {})
+        if key in values:
+            del values[key]
+            self.queue.put(("delete", namespace, key, None))
+
+    def import_json(self, namespace: str, values: dict) -> int:
+        """[summary]
+        Imports a dict into an empty namespace (used once to move the old json files into the database).
+        Returns:
+            int: the amount of imported keys (0 if the namespace already had data).
+        """
+        if len(self.data.get(namespace, {})) > 0:
+            return 0
+        for key, value in values.items():
+            self.set(namespace, str(key), value)
+        return len(values)
+
+    def write_loop(self):
+        """[summary]
+        The writer thread: waits for writes and commits everything queued so far in a single transaction.
+        """
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            while True:
+                try:
+                    stop = self.commit(batch)
+                    break
+                except sqlite3.Error as e:  # Disk full / locked, keep the batch and try again.
+                    LOG.error("storage write failed (%s), retrying", e)
+                    time.sleep(1)
+            if stop:
+                return
+
+    def commit(self, batch: list) -> bool:
+        """[summary]
+        Commits a batch of queued writes in a single transaction and wakes up whoever waits for them.
+        Returns:
+            bool: True if the batch asked the writer to stop.
+        """
+        stop = False
+        flushed = []
+        with self.connection:  # One transaction for the whole batch.
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flushed.append(item)
+                elif item[0] == "set":
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO kv (namespace, key, value) VALUES (?, ?, ?)", item[1:]
+                    )
+                elif item[0] == "delete":
+                    self.connection.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", item[1:3])
+        self.written += sum(1 for item in batch if isinstance(item, tuple))
+        for event in flushed:
+            event.set()
+        return stop
+
+    async def flush(self):
+        """[summary]
+        Waits (without blocking the event loop) until every write queued so far is committed.
+        """
+        done = threading.Event()
+        self.queue.put(done)
+        await asyncio.get_event_loop().run_in_executor(None, done.wait)
+
+    def close(self):
+        """[summary]
+        Commits the remaining writes and closes the database (blocking, used on shutdown after the event loop stopped).
+        """
+        if self.writer is None:
+            return
+        self.queue.put(_STOP)
+        self.writer.join()
+        self.writer = None
+        self.connection.close()
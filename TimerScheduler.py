@@ -0,0 +1,198 @@
+import logging
+import asyncio
+import discord
+import heapq
+import time
+
+LOG = logging.getLogger("seniorbot.timers")
+
+
+class TimerDropped(Exception):
+    """[summary]
+    Raised by a timer's handler when its action can never run (e.g. the bot left the guild), the timer is not retried.
+    """
+
+
+PERMANENT_ERRORS = (TimerDropped, discord.NotFound)  #? Failures retrying can't fix (e.g. Unknown Ban, Unknown Member).
+
+
+class TimerScheduler:
+    MAX_SLEEP = 3600.0  #? Wake up at least hourly, so a changed system clock can't delay expiries for long.
+
+    def __init__(self, storage, action_scheduler, batch_size: int = 50, batch_delay: float = 1.0, max_attempts: int = 8, retry_delay: float = 60.0):
+        """[summary]
+        Creates a scheduler for timed moderation actions (e.g. lifting a temporary ban) that survives restarts.
+        The timers are kept in a heap ordered by expiry, a single task sleeps until the earliest one and every timer
+        is written through to the storage (namespace "timers"). Due timers run in batches through the action scheduler.
+        Args:
+            storage (Storage.Storage): the bot's storage.
+            action_scheduler (ActionScheduler.ActionScheduler): runs every batch of expired timers.
+            batch_size (int): the maximum amount of expired timers run at once.
+            batch_delay (float): seconds to wait between batches (when many timers are overdue after a restart).
+            max_attempts (int): the amount of times a timer runs before a temporary failure (e.g. a discord 5xx or a lost
+                connection) drops it.
+            retry_delay (float): seconds before a temporarily failed timer runs again (doubled on every attempt, up to
+                MAX_SLEEP).
+        """
+        self.storage = storage
+        self.action_scheduler = action_scheduler
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.handlers = {}  #? action name -> coroutine function awaited with (guild id, user id).
+        self.heap = []  #? (expiry timestamp, timer key), entries of cancelled / rescheduled timers are skipped lazily.
+        self.timers = {}  #? timer key -> {"action", "guild", "user", "expires", "attempts"}
+        self.errors = {}  #? due timer -> the exception its last run raised.
+        self.wake = None  #? Set when a sooner timer is scheduled, created by `run` on the bot's event loop.
+        self.expired = 0  #? Amount of timers whose action ran.
+        self.retried = 0  #? Amount of times a timer was scheduled again after a temporary failure.
+        self.failed = 0  #? Amount of timers dropped after a permanent failure (or too many attempts).
+
+    @staticmethod
+    def key(action: str, guild_id: int, user_id: int) -> str:
+        return f"{action}:{guild_id}:{user_id}"
+
+    def register(self, action: str, handler):
+        """[summary]
+        Sets the coroutine function that runs when a timer of `action` expires.
+        """
+        self.handlers[action] = handler
+
+    def load(self, accept=None):
+        """[summary]
+        Loads the saved timers from the storage (call after the storage was opened), overdue ones run right away.
+        Args:
+            accept (callable, optional): receives a guild id and returns False for timers another process handles.
+        """
+        self.timers = {
+            key: timer
+            for key, timer in self.storage.items("timers").items()
+            if accept is None or accept(timer["guild"])
+        }
+        self.heap = [(timer["expires"], key) for key, timer in self.timers.items()]
+        heapq.heapify(self.heap)
+        self.wakeup()
+
+    def schedule(self, action: str, guild_id: int, user_id: int, expires: float, attempts: int = 0):
+        """[summary]
+        Adds a timer (or moves the user's existing timer of the same action).
+        Args:
+            action (str): the registered action to run.
+            guild_id (int): the guild the action runs in.
+            user_id (int): the user the action runs on.
+            expires (float): unix timestamp the action runs at.
+            attempts (int): the amount of times the action already failed temporarily.
+        """
+        key = self.key(action, guild_id, user_id)
+        timer = {"action": action, "guild": guild_id, "user": user_id, "expires": expires, "attempts": attempts}
+        self.timers[key] = timer
+        self.storage.set("timers", key, timer)
+        heapq.heappush(self.heap, (expires, key))
+        if self.heap[0][1] == key:  # The new timer is the earliest one, the sleeping task must wake up sooner.
+            self.wakeup()
+
+    def wakeup(self):
+        if self.wake is not None:  # Before `run` started it checks the heap anyway.
+            self.wake.set()
+
+    def cancel(self, action: str, guild_id: int, user_id: int) -> bool:
+        """[summary]
+        Removes a timer (e.g. the user was unbanned by hand), its heap entry is skipped once it comes up.
+        Returns:
+            bool: True if there was such a timer.
+        """
+        key = self.key(action, guild_id, user_id)
+        if self.timers.pop(key, None) is None:
+            return False
+        self.storage.delete("timers", key)
+        return True
+
+    def get(self, action: str, guild_id: int, user_id: int):
+        return self.timers.get(self.key(action, guild_id, user_id))
+
+    def __len__(self):
+        return len(self.timers)
+
+    def pop_due(self, now: float) -> list:
+        """[summary]
+        Removes up to `batch_size` expired timers.
+        Returns:
+            list: (action, guild id, user id, attempts) of every expired timer.
+        """
+        due = []
+        while len(self.heap) > 0 and self.heap[0][0] <= now and len(due) < self.batch_size:
+            expires, key = heapq.heappop(self.heap)
+            timer = self.timers.get(key)
+            if timer is None or timer["expires"] != expires:  # Cancelled or rescheduled.
+                continue
+            del self.timers[key]
+            due.append((timer["action"], timer["guild"], timer["user"], timer.get("attempts", 0)))
+        if len(self.heap) > 2 * len(self.timers) + 64:  # Mostly stale entries, rebuild the heap.
+            self.heap = [(timer["expires"], key) for key, timer in self.timers.items()]
+            heapq.heapify(self.heap)
+        return due
+
+    async def run_timer(self, timer: tuple):
+        action, guild_id, user_id, _ = timer
+        try:
+            await self.handlers[action](guild_id, user_id)
+        except Exception as e:
+            self.errors[timer] = e  # The action scheduler only keeps the message, the retry needs the type.
+            raise
+        self.errors.pop(timer, None)  # Succeeded on a rate limit retry.
+
+    def retry(self, timer: tuple, error: str) -> bool:
+        """[summary]
+        Schedules a failed timer again with backoff, unless the failure is permanent or it ran out of attempts.
+        Returns:
+            bool: True if the timer will run again.
+        """
+        action, guild_id, user_id, attempts = timer
+        attempts += 1
+        exception = self.errors.pop(timer, None)
+        extra = {"guild": guild_id, "user": user_id}
+        if isinstance(exception, PERMANENT_ERRORS) or attempts >= self.max_attempts:
+            LOG.warning("timed %s of %s in %s failed, dropping it: %s", action, user_id, guild_id, error, extra=extra)
+            return False
+        if self.key(action, guild_id, user_id) not in self.timers:  # Not scheduled again while it ran.
+            delay = min(self.retry_delay * 2 ** (attempts - 1), self.MAX_SLEEP)
+            self.schedule(action, guild_id, user_id, time.time() + delay, attempts)
+            LOG.warning(
+                "timed %s of %s in %s failed (attempt %d), retrying in %.0fs: %s",
+                action, user_id, guild_id, attempts, delay, error, extra=extra,
+            )
+        return True
+
+    async def run(self):
+        """[summary]
+        The timer task: sleeps until the earliest timer expires (or a sooner one is scheduled) and runs the due timers.
+        """
+        if self.wake is None:  # Created here and not at import, Python < 3.10 binds an Event to the loop of its creation.
+            self.wake = asyncio.Event()
+        while True:
+            self.wake.clear()
+            due = self.pop_due(time.time())
+            if len(due) > 0:
+                result = await self.action_scheduler.run(due, self.run_timer)
+                for action, guild_id, user_id, _ in due:
+                    key = self.key(action, guild_id, user_id)
+                    if key not in self.timers:  # Not scheduled again while it ran.
+                        self.storage.delete("timers", key)
+                for timer, error in result.failed.items():
+                    if self.retry(timer, error):
+                        self.retried += 1
+                    else:
+                        self.failed += 1
+                self.expired += len(result.succeeded)
+                if len(self.heap) > 0 and self.heap[0][0] <= time.time():  # Still overdue timers, pace the batches.
+                    await asyncio.sleep(self.batch_delay)
+                continue
+
+            timeout = self.MAX_SLEEP
+            if len(self.heap) > 0:
+                timeout = min(timeout, max(0.0, self.heap[0][0] - time.time()))
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
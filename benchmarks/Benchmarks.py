@@ -0,0 +1,497 @@
+#? SeniorBot benchmarks: runs the command handlers against in memory fake discord objects at scale.
+#? Run: python benchmarks/Benchmarks.py [--only name ...] [--save-baseline] [--tolerance 0.3]
+#? Reports ops/sec, simulated REST calls per op and peak allocations per op, and exits with 1 if a handler makes more
+#? REST calls than benchmarks/rest_calls.json expects (the fakes make them machine independent, so the file is
+#? committed) or if a result regressed against benchmarks/baseline.json (save one on the machine that runs them).
+
+import configparser
+import tracemalloc
+import itertools
+import datetime
+import argparse
+import tempfile
+import asyncio
+import json
+import random
+import time
+import sys
+import os
+
+from FakeDiscord import (
+    REST_CALLS,
+    FakeBanEntry,
+    FakeChannel,
+    FakeContext,
+    FakeGuild,
+    FakeMember,
+    FakeMessage,
+    FakeRole,
+    FakeUser,
+)
+from discord.ext import commands
+import discord
+
+THIS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+REPO_FOLDER = os.path.dirname(THIS_FOLDER)
+BASELINE_FILE = os.path.join(THIS_FOLDER, "baseline.json")  #? ops/sec and peak allocations, machine specific.
+REST_CALLS_FILE = os.path.join(THIS_FOLDER, "rest_calls.json")  #? Expected REST calls per op, the same on every machine.
+ALLOCATION_RUNS = 20  #? Ops measured with tracemalloc on (it slows them down, so they are not timed).
+
+#? Input sizes.
+BAN_COUNT = 100_000
+HISTORY_LENGTH = 50_000
+GUILD_COUNT = 5_000
+ROLE_COUNT = 250
+SEARCH_MEMBER_COUNT = 100_000
+SYLLABLES = [consonant + vowel for consonant in "bcdfghjklmnprstvwxz" for vowel in "aeiouy"] + ["an", "el", "is", "or", "un"]
+
+
+def load_bot():
+    """[summary]
+    Imports SeniorBot with a throwaway config (no token is used, the bot never connects).
+    Returns:
+        module: the SeniorBot module.
+    """
+    folder = tempfile.mkdtemp(prefix="seniorbot-benchmarks-")
+    config = configparser.ConfigParser()
+    config["data"] = {"prefix": "!", "token": "benchmark"}
+    config["gateway"] = {"resume": "false"}
+    config["storage"] = {"path": "benchmarks.db"}
+    config["logging"] = {"level": "ERROR", "file": "", "console": "false"}
+    config_path = os.path.join(folder, "botconfig.cfg")
+    with open(config_path, "w") as writer:
+        config.write(writer)
+    os.environ["SENIORBOT_CONFIG"] = config_path
+    sys.path.insert(0, REPO_FOLDER)
+    os.chdir(REPO_FOLDER)  # SeniorBot looks for BotData.py in the working folder.
+    import SeniorBot
+
+    loop = SeniorBot.BOT.loop
+    tasks = asyncio.all_tasks(loop)  # Background tasks (hourly snapshot, lag watchdog) would only add noise.
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    SeniorBot.BOT._connection.user = FakeUser(1, "SeniorBot")
+    SeniorBot.COMMAND_REGISTRY.build(SeniorBot.BOT)
+    return SeniorBot
+
+
+def snowflake(seconds_ago: float) -> int:
+    return discord.utils.time_snowflake(datetime.datetime.utcnow() - datetime.timedelta(seconds=seconds_ago))
+
+
+def make_guild(guild_id: int = 10, members: int = 100) -> tuple:
+    """[summary]
+    Returns:
+        tuple: a guild with `members` members, one of its channels and the member that invokes the commands.
+    """
+    guild = FakeGuild(guild_id, f"guild-{guild_id}", member_count=members)
+    for i in range(members):
+        member = FakeMember(1000 + i, f"member{i}")
+        guild._members[member.id] = member
+    channel = FakeChannel(guild_id * 100, guild)
+    guild.channels.append(channel)
+    return guild, channel, guild._members[1000]
+
+
+def command(bot, name: str):
+    return bot.BOT.get_command(name).callback
+
+
+#? Each setup receives the SeniorBot module and returns (op coroutine function, iterations).
+
+def setup_help(bot):
+    guild, channel, author = make_guild()
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "help")
+    return (lambda: handler(ctx)), 2000
+
+
+def setup_help_command(bot):
+    guild, channel, author = make_guild()
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "help")
+    return (lambda: handler(ctx, "clean")), 5000
+
+
+def setup_history(guild, channel, target, every: int):
+    """[summary]
+    Fills the channel with HISTORY_LENGTH messages (newest first, one every 10 seconds), every `every`th one by the target.
+    """
+    others = guild.members
+    channel.messages = [
+        FakeMessage(
+            snowflake(i * 10),
+            target if i % every == 0 else others[i % len(others)],
+            channel,
+        )
+        for i in range(HISTORY_LENGTH)
+    ]
+
+
+def setup_clean_dense(bot):
+    guild, channel, author = make_guild()
+    target = guild._members[1001]
+    setup_history(guild, channel, target, every=10)
+    ctx = FakeContext(guild, channel, author, mentions=[target])
+    handler = command(bot, "clean")
+    return (lambda: handler(ctx, target, 100)), 50
+
+
+def setup_clean_sparse(bot):
+    guild, channel, author = make_guild()
+    target = guild._members[1001]
+    setup_history(guild, channel, target, every=2500)  # 20 messages, the purge scans its whole depth.
+    ctx = FakeContext(guild, channel, author, mentions=[target])
+    handler = command(bot, "clean")
+    return (lambda: handler(ctx, target, 100)), 20
+
+
+def setup_clean_indexed(bot):
+    guild, channel, author = make_guild()
+    target = guild._members[1001]
+    setup_history(guild, channel, target, every=10)
+    bot.MESSAGE_INDEX.per_channel = bot.MESSAGE_INDEX.max_messages = HISTORY_LENGTH
+    for message in reversed(channel.messages):  # As on_message would have seen them, oldest first.
+        bot.MESSAGE_INDEX.add(message)
+    ctx = FakeContext(guild, channel, author, mentions=[target])
+    handler = command(bot, "clean")
+    return (lambda: handler(ctx, target, 100)), 40  # Every op deletes 100 of the 5000 indexed target messages.
+
+
+def setup_clean_partial_index(bot):
+    guild, channel, author = make_guild()
+    target = guild._members[1001]
+    setup_history(guild, channel, target, every=10)
+    ctx = FakeContext(guild, channel, author, mentions=[target])
+    handler = command(bot, "clean")
+
+    async def op():
+        bot.MESSAGE_INDEX.forget_channel(channel.id)  # Only the newest 400 messages (40 of the target's) are indexed.
+        for message in reversed(channel.messages[:400]):
+            bot.MESSAGE_INDEX.add(message)
+        deleted = channel.deleted
+        await handler(ctx, target, 100)
+        if channel.deleted - deleted != 100:
+            raise RuntimeError(f"clean deleted {channel.deleted - deleted} of 100 messages")
+
+    return op, 50
+
+
+def setup_clean_by_name(bot):
+    guild, channel, author = make_guild()
+    target = guild._members[1001]
+    setup_history(guild, channel, target, every=5)  # Enough indexed target messages for every op to delete 100.
+    bot.MESSAGE_INDEX.per_channel = bot.MESSAGE_INDEX.max_messages = HISTORY_LENGTH
+    for message in reversed(channel.messages):
+        bot.MESSAGE_INDEX.add(message)
+    bot.MEMBER_SEARCH.forget(guild)
+    ctx = FakeContext(guild, channel, author)  # No mentions, the member is given by name.
+    ctx.bot = bot.BOT
+    converter = bot.MemberQuery()
+    handler = command(bot, "clean")
+
+    async def op():
+        deletes = REST_CALLS.get("bulk_delete", 0)
+        member = await converter.convert(ctx, target.name)
+        await handler(ctx, member, 100)
+        if REST_CALLS.get("bulk_delete", 0) == deletes:
+            raise RuntimeError(f"clean {target.name} deleted nothing")
+
+    return op, 40
+
+
+def chatter(guild, channel) -> list:
+    """[summary]
+    Returns the messages of a busy channel: mostly plain chatter, some bot messages and messages that almost look like commands.
+    """
+    bot_user = FakeUser(2, "OtherBot")
+    bot_user.bot = True
+    members = guild.members
+    contents = ["hello there", "lol", "did anyone see the game yesterday?", "!", "brb", "?help", "nice"]
+    messages = []
+    for i in range(1000):
+        author = bot_user if i % 7 == 0 else members[i % len(members)]
+        messages.append(FakeMessage(snowflake(i), author, channel, contents[i % len(contents)]))
+    return messages
+
+
+def setup_dispatch_chatter(bot):
+    guild, channel, _ = make_guild()
+    messages = chatter(guild, channel)
+    ops = itertools.cycle(messages)
+    return (lambda: bot.DISPATCHER.process(bot.BOT, next(ops))), 200000
+
+
+def setup_process_commands_chatter(bot):
+    guild, channel, _ = make_guild()
+    messages = chatter(guild, channel)
+    ops = itertools.cycle(messages)
+    return (lambda: bot.BOT.process_commands(next(ops))), 200000  # discord.py's default, for comparison.
+
+
+def make_named_guild() -> tuple:
+    """[summary]
+    Returns:
+        tuple: a guild with SEARCH_MEMBER_COUNT members with varied names (some with nicknames), a channel and the invoker.
+    """
+    rng = random.Random(42)
+    guild = FakeGuild(11, "big guild", member_count=SEARCH_MEMBER_COUNT)
+    for i in range(SEARCH_MEMBER_COUNT):
+        name = "".join([rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))])
+        if rng.random() < 0.5:
+            name += str(rng.randint(0, 999))
+        member = FakeMember(1000 + i, name)
+        if rng.random() < 0.3:
+            member.nick = "".join([rng.choice(SYLLABLES) for _ in range(3)]).capitalize()
+        guild._members[member.id] = member
+    channel = FakeChannel(1100, guild)
+    guild.channels.append(channel)
+    return guild, channel, guild._members[1000]
+
+
+def setup_member_search(bot, typos: bool = False):
+    guild, channel, author = make_named_guild()
+    bot.MEMBER_SEARCH.forget(guild)
+    ctx = FakeContext(guild, channel, author)
+    ctx.bot = bot.BOT
+    converter = bot.MemberQuery()
+    rng = random.Random(7)
+    queries = []
+    for member in rng.sample(guild.members, 1000):  # Full names, name prefixes and (with typos) a dropped character.
+        name = member.name
+        if typos:
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i + 1:] + "x"
+        queries.append(name if len(queries) % 2 == 0 else name[:max(3, len(name) - 2)])
+    queries = itertools.cycle(queries)
+
+    async def op():
+        try:
+            await converter.convert(ctx, next(queries))
+        except commands.BadArgument:  # Ambiguous or unknown names are part of the workload.
+            pass
+
+    return op, 5000
+
+
+def setup_member_search_typos(bot):
+    return setup_member_search(bot, typos=True)
+
+
+def setup_bans(guild):
+    guild.ban_list = [
+        FakeBanEntry(FakeUser(10 ** 6 + i, f"banned{i % (BAN_COUNT // 2)}", f"{i % 10000:04d}"))  # Every name is shared by 2 users.
+        for i in range(BAN_COUNT)
+    ]
+
+
+def setup_unban(bot):
+    guild, channel, author = make_guild()
+    setup_bans(guild)
+    bot.BAN_INDEX.forget(guild)
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "unban")
+    tags = iter([str(entry.user) for entry in guild.ban_list])
+    return (lambda: handler(ctx, name_of_user=next(tags))), 5000
+
+
+def setup_resyncbans(bot):
+    guild, channel, author = make_guild()
+    setup_bans(guild)
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "resyncbans")
+    return (lambda: handler(ctx)), 5
+
+
+def setup_userinfo(bot):
+    guild, channel, author = make_guild()
+    roles = [FakeRole(5000 + i, i) for i in range(ROLE_COUNT + 1)]  # Position 0 is @everyone.
+    member = FakeMember(999, "roleful", roles)
+    guild._members[member.id] = member
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "userinfo")
+    return (lambda: handler(ctx, member)), 2000
+
+
+def setup_serverinfo(bot):
+    guild, channel, author = make_guild()
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "serverinfo")
+    return (lambda: handler(ctx)), 5000
+
+
+def setup_botinfo(bot, page: int = 1):
+    guilds = [FakeGuild(10 ** 5 + i, f"guild number {i}", member_count=i % 5000) for i in range(GUILD_COUNT)]
+    bot.GUILD_STATS.rebuild(guilds)
+    guild, channel, author = make_guild()
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "botinfo")
+    return (lambda: handler(ctx, page)), 2000
+
+
+def setup_botinfo_last_page(bot):
+    return setup_botinfo(bot, page=10 ** 6)  # Clamped to the last page.
+
+
+def setup_coinflip(bot):
+    guild, channel, author = make_guild()
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "coinflip")
+    return (lambda: handler(ctx)), 20000
+
+
+def setup_randint(bot):
+    guild, channel, author = make_guild()
+    ctx = FakeContext(guild, channel, author)
+    handler = command(bot, "RandInt")
+    return (lambda: handler(ctx, 1, 100)), 20000
+
+
+BENCHMARKS = {
+    "help": setup_help,
+    "help_command": setup_help_command,
+    "clean_dense": setup_clean_dense,
+    "clean_sparse": setup_clean_sparse,
+    "clean_indexed": setup_clean_indexed,
+    "clean_by_name": setup_clean_by_name,
+    "clean_partial_index": setup_clean_partial_index,
+    "unban": setup_unban,
+    "member_search": setup_member_search,
+    "member_search_typos": setup_member_search_typos,
+    "resyncbans": setup_resyncbans,
+    "userinfo": setup_userinfo,
+    "serverinfo": setup_serverinfo,
+    "botinfo": setup_botinfo,
+    "botinfo_last_page": setup_botinfo_last_page,
+    "coinflip": setup_coinflip,
+    "dispatch_chatter": setup_dispatch_chatter,
+    "process_commands_chatter": setup_process_commands_chatter,
+    "RandInt": setup_randint,
+}
+
+
+async def run_ops(op, iterations: int):
+    for _ in range(iterations):
+        await op()
+
+
+def run_benchmark(bot, setup) -> dict:
+    """[summary]
+    Runs one benchmark: a warm up op (fills the caches), the timed ops and a few ops under tracemalloc.
+    Returns:
+        dict: ops_per_sec, rest_calls_per_op, rest_calls (per request type, per op) and peak_kb (per op).
+    """
+    loop = bot.BOT.loop
+    op, iterations = setup(bot)
+    loop.run_until_complete(op())
+
+    REST_CALLS.clear()
+    start = time.perf_counter()
+    loop.run_until_complete(run_ops(op, iterations))
+    elapsed = time.perf_counter() - start
+    rest_calls = {name: round(count / iterations, 3) for name, count in sorted(REST_CALLS.items())}
+    rest_total = sum(REST_CALLS.values())
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(min(iterations, ALLOCATION_RUNS)):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        loop.run_until_complete(op())
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(iterations / elapsed, 1),
+        "rest_calls_per_op": round(rest_total / iterations, 3),
+        "rest_calls": rest_calls,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """[summary]
+    Compares the results to the baseline: slower by more than `tolerance`, or a peak allocation bigger by more than
+    `tolerance` (and 16 KB) is a regression (REST calls are checked by `find_rest_regressions`).
+    Returns:
+        list: a description of every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']} ops/sec (baseline {base['ops_per_sec']})")
+        if result["peak_kb"] > max(base["peak_kb"] * (1 + tolerance), base["peak_kb"] + 16):
+            regressions.append(f"{name}: {result['peak_kb']} KB peak (baseline {base['peak_kb']})")
+    return regressions
+
+
+def find_rest_regressions(results: dict, expected: dict) -> list:
+    """[summary]
+    Compares the REST calls per op of every request type to the expected ones, any increase is a regression.
+    Returns:
+        list: a description of every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in expected:
+            print(f"{name}: no expected REST calls yet, run with --save-baseline to store them.")
+            continue
+        for request, calls in result["rest_calls"].items():
+            if calls > expected[name].get(request, 0) + 0.001:
+                regressions.append(f"{name}: {calls} {request} calls/op (expected {expected[name].get(request, 0)})")
+    return regressions
+
+
+def save_json(path: str, results: dict):
+    """[summary]
+    Updates a json results file with the given benchmarks (the other benchmarks' entries are kept).
+    """
+    saved = {}
+    if os.path.exists(path):
+        with open(path, "r") as reader:
+            saved = json.load(reader)
+    saved.update(results)
+    with open(path, "w") as writer:
+        json.dump(saved, writer, indent=4, sort_keys=True)
+        writer.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks SeniorBot's command handlers against fake discord objects.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown / allocation growth (0.3 = 30%%)")
+    args = parser.parse_args()
+
+    bot = load_bot()
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results[name] = run_benchmark(bot, BENCHMARKS[name])
+        result = results[name]
+        print(f"{name:<20} {result['ops_per_sec']:>12} ops/sec {result['rest_calls_per_op']:>8} REST/op {result['peak_kb']:>10} KB peak  {result['rest_calls']}")
+
+    if args.save_baseline:
+        save_json(BASELINE_FILE, results)
+        save_json(REST_CALLS_FILE, {name: result["rest_calls"] for name, result in results.items()})
+        print(f"Baseline saved to {BASELINE_FILE} and {REST_CALLS_FILE}")
+        return 0
+    regressions = []
+    if os.path.exists(REST_CALLS_FILE):
+        with open(REST_CALLS_FILE, "r") as reader:
+            regressions += find_rest_regressions(results, json.load(reader))
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r") as reader:
+            regressions += find_regressions(results, json.load(reader), args.tolerance)
+    else:
+        print("No speed baseline for this machine, run with --save-baseline to store one.")
+    for regression in regressions:
+        print(f"[!] REGRESSION: {regression}")
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
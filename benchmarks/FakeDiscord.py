@@ -0,0 +1,189 @@
+#? In memory stand-ins for the discord.py objects the command handlers use.
+#? Every method that would send a request to discord counts it in REST_CALLS instead.
+
+import datetime
+import discord
+
+REST_CALLS = {}  #? request name -> amount of simulated REST calls.
+HISTORY_PAGE = 100  #? Messages per history request (the API maximum).
+
+
+def rest_call(name: str):
+    REST_CALLS[name] = REST_CALLS.get(name, 0) + 1
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+    def __str__(self):
+        return self.url
+
+
+class FakeRole:
+    def __init__(self, role_id: int, position: int):
+        self.id = role_id
+        self.position = position
+        self.name = f"role-{position}"
+        self.mention = f"<@&{role_id}>"
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str, discriminator: str = "0001"):
+        self.id = user_id
+        self.name = name
+        self.discriminator = discriminator
+        self.display_name = name
+        self.mention = f"<@{user_id}>"
+        self.avatar_url = FakeAsset(f"https://cdn.example/avatars/{user_id}.png")
+        self.created_at = discord.utils.snowflake_time(user_id)
+        self.bot = False
+
+    def __str__(self):
+        return f"{self.name}#{self.discriminator}"
+
+
+class FakeMember(FakeUser):
+    def __init__(self, user_id: int, name: str, roles: list = None):
+        super().__init__(user_id, name)
+        self.roles = roles or []  #? First role is @everyone, like discord.Member.roles.
+        self.top_role = self.roles[-1] if len(self.roles) > 0 else None
+        self.nick = None
+        self.joined_at = datetime.datetime.utcnow() - datetime.timedelta(days=30)
+        self.status = discord.Status.online
+
+
+class FakeBanEntry:
+    def __init__(self, user: FakeUser):
+        self.user = user
+        self.reason = None
+
+
+class FakeInvite:
+    def __init__(self, code: str, max_uses: int):
+        self.code = code
+        self.max_uses = max_uses
+        self.uses = 0
+        self.channel = None
+
+    def __str__(self):
+        return f"https://discord.gg/{self.code}"
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, author, channel=None, content: str = ""):
+        self.id = message_id
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild if channel is not None else None
+        self.content = content
+        self.mentions = []
+        self.webhook_id = None
+        self._state = None
+        self.created_at = discord.utils.snowflake_time(message_id)
+
+    async def edit(self, **kwargs):
+        rest_call("edit_message")
+
+    async def delete(self):
+        rest_call("delete_message")
+        if self.channel is not None:
+            self.channel.deleted += 1
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, guild=None, history: list = None):
+        self.id = channel_id
+        self.name = f"channel-{channel_id}"
+        self.guild = guild
+        self.messages = history or []  #? Newest first.
+        self.deleted = 0  #? Amount of messages deletes were requested for (the history is left as is).
+        self.next_id = discord.utils.time_snowflake(datetime.datetime.utcnow())
+
+    async def send(self, content: str = None, **kwargs):
+        rest_call("send_message")
+        self.next_id += 1
+        return FakeMessage(self.next_id, None, self, content or "")
+
+    async def history(self, limit: int = 100, before=None):
+        start = 0
+        if before is not None:
+            while start < len(self.messages) and self.messages[start].id >= before.id:
+                start += 1
+        for i, msg in enumerate(self.messages[start:start + limit]):
+            if i % HISTORY_PAGE == 0:
+                rest_call("history")
+            yield msg
+
+    async def delete_messages(self, messages):
+        rest_call("bulk_delete")
+        self.deleted += len(messages)
+
+    def get_partial_message(self, message_id: int):
+        return FakeMessage(message_id, None, self)
+
+    async def create_invite(self, max_age: int = 0, max_uses: int = 0, unique: bool = True):
+        rest_call("create_invite")
+        invite = FakeInvite(f"invite{self.id}", max_uses)
+        invite.channel = self
+        return invite
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, name: str, member_count: int = 0):
+        self.id = guild_id
+        self.name = name
+        self.member_count = member_count
+        self.icon_url = FakeAsset(f"https://cdn.example/icons/{guild_id}.png")
+        self._members = {}  #? member id -> FakeMember
+        self.ban_list = []  #? FakeBanEntry list, returned by bans().
+        self.channels = []
+
+    @property
+    def members(self) -> list:
+        return list(self._members.values())
+
+    @property
+    def chunked(self) -> bool:
+        return self.member_count == len(self._members)
+
+    def get_member(self, member_id: int):
+        return self._members.get(member_id)
+
+    async def fetch_member(self, member_id: int):
+        rest_call("fetch_member")
+        if member_id not in self._members:
+            raise discord.NotFound(FakeResponse(404), "Unknown Member")
+        return self._members[member_id]
+
+    async def bans(self):
+        rest_call("bans")
+        return list(self.ban_list)
+
+    async def unban(self, user, reason: str = None):
+        rest_call("unban")
+
+
+class FakeResponse:
+    """[summary]
+    The bits of an aiohttp response discord.HTTPException reads.
+    """
+
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+
+class FakeContext:
+    def __init__(self, guild, channel, author, prefix: str = "!", mentions: list = None):
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.prefix = prefix
+        self.message = FakeMessage(channel.next_id, author, channel)
+        self.message.mentions = mentions or []
+        self.command = None
+        self.invoked_with = None
+
+    async def send(self, content: str = None, **kwargs):
+        return await self.channel.send(content, **kwargs)
@@ -0,0 +1,350 @@
+#? A local stand-in for discord's gateway and REST API, it speaks just enough of the protocol for discord.py 1.x to
+#? log in, receive READY / GUILD_CREATE / MESSAGE_CREATE and send the REST requests SeniorBot's commands make.
+#? REST responses carry rate limit headers, routes are rate limited per bucket and 429s can also be injected at random.
+
+from aiohttp import web
+import datetime
+import asyncio
+import random
+import time
+import json
+import re
+
+import discord
+
+HEARTBEAT_INTERVAL = 41250  #? Milliseconds, discord's usual value.
+
+#? (method, path pattern, route name, handler method), the first named group is the route's major parameter (its rate limit bucket).
+ROUTES = [
+    ("GET", r"/users/@me", "get_me", "get_me"),
+    ("GET", r"/gateway(?:/bot)?", "get_gateway", "get_gateway"),
+    ("POST", r"/channels/(?P<channel_id>\d+)/messages", "send_message", "send_message"),
+    ("GET", r"/channels/(?P<channel_id>\d+)/messages", "history", "history"),
+    ("POST", r"/channels/(?P<channel_id>\d+)/messages/bulk[-_]delete", "bulk_delete", "no_content"),
+    ("PATCH", r"/channels/(?P<channel_id>\d+)/messages/(?P<message_id>\d+)", "edit_message", "edit_message"),
+    ("DELETE", r"/channels/(?P<channel_id>\d+)/messages/(?P<message_id>\d+)", "delete_message", "no_content"),
+    ("POST", r"/channels/(?P<channel_id>\d+)/invites", "create_invite", "create_invite"),
+    ("GET", r"/guilds/(?P<guild_id>\d+)/bans", "get_bans", "bans"),
+    ("PUT", r"/guilds/(?P<guild_id>\d+)/bans/(?P<user_id>\d+)", "ban", "no_content"),
+    ("DELETE", r"/guilds/(?P<guild_id>\d+)/bans/(?P<user_id>\d+)", "unban", "no_content"),
+    ("GET", r"/guilds/(?P<guild_id>\d+)/members/(?P<user_id>\d+)", "get_member", "get_member"),
+    ("PATCH", r"/guilds/(?P<guild_id>\d+)/members/(?P<user_id>\d+)", "edit_member", "no_content"),
+    ("DELETE", r"/guilds/(?P<guild_id>\d+)/members/(?P<user_id>\d+)", "kick", "no_content"),
+]
+
+
+def iso_now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def json_response(data, status: int = 200, headers: dict = None) -> web.Response:
+    """[summary]
+    A json response with the exact content type discord.py checks for (aiohttp's json_response adds a charset).
+    """
+    response = web.Response(body=json.dumps(data).encode("utf-8"), status=status, headers=headers)
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def user_payload(user_id: int, name: str, discriminator: str = "0001", bot: bool = False) -> dict:
+    return {"id": str(user_id), "username": name, "discriminator": discriminator, "avatar": None, "bot": bot}
+
+
+class FakeDiscordServer:
+    def __init__(self, guilds: int = 1000, history: int = 500, bans: int = 1000, rate_limit: int = 5,
+                 rate_window: float = 5.0, random_429: float = 0.0):
+        """[summary]
+        Creates the fake discord. Every guild has one text channel and is owned by the same user, who sends the commands.
+        Args:
+            guilds (int): the amount of guilds the bot is in.
+            history (int): the amount of messages in every channel's history.
+            bans (int): the amount of banned users in every guild.
+            rate_limit (int): requests allowed per bucket (route + major parameter) per `rate_window`.
+            rate_window (float): seconds of a rate limit window.
+            random_429 (float): probability of answering any request with a 429.
+        """
+        self.history_length = history
+        self.ban_count = bans
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.random_429 = random_429
+        self.routes = [(method, re.compile(pattern + "$"), name, handler) for method, pattern, name, handler in ROUTES]
+
+        base = discord.utils.time_snowflake(datetime.datetime.utcnow() - datetime.timedelta(days=365))
+        self.bot_user = user_payload(base, "SeniorBot", bot=True)
+        self.owner = user_payload(base + 1, "loadtester")
+        self.guild_ids = [base + 1000 + i * 10 for i in range(guilds)]
+        self.channel_guild = {guild_id + 1: guild_id for guild_id in self.guild_ids}  #? channel id -> guild id
+        self.next_id = discord.utils.time_snowflake(datetime.datetime.utcnow())
+        self.history_top = self.next_id  #? Id of the newest history message (the same in every channel).
+
+        self.ws = None
+        self.sequence = 0
+        self.ready = asyncio.Event()  #? Set when the bot sets its presence (the end of its on_ready).
+        self.buckets = {}  #? (method, route, major parameter) -> [window end, requests in window]
+        self.request_log = []  #? (time, route name, guild id or None, status) of every REST request.
+        self.on_request = None  #? Called with (route name, guild id, status, path) of every REST request.
+        self.runner = None
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    @staticmethod
+    def channel_of(guild_id: int) -> int:
+        return guild_id + 1
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """[summary]
+        Starts serving.
+        Returns:
+            str: the base url (for Route.BASE and the gateway).
+        """
+        app = web.Application()
+        app.router.add_get("/gateway", self.handle_gateway)
+        app.router.add_route("*", "/api/v{version}/{path:.*}", self.handle_rest)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self.ws is not None:
+            await self.ws.close()
+        await self.runner.cleanup()
+
+    ###############################| Gateway |###############################
+
+    async def handle_gateway(self, request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self.ws = ws
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL}}))
+        async for msg in ws:
+            if msg.type != web.WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            op = payload.get("op")
+            if op == 1:  # Heartbeat.
+                await ws.send_str(json.dumps({"op": 11}))
+            elif op == 2:  # Identify.
+                await self.send_ready()
+            elif op == 3:  # Presence update, the bot's on_ready is done.
+                self.ready.set()
+            elif op == 6:  # Resume, sessions are not kept.
+                await ws.send_str(json.dumps({"op": 9, "d": False}))
+        return ws
+
+    async def dispatch(self, event: str, data: dict):
+        self.sequence += 1
+        await self.ws.send_str(json.dumps({"op": 0, "t": event, "s": self.sequence, "d": data}))
+
+    async def send_ready(self):
+        await self.dispatch(
+            "READY",
+            {
+                "v": 6,
+                "user": self.bot_user,
+                "session_id": "loadtest",
+                "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in self.guild_ids],
+                "private_channels": [],
+                "relationships": [],
+            },
+        )
+        for guild_id in self.guild_ids:
+            await self.dispatch("GUILD_CREATE", self.guild_payload(guild_id))
+
+    def guild_payload(self, guild_id: int) -> dict:
+        return {
+            "id": str(guild_id),
+            "name": f"guild {guild_id}",
+            "icon": None,
+            "owner_id": self.owner["id"],
+            "member_count": 100 + guild_id % 5000,
+            "large": False,
+            "unavailable": False,
+            "roles": [
+                {"id": str(guild_id), "name": "@everyone", "permissions": "104324673", "position": 0,
+                 "color": 0, "hoist": False, "managed": False, "mentionable": False}
+            ],
+            "channels": [
+                {"id": str(self.channel_of(guild_id)), "type": 0, "name": "general", "position": 0,
+                 "permission_overwrites": [], "topic": None, "nsfw": False, "parent_id": None,
+                 "rate_limit_per_user": 0, "last_message_id": None}
+            ],
+            "members": [],
+            "presences": [],
+            "voice_states": [],
+            "emojis": [],
+            "features": [],
+        }
+
+    def member_payload(self, user: dict) -> dict:
+        return {"user": user, "roles": [], "joined_at": iso_now(), "deaf": False, "mute": False, "nick": None}
+
+    def message_payload(self, message_id: int, channel_id: int, author: dict, content: str = "", embeds: list = None) -> dict:
+        guild_id = self.channel_guild.get(channel_id)
+        return {
+            "id": str(message_id),
+            "channel_id": str(channel_id),
+            "guild_id": str(guild_id) if guild_id is not None else None,
+            "author": author,
+            "content": content,
+            "timestamp": iso_now(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": embeds or [],
+            "pinned": False,
+            "type": 0,
+        }
+
+    async def send_command(self, guild_id: int, content: str, mention_owner: bool = False):
+        """[summary]
+        Sends a MESSAGE_CREATE from the guild owner in the guild's channel.
+        """
+        data = self.message_payload(self.new_id(), self.channel_of(guild_id), self.owner, content)
+        data["member"] = {key: value for key, value in self.member_payload(self.owner).items() if key != "user"}
+        if mention_owner:
+            mention = dict(self.owner)
+            mention["member"] = data["member"]
+            data["mentions"] = [mention]
+        await self.dispatch("MESSAGE_CREATE", data)
+
+    ###############################| REST |###############################
+
+    def rate_limit_headers(self, bucket: tuple) -> tuple:
+        """[summary]
+        Counts the request in its bucket.
+        Returns:
+            tuple: the rate limit headers and the seconds to retry after (None if the request is allowed).
+        """
+        now = time.time()
+        window = self.buckets.get(bucket)
+        if window is None or now >= window[0]:
+            window = self.buckets[bucket] = [now + self.rate_window, 0]
+        window[1] += 1
+        reset_after = window[0] - now
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - window[1])),
+            "X-RateLimit-Reset": f"{window[0]:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": f"{abs(hash(bucket[:2])):x}",
+        }
+        if window[1] > self.rate_limit:
+            return headers, reset_after
+        if self.random_429 > 0 and random.random() < self.random_429:
+            return headers, 0.1
+        return headers, None
+
+    async def handle_rest(self, request):
+        path = "/" + request.match_info["path"]
+        for method, pattern, name, handler in self.routes:
+            match = pattern.match(path)
+            if method == request.method and match is not None:
+                break
+        else:
+            self.log_request("unknown", None, 404, path)
+            return json_response({"message": "404: Not Found", "code": 0}, status=404)
+
+        params = {key: int(value) for key, value in match.groupdict().items()}
+        guild_id = params.get("guild_id") or self.channel_guild.get(params.get("channel_id"))
+        major = next(iter(params.values()), None)
+        headers, retry_after = self.rate_limit_headers((method, pattern.pattern, major))
+        if retry_after is not None:
+            self.log_request(name, guild_id, 429, path)
+            headers.update({"Via": "1.1 google", "Retry-After": f"{retry_after:.3f}"})
+            return json_response(
+                {"message": "You are being rate limited.", "retry_after": retry_after * 1000, "global": False},
+                status=429,
+                headers=headers,
+            )
+
+        body = None
+        if request.can_read_body and request.content_type == "application/json":
+            body = await request.json()
+        response = getattr(self, handler)(request, params, body)
+        self.log_request(name, guild_id, response.status, path)
+        response.headers.update(headers)
+        return response
+
+    def log_request(self, name: str, guild_id, status: int, path: str):
+        self.request_log.append((time.perf_counter(), name, guild_id, status))
+        if self.on_request is not None:
+            self.on_request(name, guild_id, status, path)
+
+    def get_me(self, request, params, body):
+        return json_response(self.bot_user)
+
+    def get_gateway(self, request, params, body):
+        ws_url = self.base_url.replace("http://", "ws://") + "/gateway"
+        return json_response(
+            {"url": ws_url, "shards": 1, "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}}
+        )
+
+    def no_content(self, request, params, body):
+        return web.Response(status=204)
+
+    def send_message(self, request, params, body):
+        body = body or {}
+        embeds = [body["embed"]] if body.get("embed") else []
+        return json_response(
+            self.message_payload(self.new_id(), params["channel_id"], self.bot_user, body.get("content") or "", embeds)
+        )
+
+    def edit_message(self, request, params, body):
+        body = body or {}
+        return json_response(
+            self.message_payload(params["message_id"], params["channel_id"], self.bot_user, body.get("content") or "")
+        )
+
+    def history(self, request, params, body):
+        """[summary]
+        A page of the channel's synthetic history (newest first), every third message is the guild owner's.
+        """
+        limit = int(request.query.get("limit", 50))
+        start = 0
+        if "before" in request.query:
+            start = max(0, self.history_top - int(request.query["before"]) + 1)
+        other = user_payload(int(self.owner["id"]) + 1, "bystander")
+        page = [
+            self.message_payload(self.history_top - i, params["channel_id"], self.owner if i % 3 == 0 else other)
+            for i in range(start, min(start + limit, self.history_length))
+        ]
+        return json_response(page)
+
+    def create_invite(self, request, params, body):
+        body = body or {}
+        guild_id = self.channel_guild[params["channel_id"]]
+        return json_response(
+            {
+                "code": f"lt{self.new_id()}",
+                "guild": {"id": str(guild_id), "name": f"guild {guild_id}", "icon": None, "splash": None, "banner": None, "features": []},
+                "channel": {"id": str(params["channel_id"]), "name": "general", "type": 0},
+                "max_age": body.get("max_age", 0),
+                "max_uses": body.get("max_uses", 0),
+                "uses": 0,
+                "temporary": False,
+                "created_at": iso_now(),
+            }
+        )
+
+    def bans(self, request, params, body):
+        return json_response(
+            [{"user": self.banned_user(i), "reason": None} for i in range(self.ban_count)]
+        )
+
+    def banned_user(self, index: int) -> dict:
+        return user_payload(10 ** 15 + index, f"banned{index}")
+
+    def get_member(self, request, params, body):
+        if params["user_id"] == int(self.owner["id"]):
+            return json_response(self.member_payload(self.owner))
+        return json_response({"message": "Unknown Member", "code": 10007}, status=404)
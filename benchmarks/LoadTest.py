@@ -0,0 +1,290 @@
+#? SeniorBot load test: runs the real bot (SeniorBot.py, unmodified) against a local fake discord and plays traffic at it.
+#? Run: python benchmarks/LoadTest.py [--guilds 2000] [--commands 5000] [--rate 200] [--mix coinflip=4,help=1,...]
+#?      [--replay traffic.jsonl | --record traffic.jsonl] [--random-429 0.01] [--profile minimal] [--uvloop] [--output results.json]
+#? Reports p50/p99 command latency (command sent -> first reply), REST calls and 429s per command and the bot's peak memory.
+
+import configparser
+import subprocess
+import argparse
+import tempfile
+import asyncio
+import random
+import runpy
+import math
+import json
+import time
+import sys
+import os
+
+from FakeDiscordServer import FakeDiscordServer
+
+THIS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+REPO_FOLDER = os.path.dirname(THIS_FOLDER)
+BOT_FILE_PATH = os.path.join(REPO_FOLDER, "SeniorBot.py")
+PREFIX = "!"
+
+#? Command name -> message content ({owner} is the guild owner's id, {ban} a banned user's number).
+COMMANDS = {
+    "help": "help",
+    "coinflip": "coinflip",
+    "RandInt": "RandInt 1 100",
+    "userinfo": "userinfo",
+    "serverinfo": "serverinfo",
+    "botinfo": "botinfo",
+    "clean": "clean <@{owner}> 20",
+    "unban": "unban banned{ban}#0001",
+}
+DEFAULT_MIX = "coinflip=4,RandInt=2,userinfo=2,help=1,serverinfo=1,botinfo=1,clean=1,unban=1"
+
+
+class CommandRun:
+    """[summary]
+    One command sent to the bot and everything the bot did for it.
+    """
+
+    def __init__(self, command: str, guild_id: int):
+        self.command = command
+        self.guild_id = guild_id
+        self.sent_at = None
+        self.latency = None  #? Seconds from MESSAGE_CREATE to the bot's first reply (None if it never replied).
+        self.rest_calls = {}  #? route name -> calls
+        self.throttled = 0  #? Requests answered with a 429.
+        self.replied = asyncio.Event()
+
+
+def run_bot(base_url: str):
+    """[summary]
+    The bot process: points discord.py at the fake discord and runs SeniorBot.py as the main module.
+    """
+    from discord.http import Route
+
+    Route.BASE = f"{base_url}/api/v7"
+    sys.path.insert(0, REPO_FOLDER)
+    os.chdir(REPO_FOLDER)  # SeniorBot looks for BotData.py in the working folder.
+    sys.argv = [BOT_FILE_PATH]
+    runpy.run_path(BOT_FILE_PATH, run_name="__main__")
+
+
+def write_config(folder: str, profile: str, uvloop: bool) -> str:
+    config = configparser.ConfigParser()
+    config["data"] = {"prefix": PREFIX, "token": "loadtest"}
+    config["gateway"] = {"resume": "false"}
+    config["memory"] = {"profile": profile}
+    config["storage"] = {"path": "loadtest.db"}
+    config["logging"] = {"level": "WARNING", "file": "bot.log", "console": "false"}
+    config["loop"] = {"uvloop": str(uvloop).lower()}
+    path = os.path.join(folder, "botconfig.cfg")
+    with open(path, "w") as writer:
+        config.write(writer)
+    return path
+
+
+def synthetic_traffic(guilds: int, commands: int, rate: float, mix: str, seed: int) -> list:
+    """[summary]
+    Returns:
+        list: `commands` commands ({"at": seconds, "guild": guild index, "command": name}) sent at `rate` commands per second
+        to random guilds, picked by the weights of `mix` ("name=weight,...").
+    """
+    weights = {}
+    for item in mix.split(","):
+        name, weight = item.split("=")
+        if name not in COMMANDS:
+            raise ValueError(f"Unknown command {name}, use one of: {', '.join(COMMANDS)}.")
+        weights[name] = float(weight)
+    generator = random.Random(seed)
+    names = list(weights)
+    return [
+        {
+            "at": round(i / rate, 4),
+            "guild": generator.randrange(guilds),
+            "command": generator.choices(names, [weights[name] for name in names])[0],
+        }
+        for i in range(commands)
+    ]
+
+
+def peak_memory(pid: int) -> int:
+    """[summary]
+    Returns the process' peak resident memory in bytes (0 where /proc is not available).
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r") as reader:
+            for line in reader:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def percentile(values: list, q: float) -> float:
+    if len(values) == 0:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+async def play(server: FakeDiscordServer, traffic: list, think: float, timeout: float) -> list:
+    """[summary]
+    Sends the traffic, one command at a time per guild (REST calls are attributed to the guild's current command).
+    Returns:
+        list: the CommandRun of every command.
+    """
+    runs = []
+    current = {}  #? guild id -> the CommandRun the guild's REST calls are attributed to.
+    locks = {}  #? guild id -> asyncio.Lock
+    bans_used = {}  #? guild id -> banned users unbanned so far.
+
+    def on_request(name, guild_id, status, path):
+        run = current.get(guild_id)
+        if run is None:
+            return
+        run.rest_calls[name] = run.rest_calls.get(name, 0) + 1
+        if status == 429:
+            run.throttled += 1
+        elif name == "send_message" and run.latency is None:
+            run.latency = time.perf_counter() - run.sent_at
+            run.replied.set()
+
+    server.on_request = on_request
+    start = time.perf_counter()
+
+    async def send(item):
+        await asyncio.sleep(max(0.0, start + item["at"] - time.perf_counter()))
+        guild_id = server.guild_ids[item["guild"] % len(server.guild_ids)]
+        async with locks.setdefault(guild_id, asyncio.Lock()):
+            run = CommandRun(item["command"], guild_id)
+            runs.append(run)
+            current[guild_id] = run
+            ban = bans_used[guild_id] = bans_used.get(guild_id, -1) + 1
+            content = PREFIX + COMMANDS[item["command"]].format(owner=server.owner["id"], ban=ban % server.ban_count)
+            run.sent_at = time.perf_counter()
+            await server.send_command(guild_id, content, mention_owner="<@" in content)
+            try:
+                await asyncio.wait_for(run.replied.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.sleep(think)  # Let the command finish its remaining requests.
+
+    await asyncio.gather(*[send(item) for item in traffic])
+    return runs
+
+
+def summarize(runs: list, elapsed: float) -> dict:
+    commands = {}
+    for name in sorted({run.command for run in runs}):
+        selected = [run for run in runs if run.command == name]
+        latencies = [run.latency for run in selected if run.latency is not None]
+        rest_calls = {}
+        for run in selected:
+            for route, count in run.rest_calls.items():
+                rest_calls[route] = rest_calls.get(route, 0) + count
+        commands[name] = {
+            "runs": len(selected),
+            "timeouts": len(selected) - len(latencies),
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+            "rest_calls_per_run": round(sum(rest_calls.values()) / len(selected), 2),
+            "rest_calls": {route: round(count / len(selected), 2) for route, count in sorted(rest_calls.items())},
+            "throttled": sum(run.throttled for run in selected),
+        }
+    latencies = [run.latency for run in runs if run.latency is not None]
+    return {
+        "commands": commands,
+        "total": {
+            "runs": len(runs),
+            "replied": len(latencies),
+            "elapsed_s": round(elapsed, 2),
+            "commands_per_s": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "throttled": sum(run.throttled for run in runs),
+        },
+    }
+
+
+async def load_test(args) -> dict:
+    if args.replay:
+        with open(args.replay, "r") as reader:
+            traffic = [json.loads(line) for line in reader if line.strip()]
+    else:
+        traffic = synthetic_traffic(args.guilds, args.commands, args.rate, args.mix, args.seed)
+    if args.record:
+        with open(args.record, "w") as writer:
+            writer.writelines(json.dumps(item) + "\n" for item in traffic)
+
+    server = FakeDiscordServer(
+        guilds=args.guilds, history=args.history, bans=args.bans,
+        rate_limit=args.rate_limit, rate_window=args.rate_window, random_429=args.random_429,
+    )
+    base_url = await server.start()
+    folder = tempfile.mkdtemp(prefix="seniorbot-loadtest-")
+    env = dict(os.environ, SENIORBOT_CONFIG=write_config(folder, args.profile, args.uvloop))
+    launched = time.perf_counter()
+    bot = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--run-bot", base_url], env=env)
+    try:
+        await asyncio.wait_for(server.ready.wait(), args.startup_timeout)
+        startup = time.perf_counter() - launched
+        print(f"Bot ready after {startup:.1f}s with {args.guilds} guilds, playing {len(traffic)} commands...")
+        started = time.perf_counter()
+        runs = await play(server, traffic, args.think, args.timeout)
+        results = summarize(runs, time.perf_counter() - started)
+        results["total"]["startup_s"] = round(startup, 2)
+        results["total"]["peak_memory_mb"] = round(peak_memory(bot.pid) / 2 ** 20, 1)
+        results["total"]["rest_requests"] = len(server.request_log)
+        results["total"]["unknown_requests"] = sum(1 for entry in server.request_log if entry[1] == "unknown")  # Routes the fake doesn't serve.
+        print(f"(bot logs: {os.path.join(folder, 'bot.log')})")
+        return results
+    finally:
+        bot.terminate()
+        bot.wait()
+        await server.stop()
+
+
+def print_results(results: dict):
+    print(f"{'command':<12}{'runs':>7}{'timeouts':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'REST/run':>10}{'429s':>7}  REST calls per run")
+    for name, data in results["commands"].items():
+        print(
+            f"{name:<12}{data['runs']:>7}{data['timeouts']:>10}{data['p50_ms']:>10}{data['p99_ms']:>10}"
+            f"{data['max_ms']:>10}{data['rest_calls_per_run']:>10}{data['throttled']:>7}  {data['rest_calls']}"
+        )
+    print(json.dumps(results["total"]))
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--run-bot":
+        run_bot(sys.argv[2])
+        return 0
+
+    parser = argparse.ArgumentParser(description="Load tests SeniorBot against a local fake discord.")
+    parser.add_argument("--guilds", type=int, default=1000, help="guilds the bot is in")
+    parser.add_argument("--commands", type=int, default=2000, help="commands sent (synthetic traffic)")
+    parser.add_argument("--rate", type=float, default=100.0, help="commands sent per second (synthetic traffic)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="command weights, name=weight,...")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--replay", help="play recorded traffic (json lines of at / guild / command) instead")
+    parser.add_argument("--record", help="save the played traffic to replay it later")
+    parser.add_argument("--history", type=int, default=500, help="messages in every channel's history")
+    parser.add_argument("--bans", type=int, default=1000, help="banned users in every guild")
+    parser.add_argument("--rate-limit", type=int, default=5, help="requests per rate limit bucket and window")
+    parser.add_argument("--rate-window", type=float, default=5.0, help="seconds of a rate limit window")
+    parser.add_argument("--random-429", type=float, default=0.0, help="probability of a random 429")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds between two commands in the same guild")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for a reply")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--profile", default="minimal", help="the bot's memory profile")
+    parser.add_argument("--uvloop", action="store_true", help="run the bot on uvloop")
+    parser.add_argument("--output", help="write the results to this json file")
+    args = parser.parse_args()
+
+    results = asyncio.get_event_loop().run_until_complete(load_test(args))
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as writer:
+            json.dump(results, writer, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())